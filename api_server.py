@@ -0,0 +1,528 @@
+import argparse
+import json
+import math
+import queue
+import threading
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from calculator_logic import OPERATION_CODES, OPERATIONS, OPERATORS, calculate_batch, evaluate_memoized
+from distributions import (
+    INTERVAL_METHODS, MAX_BINOMIAL_N, MAX_CATEGORIES, MAX_DICE_SIDES, MAX_NUM_DICE, MAX_POISSON_LAM,
+    Binomial, Categorical, Coin, Dice, Poisson, chi_square, confidence_intervals, interval_z
+)
+from result_cache import cache_stats, get_cache
+from simulation_engine import (
+    SIMULATION_CACHE, default_workers, iter_adaptive_simulation, new_seed, simulate, simulation_key
+)
+
+# 브라우저 없이 계산 엔진을 호출하는 로컬 HTTP/JSON API (표준 라이브러리만 사용)
+# 실행: python api_server.py [--host 127.0.0.1] [--port 8600]
+#
+#   GET  /health                              상태 확인
+#   GET  /cache                               결과 캐시 적중/미스 통계 (result_cache)
+#   POST /calculate    {"num1": [...], "num2": [...], "operation": "+" 또는 [...], "base": ...,
+#                       "backend": "float"|"complex"|"decimal"|"fraction"}
+#   POST /simulate     {"distribution": {"type": "dice", "sides": 6, "num_dice": 1}, "trials": 100000,
+#                       "seed": 42, "margin": 0.001, "confidence": 0.95, "method": "wilson"}
+#                      margin을 주면 trials는 최대 시행 횟수이며, 모든 결과 확률의 신뢰구간 반폭이
+#                      margin 이하가 되면 멈춥니다 (조기 종료).
+#   GET  /population?year=2030[&iso_a3=KOR,USA]          임의 연도 국가별 추정 인구
+#   GET  /population/continents?year=2022                 대륙별 집계
+#
+# 요청 배칭: 동시에 도착한 float/complex /calculate 요청은 짧은 대기 시간(BATCH_WINDOW_SEC) 동안
+# 모았다가 연산 코드 배열과 함께 calculate_batch() 한 번으로 계산한 뒤 요청별로 나눠 돌려줍니다.
+# 동시성 제한: 요청 본문 크기, 계산 행 수, 시행 횟수에 상한을 두고, 시뮬레이션과 인구 조회는
+# 동시에 실행할 수 있는 수를 세마포어로 제한합니다 (자리가 없으면 503).
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8600
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_CALC_ROWS = 1_000_000          # 요청 하나의 계산 행 수 상한
+MAX_EXACT_ROWS = 10_000            # decimal/fraction(스칼라 경로) 요청의 행 수 상한
+MAX_TRIALS = 100_000_000
+BATCH_WINDOW_SEC = 0.002           # 배치에 요청을 모으는 최대 대기 시간
+MAX_BATCH_ROWS = 2_000_000         # 배치 하나에 합치는 최대 행 수
+SIMULATION_SLOTS = default_workers()
+POPULATION_SLOTS = 8
+SLOT_TIMEOUT_SEC = 5.0
+MAX_CONNECTIONS = 64               # 동시에 처리하는 연결(스레드) 수 상한
+LISTEN_BACKLOG = 256
+CSV_FILE_PATH = "world_population.csv"
+
+
+class ApiError(Exception):
+    """클라이언트에 JSON 오류 응답으로 돌려줄 예외."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# --- 계산 (요청 배칭) ---
+
+class CalculationBatcher:
+    """
+    동시에 들어온 배치 계산 요청을 백엔드별로 모아 calculate_batch() 한 번으로 계산합니다.
+    각 요청은 (num1, num2, base, 연산 코드) 배열을 제출하고 Future로 (결과, 오류 마스크)를 받습니다.
+    """
+
+    def __init__(self, window=BATCH_WINDOW_SEC, max_rows=MAX_BATCH_ROWS):
+        self.window = window
+        self.max_rows = max_rows
+        self.batches = 0
+        self.requests = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="calculation-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, backend, num1, num2, base, codes):
+        future = Future()
+        self._queue.put((backend, num1, num2, base, codes, future))
+        return future
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            rows = len(pending[0][1])
+            # 첫 요청 이후 window 동안 도착한 요청을 같은 배치에 합칩니다.
+            try:
+                while rows < self.max_rows:
+                    item = self._queue.get(timeout=self.window)
+                    pending.append(item)
+                    rows += len(item[1])
+            except queue.Empty:
+                pass
+            for backend in {item[0] for item in pending}:
+                self._compute([item for item in pending if item[0] == backend], backend)
+
+    def _compute(self, items, backend):
+        try:
+            num1, num2, base, codes = (np.concatenate([item[i] for item in items]) for i in range(1, 5))
+            result, errors = calculate_batch(num1, num2, codes, base, backend=backend)
+        except Exception as e:
+            for item in items:
+                item[5].set_exception(e)
+            return
+        self.batches += 1
+        self.requests += len(items)
+        start = 0
+        for item in items:
+            stop = start + len(item[1])
+            item[5].set_result((result[start:stop], errors[start:stop]))
+            start = stop
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher():
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = CalculationBatcher()
+        return _batcher
+
+
+def _column(payload, name, size, dtype):
+    values = payload.get(name)
+    if values is None:
+        return np.full(size, np.nan, dtype=dtype)
+    if dtype == np.complex128 and isinstance(values, list):
+        # 복소수는 [실수부, 허수부] 쌍 또는 실수로 받습니다.
+        values = [complex(*v) if isinstance(v, list) else v for v in values]
+    array = np.asarray(values, dtype=dtype)
+    if array.ndim > 1:
+        raise ValueError(f"{name}은(는) 숫자 또는 1차원 숫자 배열이어야 합니다.")
+    return np.full(size, array, dtype=dtype) if array.ndim == 0 else array
+
+
+def _rows(payload):
+    sizes = [len(payload[key]) for key in ('num1', 'num2', 'base', 'operation')
+             if isinstance(payload.get(key), list)]
+    if len(set(sizes)) > 1:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "num1, num2, base, operation 배열의 길이가 같아야 합니다.")
+    return sizes[0] if sizes else 1
+
+
+def handle_calculate(payload, query):
+    backend = payload.get('backend', 'float')
+    size = _rows(payload)
+    if backend in ('decimal', 'fraction'):
+        return _calculate_exact(payload, backend, size)
+    if backend not in ('float', 'complex'):
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"알 수 없는 수치 백엔드: {backend}")
+    if size > MAX_CALC_ROWS:
+        raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"요청당 최대 {MAX_CALC_ROWS:,}행까지 계산합니다.")
+
+    dtype = np.complex128 if backend == 'complex' else np.float64
+    try:
+        num1 = _column(payload, 'num1', size, dtype)
+        num2 = _column(payload, 'num2', size, dtype)
+        base = _column(payload, 'base', size, np.float64)
+    except (TypeError, ValueError) as e:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"피연산자를 숫자로 변환할 수 없습니다: {e}")
+    operation = payload.get('operation')
+    ops = operation if isinstance(operation, list) else [operation] * size
+    codes = np.array([OPERATION_CODES.get(op, -1) if isinstance(op, str) else -1 for op in ops],
+                     dtype=np.int64)
+
+    result, errors = get_batcher().submit(backend, num1, num2, base, codes).result()
+    # 이항 연산에 num2가 없으면 NaN으로 계산되므로 해당 행을 오류로 표시합니다.
+    binary = np.array([OPERATORS[name].arity == 2 for name in OPERATIONS] + [False])[codes]
+    errors = errors | (binary & np.isnan(num2))
+    if backend == 'complex':
+        values = [None if error else [_json_number(value.real), _json_number(value.imag)]
+                  for value, error in zip(result.tolist(), errors)]
+    else:
+        values = [None if error else _json_number(value) for value, error in zip(result.tolist(), errors)]
+    return {'result': values, 'error': errors.tolist()}
+
+
+def _json_number(value):
+    # JSON에는 inf/NaN이 없으므로 유한하지 않은 값은 "inf", "-inf", "nan" 문자열로 보냅니다.
+    return value if math.isfinite(value) else str(value)
+
+
+def _calculate_exact(payload, backend, size):
+    # Decimal/Fraction은 배열 경로가 없으므로 메모이즈된 스칼라 경로로 계산합니다 (피연산자는 문자열).
+    if size > MAX_EXACT_ROWS:
+        raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                       f"{backend} 백엔드는 요청당 최대 {MAX_EXACT_ROWS:,}행까지 계산합니다.")
+
+    def column(name):
+        values = payload.get(name)
+        return values if isinstance(values, list) else [values] * size
+
+    results, errors = [], []
+    for num1, num2, base, op in zip(column('num1'), column('num2'), column('base'), column('operation')):
+        result = evaluate_memoized(str(num1), None if num2 is None else str(num2),
+                                   op if isinstance(op, str) else None, base, backend=backend)
+        results.append(str(result.value) if result.ok else None)
+        errors.append(None if result.ok else result.message)
+    return {'result': results, 'error': errors}
+
+
+# --- 시뮬레이션 ---
+
+_simulation_slots = threading.BoundedSemaphore(SIMULATION_SLOTS)
+
+def _capped(value, limit, name):
+    # Streamlit 페이지와 같은 상한을 적용합니다 (분포를 만들기 전에 검사해 큰 pmf 계산을 막음).
+    if not value <= limit:
+        raise ValueError(f"{name}은(는) {limit:,} 이하여야 합니다.")
+    return value
+
+
+def _categorical(spec):
+    labels = list(spec['labels'])
+    _capped(len(labels), MAX_CATEGORIES, "결과 수")
+    return Categorical(labels, [float(w) for w in spec['weights']])
+
+
+DISTRIBUTIONS = {
+    'dice': lambda spec: Dice(_capped(int(spec.get('sides', 6)), MAX_DICE_SIDES, "sides"),
+                              _capped(int(spec.get('num_dice', 1)), MAX_NUM_DICE, "num_dice")),
+    'coin': lambda spec: Coin(float(spec.get('p_heads', 0.5))),
+    'categorical': _categorical,
+    'binomial': lambda spec: Binomial(_capped(int(spec['n']), MAX_BINOMIAL_N, "n"), float(spec['p'])),
+    'poisson': lambda spec: Poisson(_capped(float(spec['lam']), MAX_POISSON_LAM, "lam")),
+}
+
+
+def parse_distribution(spec):
+    """{"type": "dice", ...} 형식의 분포 명세로 분포 객체를 만듭니다."""
+    if isinstance(spec, int):
+        return Dice(spec)
+    kind = spec.get('type') if isinstance(spec, dict) else None
+    if kind not in DISTRIBUTIONS:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"distribution.type은 {', '.join(DISTRIBUTIONS)} 중 하나여야 합니다.")
+    try:
+        return DISTRIBUTIONS[kind](spec)
+    except (KeyError, TypeError, ValueError, OverflowError) as e:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"분포 매개변수가 올바르지 않습니다: {e}")
+
+
+def _number(payload, name, convert, default=None):
+    """payload[name]을 convert(int 또는 float)로 변환합니다 (숫자가 아니면 400)."""
+    value = payload.get(name, default)
+    try:
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise TypeError(type(value).__name__)
+        number = float(value)
+        if convert is int:
+            if not number.is_integer():
+                raise ValueError(value)
+            return int(value) if isinstance(value, int) else int(number)
+        return number
+    except (TypeError, ValueError, OverflowError):
+        kind = "정수" if convert is int else "숫자"
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{name}은(는) {kind}여야 합니다: {value!r}")
+
+
+def handle_simulate(payload, query):
+    distribution = parse_distribution(payload.get('distribution', {'type': 'dice'}))
+    trials = _number(payload, 'trials', int, 1000)
+    if not 1 <= trials <= MAX_TRIALS:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"trials는 1 이상 {MAX_TRIALS:,} 이하여야 합니다.")
+    seed = payload.get('seed')
+    seeded = seed is not None
+    seed = new_seed() if seed is None else _number(payload, 'seed', int)
+    if seed < 0:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "seed는 0 이상의 정수여야 합니다.")
+
+    margin = payload.get('margin')
+    if margin is not None:
+        margin = _number(payload, 'margin', float)
+        if not 0 < margin < 1:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "margin은 0과 1 사이의 확률이어야 합니다.")
+    confidence = _number(payload, 'confidence', float, 0.95)
+    method = payload.get('method', 'wilson')
+    if not 0 < confidence < 1 or method not in INTERVAL_METHODS:
+        raise ApiError(HTTPStatus.BAD_REQUEST,
+                       f"confidence는 0과 1 사이, method는 {', '.join(INTERVAL_METHODS)} 중 하나여야 합니다.")
+
+    # 시드를 지정한 요청은 Streamlit 페이지와 같은 결과 캐시(같은 키)를 사용합니다.
+    options = dict(adaptive=False) if margin is None else \
+        dict(adaptive=True, margin=margin, confidence=confidence, method=method)
+    key = simulation_key(distribution, trials, seed, **options) if seeded else None
+    cache = get_cache(SIMULATION_CACHE)
+    cached = cache.get(key) if key else None
+    if cached is None:
+        if not _simulation_slots.acquire(timeout=SLOT_TIMEOUT_SEC):
+            raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, "실행 중인 시뮬레이션이 많습니다. 잠시 후 다시 시도하세요.")
+        try:
+            if margin is None:
+                cached = (trials, simulate(distribution, trials, seed=seed), None)
+            else:
+                for state in iter_adaptive_simulation(distribution, margin, trials, confidence, method, seed=seed):
+                    pass
+                cached = (state.done, state.counts, state)
+        finally:
+            _simulation_slots.release()
+        if key:
+            cache.put(key, cached)
+    done, counts, state = cached
+    if state is None:
+        low, high = confidence_intervals(counts, interval_z(confidence, distribution.num_outcomes, method))
+        adaptive = {}
+    else:
+        low, high = state.low, state.high
+        adaptive = {'max_trials': trials, 'margin': margin, 'converged': state.converged,
+                    'elapsed_seconds': state.elapsed}
+    pmf = distribution.pmf()
+    statistic, dof = chi_square(counts, pmf)
+    return {
+        'distribution': repr(distribution),
+        'trials': done,
+        'seed': seed,
+        'labels': distribution.labels,
+        'counts': counts.tolist(),
+        'pmf': pmf.tolist(),
+        'chi_square': statistic,
+        'dof': dof,
+        'confidence': confidence,
+        'method': method,
+        'low': low.tolist(),
+        'high': high.tolist(),
+        **adaptive,
+    }
+
+
+# --- 인구 조회 ---
+
+_population_slots = threading.BoundedSemaphore(POPULATION_SLOTS)
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """API 프로세스 전체에서 공유하는 PopulationStore (처음 조회할 때 로드)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            from population_data import PopulationStore
+            _store = PopulationStore(CSV_FILE_PATH)
+        return _store
+
+
+def _query_year(query):
+    # 연도는 정수만 받습니다. 범위(첫 스냅샷 ~ MAX_QUERY_YEAR)는 모델이 검사합니다 (ValueError -> 400).
+    try:
+        return int(query['year'][0])
+    except (KeyError, ValueError):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "year 쿼리 매개변수(정수 연도)가 필요합니다.")
+
+
+def handle_population(payload, query):
+    from population_query import PopulationModel
+
+    year = _query_year(query)
+    if not _population_slots.acquire(timeout=SLOT_TIMEOUT_SEC):
+        raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, "조회 요청이 많습니다. 잠시 후 다시 시도하세요.")
+    try:
+        store = get_store()
+        model = store.derived('model', lambda: PopulationModel(store.frame, store.countries))
+        try:
+            estimates = model.query(year)
+        except ValueError as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, str(e))
+        codes = [code for value in query.get('iso_a3', []) for code in value.split(',') if code]
+        if codes:
+            unknown = [code for code in codes if code not in estimates.index]
+            if unknown:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"알 수 없는 국가 코드: {', '.join(unknown)}")
+            estimates = estimates[codes]
+        return {'year': year, 'world_total': model.world_total(year),
+                'population': {code: float(value) if np.isfinite(value) else None
+                               for code, value in estimates.items()}}
+    finally:
+        _population_slots.release()
+
+
+def handle_continents(payload, query):
+    from population_aggregates import build_continent_cube, continent_view
+
+    year = _query_year(query)
+    if not _population_slots.acquire(timeout=SLOT_TIMEOUT_SEC):
+        raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, "조회 요청이 많습니다. 잠시 후 다시 시도하세요.")
+    try:
+        store = get_store()
+        cube = store.derived('continent_cube', lambda: build_continent_cube(store.frame, store.countries))
+        try:
+            view = continent_view(cube, year)
+        except KeyError:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"{year}년 스냅샷이 없습니다.")
+        return {'year': year, 'continents': json.loads(view.to_json(orient='index'))}
+    finally:
+        _population_slots.release()
+
+
+def handle_cache(payload, query):
+    """결과 캐시별 적중/미스 카운터와 계층별 사용량."""
+    return {'caches': cache_stats()}
+
+
+def handle_health(payload, query):
+    batcher = _batcher
+    return {'status': 'ok',
+            'batches': batcher.batches if batcher else 0,
+            'batched_requests': batcher.requests if batcher else 0}
+
+
+ROUTES = {
+    ('GET', '/health'): handle_health,
+    ('GET', '/cache'): handle_cache,
+    ('POST', '/calculate'): handle_calculate,
+    ('POST', '/simulate'): handle_simulate,
+    ('GET', '/population'): handle_population,
+    ('GET', '/population/continents'): handle_continents,
+}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "CalculatorAPI/1.0"
+    protocol_version = "HTTP/1.1" # keep-alive로 같은 연결에서 여러 요청을 처리합니다.
+    quiet = True
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        handler = ROUTES.get((method, url.path.rstrip('/') or '/'))
+        try:
+            if handler is None:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"{method} {url.path} 엔드포인트가 없습니다.")
+            payload = self._read_json() if method == 'POST' else {}
+            self._send(HTTPStatus.OK, handler(payload, parse_qs(url.query)))
+        except ApiError as e:
+            self._send(e.status, {'error': e.message})
+        except Exception as e:
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"{type(e).__name__}: {e}"})
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"요청 본문은 최대 {MAX_BODY_BYTES:,}바이트입니다.")
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"JSON 형식이 아닙니다: {e}")
+        if not isinstance(payload, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "요청 본문은 JSON 객체여야 합니다.")
+        return payload
+
+    def _send(self, status, body):
+        data = json.dumps(body, ensure_ascii=False, allow_nan=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    """연결마다 스레드 하나를 쓰되, 동시에 처리하는 연결 수를 MAX_CONNECTIONS로 제한하는 서버."""
+
+    daemon_threads = True
+    request_queue_size = LISTEN_BACKLOG
+
+    def __init__(self, address, handler, max_connections=MAX_CONNECTIONS):
+        super().__init__(address, handler)
+        self._connections = threading.BoundedSemaphore(max_connections)
+
+    def process_request(self, request, client_address):
+        # 자리가 날 때까지 새 연결을 받지 않으므로, 초과 연결은 listen 대기열에서 기다립니다.
+        self._connections.acquire()
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._connections.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._connections.release()
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, quiet=True, max_connections=MAX_CONNECTIONS):
+    """API 서버를 만듭니다 (serve_forever()로 실행)."""
+    ApiHandler.quiet = quiet
+    return ApiServer((host, port), ApiHandler, max_connections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="계산기/시뮬레이터/인구 조회 HTTP JSON API")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, quiet=not args.verbose)
+    print(f"API 서버 실행 중: http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
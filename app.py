@@ -1,126 +1,26 @@
 import streamlit as st
-from calculator_logic import calculate 
+# 페이지 모듈(calculator_page)은 아래 라우팅에서 선택될 때만 임포트합니다.
+from calculator_state import init_calculator_state
 
 # --- 페이지 설정 ---
 st.set_page_config(page_title="Streamlit Button Calculator", layout="centered")
 st.title("📱 버튼 기반 Streamlit 계산기")
 
 # --- 1. 세션 상태 초기화 ---
-if 'current_input' not in st.session_state:
-    st.session_state.current_input = '0' # 현재 화면에 표시되는 값
-if 'operator' not in st.session_state:
-    st.session_state.operator = None     # 선택된 연산자
-if 'first_number' not in st.session_state:
-    st.session_state.first_number = None # 첫 번째 숫자 (피연산자)
-if 'waiting_for_second' not in st.session_state:
-    st.session_state.waiting_for_second = False # 두 번째 숫자 입력을 기다리는지 여부
-if 'last_result' not in st.session_state:
-    st.session_state.last_result = None # 마지막 계산 결과 (연속 계산용)
+# 계산기 상태(현재 입력, 연산자, 첫 번째 숫자 등)는 세션마다 하나의 엔진 객체에 담습니다.
+# 엔진은 계산기 페이지와 같은 함수로 만들어 계산 기록이 함께 연결됩니다.
+init_calculator_state()
+engine = st.session_state.calculator
 
 # --- 계산기 화면 출력 ---
 st.markdown(
-    f"<h1 style='text-align: right; margin-bottom: 0px;'>{st.session_state.current_input}</h1>", 
+    f"<h1 style='text-align: right; margin-bottom: 0px;'>{engine.current_input}</h1>", 
     unsafe_allow_html=True
 )
 st.markdown("---")
 
-# --- 2. 핵심 로직 함수 (변경 없음) ---
-# 이전 코드와 동일하므로 여기서는 생략하고, 파일에는 포함되어 있다고 가정합니다.
-
-def handle_number(number):
-    """숫자 버튼 클릭 처리"""
-    if st.session_state.waiting_for_second or st.session_state.current_input == '0' or st.session_state.last_result is not None:
-        st.session_state.current_input = str(number)
-        st.session_state.waiting_for_second = False
-        st.session_state.last_result = None
-    else:
-        st.session_state.current_input += str(number)
-
-def handle_decimal():
-    """소수점 버튼 클릭 처리"""
-    if '.' not in st.session_state.current_input:
-        st.session_state.current_input += '.'
-
-def handle_clear():
-    """초기화 (AC) 버튼 클릭 처리"""
-    st.session_state.current_input = '0'
-    st.session_state.operator = None
-    st.session_state.first_number = None
-    st.session_state.waiting_for_second = False
-    st.session_state.last_result = None
-
-def handle_unary(op):
-    """단항 연산 (sin, log 등) 처리"""
-    try:
-        num = float(st.session_state.current_input)
-        base = 10 if op == 'log' else None 
-        result = calculate(num, None, op, base)
-        
-        if isinstance(result, str) and "Error" in result:
-             st.session_state.current_input = result
-        else:
-            if isinstance(result, (int, float)):
-                st.session_state.current_input = f"{result:.10g}" if abs(result) < 1e10 else str(result)
-            else:
-                 st.session_state.current_input = str(result)
-
-            st.session_state.last_result = result
-            
-        st.session_state.waiting_for_second = True
-
-    except ValueError:
-        st.session_state.current_input = "Error: Invalid Input"
-
-def handle_binary_operator(op):
-    """이항 연산자 (+, -, *, / 등) 처리"""
-    try:
-        current_num = float(st.session_state.current_input)
-        
-        if st.session_state.first_number is None or st.session_state.last_result is not None:
-            st.session_state.first_number = current_num
-            st.session_state.operator = op
-            st.session_state.waiting_for_second = True
-            st.session_state.last_result = None
-        else:
-            result = calculate(st.session_state.first_number, current_num, st.session_state.operator)
-            
-            if isinstance(result, str) and "Error" in result:
-                 st.session_state.current_input = result
-                 st.session_state.first_number = None
-                 st.session_state.operator = None
-                 st.session_state.waiting_for_second = True
-            else:
-                st.session_state.first_number = result
-                st.session_state.operator = op
-                st.session_state.current_input = f"{result:.10g}"
-                st.session_state.waiting_for_second = True
-
-    except ValueError:
-        st.session_state.current_input = "Error: Invalid Input"
-
-def handle_equals():
-    """= 버튼 클릭 처리"""
-    if st.session_state.operator and st.session_state.first_number is not None:
-        try:
-            second_num = float(st.session_state.current_input)
-            
-            result = calculate(st.session_state.first_number, second_num, st.session_state.operator)
-            
-            if isinstance(result, str) and "Error" in result:
-                st.session_state.current_input = result
-            else:
-                if isinstance(result, (int, float)):
-                    st.session_state.current_input = f"{result:.10g}"
-                else:
-                    st.session_state.current_input = str(result)
-                
-                st.session_state.first_number = None
-                st.session_state.operator = None
-                st.session_state.waiting_for_second = True
-                st.session_state.last_result = result
-
-        except ValueError:
-            st.session_state.current_input = "Error: Invalid Input"
+# --- 2. 핵심 로직 함수 ---
+# 버튼 처리 로직은 calculator_engine.CalculatorEngine에 있습니다.
 
 # (앞부분의 import, session_state 초기화, 함수 정의는 그대로 둡니다.)
 # ...
@@ -130,19 +30,6 @@ def handle_equals():
 col_count = 5
 cols = st.columns(col_count)
 
-# 버튼 정의 함수 매핑 (레이블은 길어졌지만, 콜백은 기존 연산자를 사용합니다.)
-button_map = {
-    'sin': lambda: handle_unary('sin'), 'cos': lambda: handle_unary('cos'), 'tan': lambda: handle_unary('tan'), 'log': lambda: handle_unary('log'), 
-    'AC': handle_clear, 'mod': lambda: handle_binary_operator('mod'), 'EXP': lambda: handle_binary_operator('**'), # ** -> EXP
-    '7': lambda: handle_number(7), '8': lambda: handle_number(8), '9': lambda: handle_number(9),
-    'DIV': lambda: handle_binary_operator('/'), 'MUL': lambda: handle_binary_operator('*'), # / -> DIV, * -> MUL
-    '4': lambda: handle_number(4), '5': lambda: handle_number(5), '6': lambda: handle_number(6),
-    'SUB': lambda: handle_binary_operator('-'), 'ADD': lambda: handle_binary_operator('+'), # - -> SUB, + -> ADD
-    '1': lambda: handle_number(1), '2': lambda: handle_number(2), '3': lambda: handle_number(3),
-    '0': lambda: handle_number(0), '.': handle_decimal, '=': handle_equals,
-    '': lambda: None # 공백 버튼용 콜백
-}
-
 # 최종 버튼 배치 그리드 (레이블 변경 적용)
 calculator_grid = [
     # C0, C1, C2, C3, C4
@@ -157,8 +44,6 @@ calculator_grid = [
 for row_labels in calculator_grid:
     cols = st.columns(5)
     for i, label in enumerate(row_labels):
-        callback = button_map[label]
-        
         # AC와 = 버튼에만 'primary' 스타일 적용
         button_type = 'primary' if label in ['AC', '='] else 'secondary'
         
@@ -167,7 +52,8 @@ for row_labels in calculator_grid:
             
             st.button(
                 button_label, 
-                on_click=callback, 
+                on_click=engine.press, # 버튼 레이블을 그대로 엔진에 전달
+                args=(label,),
                 key=f"btn_{label}_{i}", 
                 use_container_width=True, 
                 type=button_type
@@ -177,39 +63,66 @@ st.markdown("---")
 st.caption("사칙연산 버튼 레이블을 영어 약자(ADD, SUB, MUL, DIV)로 변경하여 표시 오류를 해결했습니다.")
 
 
+import importlib
+
 import streamlit as st
-from calculator_page import calculator_page, init_calculator_state
-from probability_page import probability_page
-from world_population_page import world_population_page # 새 페이지 임포트
-
-# --- 1. 페이지 설정 및 라우팅 ---
-st.set_page_config(
-    page_title="통합 웹 앱 (다기능)",
-    layout="wide" # 지도 시각화를 위해 레이아웃을 'wide'로 변경
-)
+from profiling import stage
+from profiling_panel import render_profile_sidebar, start_profiling, stop_profiling
+
+# 프로파일링이 켜져 있으면 (APP_PROFILE=1 또는 사이드바 토글) 이번 재실행의 단계별 시간을 측정합니다.
+profile = start_profiling()
+
+# 사이드바 레이블 -> (페이지 모듈, 페이지 함수)
+# 페이지 모듈과 그 무거운 의존성(pandas, plotly.express 등)은 해당 페이지를 처음 선택할 때만
+# 임포트됩니다. 계산기만 사용하는 세션은 인구/확률 페이지의 의존성을 불러오지 않습니다.
+PAGES = {
+    "계산기 📱": ("calculator_page", "calculator_page"),
+    "확률 시뮬레이터 🎲": ("probability_page", "probability_page"),
+    "연도별 세계 인구 분석 🌍": ("world_population_page", "world_population_page"), # 새 페이지
+    "함수 그래프 📈": ("function_plot_page", "function_plot_page"),
+}
 
-# 사이드바에서 페이지 선택
-st.sidebar.title("메인 메뉴")
-page = st.sidebar.radio(
-    "원하는 앱을 선택하세요:",
-    ["계산기 📱", "확률 시뮬레이터 🎲", "연도별 세계 인구 분석 🌍"]
-)
+def load_page(label):
+    """선택된 페이지의 모듈과 페이지 함수를 반환합니다 (이미 임포트된 모듈은 sys.modules에서 가져옵니다)."""
+    module_name, function_name = PAGES[label]
+    with stage("imports"):
+        module = importlib.import_module(module_name)
+    return module, getattr(module, function_name)
 
-st.title(f"통합 웹 앱: {page}")
-st.markdown("---")
 
-# --- 2. 페이지별 분기 처리 및 함수 호출 ---
+# 측정은 finally에서 끝내므로, 페이지에서 예외가 나거나 st.stop()/재실행으로 중단되어도
+# tracemalloc이 켜진 채 남지 않습니다 (분해표는 정상 종료된 재실행만 표시합니다).
+try:
+    # --- 1. 페이지 설정 및 라우팅 ---
+    st.set_page_config(
+        page_title="통합 웹 앱 (다기능)",
+        layout="wide" # 지도 시각화를 위해 레이아웃을 'wide'로 변경
+    )
+
+    # 사이드바에서 페이지 선택
+    st.sidebar.title("메인 메뉴")
+    page = st.sidebar.radio(
+        "원하는 앱을 선택하세요:",
+        list(PAGES)
+    )
+
+    st.title(f"통합 웹 앱: {page}")
+    st.markdown("---")
+
+    # --- 2. 선택된 페이지만 불러와 함수 호출 ---
+
+    module, page_function = load_page(page)
+
+    if page == "계산기 📱":
+        module.init_calculator_state()
+        st.header("고급 버튼 계산기")
+        # 계산기 UI는 'centered' 레이아웃이 더 적합하지만, 전체 앱은 'wide'를 따릅니다.
 
-if page == "계산기 📱":
-    init_calculator_state()
-    st.header("고급 버튼 계산기")
-    # 계산기 UI는 'centered' 레이아웃이 더 적합하지만, 전체 앱은 'wide'를 따릅니다.
-    calculator_page() 
-    
-elif page == "확률 시뮬레이터 🎲":
-    probability_page()
+    with stage(PAGES[page][1]):
+        page_function()
+finally:
+    stop_profiling(profile)
 
-elif page == "연도별 세계 인구 분석 🌍":
-    world_population_page()
+render_profile_sidebar(profile)
 
 # --- app.py 끝 ---
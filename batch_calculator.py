@@ -0,0 +1,213 @@
+import argparse
+import io
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from calculator_logic import (
+    ERR_CALCULATION, ERR_INVALID_INPUT, OPERATION_CODES, OPERATIONS, OPERATORS, CalcResult, batch_error_codes,
+    calculate_batch, parse_complex
+)
+
+# 명령줄 배치 계산기
+# num1,num2,operation[,base] 행을 CSV 또는 JSONL로 읽어 청크 단위로 calculate_batch()에 넣고,
+# 결과(result, error 컬럼 추가)를 청크마다 바로 출력합니다. 메모리 사용량은 입력 크기와 무관하게
+# 청크 크기(와 프로세스 풀 사용 시 진행 중인 청크 수)에 비례합니다.
+#
+#   python batch_calculator.py rows.csv -o results.csv
+#   cat rows.jsonl | python batch_calculator.py --format jsonl --workers 4 > results.jsonl
+#
+# CSV의 첫 줄이 숫자로 시작하지 않으면 헤더로 간주합니다. 단항 연산(log, sqrt, sin, cos, tan)은
+# num2를 비워 둘 수 있고, base는 log의 밑입니다 (생략하면 자연로그).
+
+COLUMNS = ['num1', 'num2', 'operation', 'base']
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def _has_header(stream):
+    # 입력을 소비하지 않고 첫 줄을 엿봅니다 (파일과 표준 입력 모두 BufferedReader).
+    first_line = stream.peek(4096).split(b'\n', 1)[0].decode('utf-8', 'replace')
+    first_field = first_line.split(',', 1)[0].strip()
+    try:
+        parse_complex(first_field)
+        return False
+    except ValueError:
+        return bool(first_field)
+
+
+def read_chunks(stream, fmt, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """입력 스트림을 num1/num2/operation/base 컬럼의 데이터프레임 청크로 읽습니다."""
+    if fmt == 'jsonl':
+        # 빈 줄을 건너뛰며 chunk_rows줄씩 읽습니다.
+        lines = (line for line in stream if line.strip())
+        while True:
+            block = list(islice(lines, chunk_rows))
+            if not block:
+                return
+            chunk = pd.read_json(io.BytesIO(b"".join(block)), lines=True, dtype=False, precise_float=True)
+            yield chunk.reindex(columns=COLUMNS + [c for c in chunk.columns if c not in COLUMNS])
+    header = 0 if _has_header(stream) else None
+    names = None if header == 0 else COLUMNS
+    for chunk in pd.read_csv(stream, header=header, names=names, chunksize=chunk_rows,
+                             skipinitialspace=True, dtype={'operation': str}):
+        yield chunk.reindex(columns=COLUMNS + [c for c in chunk.columns if c not in COLUMNS])
+
+
+def compute_chunk(num1, num2, operation, base, backend='float'):
+    """
+    한 청크의 배열을 계산하여 (결과 배열, 오류 메시지 배열)을 반환합니다.
+    오류 종류는 행마다 다시 계산하지 않고 batch_error_codes()의 연산자별 마스크로 한 번에 구하며,
+    메시지는 고유한 오류 코드마다 한 번만 만듭니다. 모든 행은 결과와 오류 메시지 중 하나를 가집니다.
+    """
+    # 연산자 문자열은 종류가 적으므로 고유값만 코드로 바꾼 뒤 역인덱스로 펼칩니다.
+    names, inverse = np.unique(operation.astype(str), return_inverse=True)
+    codes = np.array([OPERATION_CODES.get(name, -1) for name in names], dtype=np.int64)[inverse]
+    result, errors = calculate_batch(num1, num2, codes, base, backend=backend)
+    error_codes = batch_error_codes(num1, num2, codes, base, errors, backend=backend)
+    # 오류로 표시되지 않았는데 결과가 NaN인 행: 비어 있거나 읽을 수 없는 피연산자, 또는 inf - inf 같은 계산
+    # (알 수 없는 연산자 코드 -1은 마지막 False를 가리킵니다)
+    binary = np.array([OPERATORS[name].arity == 2 for name in OPERATIONS] + [False])[codes]
+    missing = np.isnan(num1) | (binary & np.isnan(num2))
+    unflagged = np.isnan(result) & ~errors
+    error_codes[unflagged & missing] = ERR_INVALID_INPUT
+    error_codes[unflagged & ~missing] = ERR_CALCULATION
+    error_codes[~(errors | unflagged)] = ""
+    kinds, inverse = np.unique(error_codes.astype(str), return_inverse=True)
+    messages = np.array([_error_message(kind) for kind in kinds], dtype=object)[inverse]
+    return result, messages
+
+
+def _error_message(code):
+    if not code:
+        return ""
+    # 배치 경로의 일반 계산 오류는 NaN 결과뿐입니다 (예외 메시지가 없음).
+    return CalcResult(error=code, detail="result is not a number").message
+
+
+def _parse_complex_value(text):
+    try:
+        return parse_complex(text)
+    except ValueError:
+        return complex('nan')
+
+
+def _chunk_arrays(chunk, backend):
+    if backend == 'complex':
+        def column(name):
+            values = chunk[name]
+            if not pd.api.types.is_numeric_dtype(values):
+                # "3+4i" 같은 문자열 컬럼: 읽을 수 없는 값은 NaN(입력 오류)이 됩니다.
+                values = values.fillna('nan').astype(str).map(_parse_complex_value)
+            return values.to_numpy(dtype=np.complex128)
+    else:
+        def column(name):
+            return pd.to_numeric(chunk[name], errors='coerce').to_numpy(dtype=np.float64)
+    operation = chunk['operation'].fillna('').astype(str).str.strip().to_numpy()
+    base = pd.to_numeric(chunk['base'], errors='coerce').to_numpy(dtype=np.float64)
+    return column('num1'), column('num2'), operation, base, backend
+
+
+def _format_results(result, backend):
+    if backend == 'complex':
+        return [f"{value.real:.17g}{value.imag:+.17g}i" if value == value else None
+                for value in result.tolist()]
+    return result
+
+
+def process_chunk(chunk, backend='float', fmt='csv', header=False):
+    """
+    청크 하나를 계산하고 출력 텍스트로 직렬화하여 (텍스트, 오류 행 수)를 반환합니다.
+    직렬화가 계산보다 오래 걸리므로 프로세스 풀에서는 이 함수 전체를 작업 단위로 보냅니다.
+    """
+    result, messages = compute_chunk(*_chunk_arrays(chunk, backend))
+    chunk = chunk.assign(result=_format_results(result, backend), error=messages)
+    if fmt == 'jsonl':
+        chunk = chunk.assign(error=chunk['error'].replace("", None))
+        text = chunk.to_json(orient='records', lines=True, force_ascii=False, double_precision=15)
+        text = text if text.endswith("\n") else text + "\n"
+    else:
+        text = chunk.to_csv(header=header, index=False, lineterminator="\n")
+    return text, int(np.count_nonzero(messages != ""))
+
+
+def process_chunks(chunks, backend='float', fmt='csv', workers=1):
+    """(행 수, 출력 텍스트, 오류 행 수)를 입력 순서대로 생성합니다. workers > 1이면 프로세스 풀을 사용합니다."""
+    if workers <= 1:
+        for i, chunk in enumerate(chunks):
+            yield (len(chunk), *process_chunk(chunk, backend, fmt, header=i == 0))
+        return
+    # 진행 중인 청크 수를 workers * 2로 제한하여 메모리 사용량을 일정하게 유지합니다.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for i, chunk in enumerate(chunks):
+            pending.append((len(chunk), executor.submit(process_chunk, chunk, backend, fmt, i == 0)))
+            if len(pending) >= workers * 2:
+                rows, future = pending.popleft()
+                yield (rows, *future.result())
+        for rows, future in pending:
+            yield (rows, *future.result())
+
+
+def _detect_format(path, fmt):
+    if fmt:
+        return fmt
+    return 'jsonl' if path and path.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def run(input_path='-', output_path='-', input_format=None, output_format=None,
+        chunk_rows=DEFAULT_CHUNK_ROWS, workers=1, backend='float'):
+    """입력을 청크 단위로 계산해 출력하고, 처리한 (행 수, 오류 행 수)를 반환합니다."""
+    input_format = _detect_format(input_path, input_format)
+    output_format = _detect_format(output_path, output_format) if output_format or output_path != '-' \
+        else input_format
+    source = sys.stdin.buffer if input_path == '-' else open(input_path, 'rb')
+    out = sys.stdout if output_path == '-' else open(output_path, 'w', encoding='utf-8', newline='')
+    rows = error_rows = 0
+    try:
+        chunks = read_chunks(source, input_format, chunk_rows)
+        for chunk_rows_done, text, chunk_errors in process_chunks(chunks, backend, output_format, workers):
+            out.write(text)
+            rows += chunk_rows_done
+            error_rows += chunk_errors
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+        else:
+            out.flush()
+    return rows, error_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV/JSONL 행을 청크 단위로 계산하는 배치 계산기")
+    parser.add_argument("input", nargs="?", default="-", help="입력 파일 (생략하거나 '-'이면 표준 입력)")
+    parser.add_argument("-o", "--output", default="-", help="출력 파일 (기본: 표준 출력)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="입력 형식 (기본: 확장자로 판단, 없으면 csv)")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="출력 형식 (기본: 입력 형식)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_ROWS, help="청크당 행 수")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"프로세스 수 (기본 1, 0이면 CPU 코어 수 {os.cpu_count()})")
+    parser.add_argument("--backend", choices=["float", "complex"], default="float", help="수치 백엔드")
+    parser.add_argument("--quiet", action="store_true", help="처리 요약을 표준 오류에 출력하지 않음")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+    try:
+        rows, error_rows = run(args.input, args.output, args.format, args.output_format,
+                               args.chunk_size, workers, args.backend)
+    except BrokenPipeError:
+        # `| head`처럼 출력을 받는 쪽이 먼저 끝난 경우: 남은 출력을 버리고 조용히 종료합니다.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    if not args.quiet:
+        print(f"{rows:,}행 처리 (오류 {error_rows:,}행)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# 브라우저 없이 실행하는 성능 측정 스크립트 모음
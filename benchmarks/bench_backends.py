@@ -0,0 +1,58 @@
+import argparse
+import json
+import timeit
+
+from calculator_logic import BACKENDS, evaluate
+
+# 수치 백엔드별 연산 1회당 비용 비교
+# 실행: python -m benchmarks.bench_backends [--number N] [--json]
+
+# (연산자, num1, num2, base) - 각 백엔드에서 같은 입력으로 측정합니다.
+CASES = [
+    ('+', 0.1, 0.2, None),
+    ('-', 1234.5678, 0.0001, None),
+    ('*', 3.14159, 2.71828, None),
+    ('/', 1.0, 3.0, None),
+    ('mod', 17.5, 4.0, None),
+    ('**', 2.0, 64.0, None),
+    ('log', 1000.0, None, 10),
+    ('sin', 30.0, None, None),
+    ('cos', 60.0, None, None),
+    ('tan', 45.0, None, None),
+]
+
+
+def run(number=20_000):
+    """백엔드 x 연산자별 1회 평균 시간(마이크로초)을 {backend: {op: us}}로 반환합니다."""
+    results = {}
+    for backend in BACKENDS:
+        timings = {}
+        for op, num1, num2, base in CASES:
+            seconds = min(timeit.repeat(
+                lambda: evaluate(num1, num2, op, base, backend=backend),
+                number=number, repeat=3
+            ))
+            timings[op] = seconds / number * 1e6
+        results[backend] = timings
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="calculator_logic 수치 백엔드 벤치마크")
+    parser.add_argument("--number", type=int, default=20_000, help="측정당 반복 횟수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    results = run(args.number)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    backends = list(results)
+    print(f"{'op':>5} " + " ".join(f"{name + ' (us)':>16}" for name in backends))
+    for op, *_ in CASES:
+        print(f"{op:>5} " + " ".join(f"{results[name][op]:16.3f}" for name in backends))
+
+
+if __name__ == "__main__":
+    main()
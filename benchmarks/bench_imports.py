@@ -0,0 +1,95 @@
+import argparse
+import json
+import subprocess
+import sys
+import timeit
+
+# 페이지 모듈 임포트 시간 보고서
+# 실행: python -m benchmarks.bench_imports [--repeat N] [--json]
+#
+# cold start: 새 파이썬 프로세스에서 streamlit을 먼저 불러온 뒤(두 방식 공통),
+#   eager  - 예전 app.py처럼 모든 페이지 모듈(PAGE_MODULES)을 임포트하는 시간
+#   lazy   - 선택한 페이지 모듈 하나만 임포트하는 시간 (app.py의 load_page)
+# 을 측정하고, 무거운 의존성(pandas, plotly.express)이 로드되었는지 함께 기록합니다.
+# per rerun: 모듈이 이미 로드된 상태에서 재실행마다 실행되는 임포트 문 자체의 비용입니다.
+
+PAGE_MODULES = ['calculator_page', 'probability_page', 'world_population_page', 'function_plot_page']
+HEAVY_MODULES = ['pandas', 'plotly.express', 'sqlite3']
+
+_COLD_SCRIPT = """
+import json, sys, time
+import streamlit
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'modules': len(sys.modules),
+                  'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _cold_import(modules, repeat):
+    """새 프로세스에서 modules를 임포트하는 데 걸린 최소 시간과 로드된 모듈 정보."""
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _COLD_SCRIPT.format(modules=modules, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return best
+
+
+def _rerun_cost(statement, setup, number=10_000):
+    return min(timeit.repeat(statement, setup, number=number, repeat=3)) / number
+
+
+def run(repeat=3):
+    eager = _cold_import(PAGE_MODULES, repeat)
+    results = {'eager_all_pages': eager}
+    for module in PAGE_MODULES:
+        lazy = _cold_import([module], repeat)
+        lazy['saved_seconds'] = eager['seconds'] - lazy['seconds']
+        results[f"lazy_{module}"] = lazy
+
+    setup = "import importlib\n" + "\n".join(f"import {name}" for name in PAGE_MODULES)
+    eager_rerun = _rerun_cost(
+        "from calculator_page import calculator_page\n"
+        "from probability_page import probability_page\n"
+        "from world_population_page import world_population_page", setup)
+    lazy_rerun = _rerun_cost("importlib.import_module('calculator_page')", setup)
+    results['per_rerun'] = {
+        'eager_us': eager_rerun * 1e6,
+        'lazy_us': lazy_rerun * 1e6,
+        'saved_us': (eager_rerun - lazy_rerun) * 1e6,
+    }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지 모듈 지연 임포트 효과 보고서")
+    parser.add_argument("--repeat", type=int, default=3, help="cold start 측정 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    eager = results['eager_all_pages']
+    print(f"cold start (streamlit 이후), eager 전체 페이지: {eager['seconds'] * 1000:8.1f} ms  "
+          f"무거운 의존성: {', '.join(eager['heavy']) or '-'}")
+    for module in PAGE_MODULES:
+        lazy = results[f"lazy_{module}"]
+        print(f"cold start, lazy {module:<22}: {lazy['seconds'] * 1000:8.1f} ms  "
+              f"(절약 {lazy['saved_seconds'] * 1000:6.1f} ms)  무거운 의존성: {', '.join(lazy['heavy']) or '-'}")
+    rerun = results['per_rerun']
+    print(f"재실행당 임포트 문 비용: eager {rerun['eager_us']:.2f} us, lazy {rerun['lazy_us']:.2f} us "
+          f"(절약 {rerun['saved_us']:.2f} us)")
+
+
+if __name__ == "__main__":
+    main()
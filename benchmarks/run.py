@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+import numpy as np
+
+# 브라우저 없이 실행하는 벤치마크 모음
+# 실행: python -m benchmarks.run [--quick] [--sections calculator,simulation,...] [--output FILE]
+#       python -m benchmarks.run --compare BASELINE.json   (이전 결과와 비교)
+#
+# 결과는 {"meta": {...}, "results": {섹션: {측정 이름: {지표: 값}}}} 형식의 JSON이며,
+# 시간 지표는 초(seconds) 또는 마이크로초(*_us), 처리량 지표는 *_per_sec입니다.
+# 커밋마다 JSON을 저장해 두고 --compare로 비교하면 성능 회귀를 확인할 수 있습니다.
+
+CSV_FILE_PATH = "world_population.csv"
+TRIAL_COUNTS = [10_000, 100_000, 1_000_000, 10_000_000, 100_000_000]
+QUICK_TRIAL_COUNTS = [10_000, 100_000, 1_000_000]
+BATCH_SIZE = 1_000_000
+
+
+def _best_of(fn, repeat=3):
+    """fn()을 repeat번 실행한 시간 중 최솟값(초)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# --- 계산기 ---
+
+def bench_calculator(quick=False):
+    """연산자별 calculate() 스칼라 처리량과 calculate_batch() 배열 처리량."""
+    from calculator_logic import OPERATIONS, calculate, calculate_batch
+
+    number = 2_000 if quick else 20_000
+    size = BATCH_SIZE // 10 if quick else BATCH_SIZE
+    rng = np.random.default_rng(0)
+    a = rng.uniform(1, 100, size)
+    b = rng.uniform(1, 10, size)
+    results = {}
+    for op in OPERATIONS:
+        base = 10 if op == 'log' else None
+        num2 = None if op in ('log', 'sqrt', 'sin', 'cos', 'tan') else 3.0
+        scalar = min(timeit.repeat(lambda: calculate(47.5, num2, op, base), number=number, repeat=3))
+        batch = _best_of(lambda: calculate_batch(a, b, op, base))
+        results[op] = {
+            'scalar_us': scalar / number * 1e6,
+            'scalar_per_sec': number / scalar,
+            'batch_seconds': batch,
+            'batch_per_sec': size / batch,
+        }
+    return results
+
+
+def bench_backends(quick=False):
+    """수치 백엔드별 연산 1회 평균 시간 (benchmarks.bench_backends)."""
+    from benchmarks.bench_backends import run
+
+    return {backend: {op: {'us': us} for op, us in timings.items()}
+            for backend, timings in run(2_000 if quick else 20_000).items()}
+
+
+# --- 확률 시뮬레이터 ---
+
+def bench_simulation(quick=False):
+    """시행 횟수별 시뮬레이션 시간 (주사위 1개, 단일 워커와 전체 코어)."""
+    from distributions import Dice
+    from simulation_engine import default_workers, simulate
+
+    dice = Dice(6)
+    workers = default_workers()
+    results = {}
+    for num_trials in (QUICK_TRIAL_COUNTS if quick else TRIAL_COUNTS):
+        repeat = 1 if num_trials >= 10_000_000 else 3
+        for label, n_workers in (('1_worker', 1), (f'{workers}_workers', workers)):
+            if label != '1_worker' and workers == 1:
+                continue
+            seconds = _best_of(lambda: simulate(dice, num_trials, seed=0, workers=n_workers), repeat)
+            results[f"{num_trials}_trials_{label}"] = {
+                'seconds': seconds,
+                'trials_per_sec': num_trials / seconds,
+            }
+    return results
+
+
+# --- 인구 데이터 ---
+
+def bench_population(file_path=CSV_FILE_PATH):
+    """
+    데이터 로드 지연 시간:
+      cold_csv       디스크 캐시가 없을 때 (CSV 파싱 + 컬럼형 캐시 작성)
+      warm_disk      디스크 캐시(메모리 맵)에서 읽을 때
+      load_data_*    페이지의 load_data() 첫 호출(프로세스 캐시 비움)과 반복 호출
+    """
+    from population_data import PopulationStore
+    import world_population_page
+
+    results = {}
+    cache_dir = tempfile.mkdtemp(prefix="population-bench-")
+    try:
+        start = time.perf_counter()
+        PopulationStore(file_path, cache_dir)
+        results['cold_csv'] = {'seconds': time.perf_counter() - start}
+        results['warm_disk'] = {'seconds': _best_of(lambda: PopulationStore(file_path, cache_dir))}
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    world_population_page._get_store.clear()
+    start = time.perf_counter()
+    world_population_page.load_data(file_path)
+    results['load_data_first'] = {'seconds': time.perf_counter() - start}
+    results['load_data_warm'] = {'seconds': _best_of(lambda: world_population_page.load_data(file_path), 10)}
+    return results
+
+
+def bench_choropleth(file_path=CSV_FILE_PATH):
+    """애니메이션 지도 생성과 JSON 직렬화 시간 (전체 및 연도(프레임)당)."""
+    from population_data import PopulationStore
+    from population_figures import build_animated_choropleth
+
+    store = PopulationStore(file_path)
+    df, year_index = store.frame, store.year_index
+    num_years = len(year_index)
+
+    build = _best_of(lambda: build_animated_choropleth(df, year_index))
+    fig = build_animated_choropleth(df, year_index)
+    serialize = _best_of(fig.to_json)
+    return {
+        'animated': {
+            'years': num_years,
+            'build_seconds': build,
+            'serialize_seconds': serialize,
+            'build_per_year_seconds': build / num_years,
+            'serialize_per_year_seconds': serialize / num_years,
+            'json_bytes': len(fig.to_json()),
+        }
+    }
+
+
+# --- 함수 그래프 ---
+
+def bench_plot(quick=False):
+    """샘플 수별 적응형 샘플링과 표시용 축소 시간, 브라우저로 보내는 점 수."""
+    from function_plot import decimate, sample_function
+
+    results = {}
+    for text, x_min, x_max in (("sin(x)", -360, 360), ("tan(x)", -361.3, 359.7)):
+        for num_points in ((100_000,) if quick else (100_000, 1_000_000, 5_000_000)):
+            samples = sample_function(text, x_min, x_max, num_points)
+            results[f"{text}_{num_points}_points"] = {
+                'sample_seconds': _best_of(lambda: sample_function(text, x_min, x_max, num_points)),
+                'decimate_seconds': _best_of(lambda: decimate(samples.x, samples.y)),
+                'evaluated_points': len(samples),
+                'displayed_points': len(decimate(samples.x, samples.y)[0]),
+            }
+    return results
+
+
+def bench_imports(quick=False):
+    """페이지 모듈 cold start 임포트 시간 (eager vs lazy)과 재실행당 임포트 문 비용."""
+    from benchmarks.bench_imports import run
+
+    return run(1 if quick else 3)
+
+
+SECTIONS = {
+    'calculator': bench_calculator,
+    'backends': bench_backends,
+    'simulation': bench_simulation,
+    'population': lambda quick: bench_population(),
+    'choropleth': lambda quick: bench_choropleth(),
+    'plot': bench_plot,
+    'imports': bench_imports,
+}
+
+
+# --- 결과 메타데이터 / 비교 ---
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata():
+    import pandas as pd
+
+    return {
+        'commit': _git_commit(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def _flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, name + "."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline, current):
+    """두 결과의 공통 지표를 (이름, 이전 값, 현재 값, 비율) 목록으로 반환합니다."""
+    old, new = _flatten(baseline['results']), _flatten(current['results'])
+    return [(name, old[name], new[name], new[name] / old[name] if old[name] else float('nan'))
+            for name in sorted(old.keys() & new.keys())]
+
+
+def run(sections=None, quick=False):
+    results = {}
+    for name in sections or SECTIONS:
+        print(f"[benchmark] {name} ...", file=sys.stderr)
+        results[name] = SECTIONS[name](quick)
+    return {'meta': metadata(), 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="계산기/시뮬레이터/인구 페이지 벤치마크 (JSON 출력)")
+    parser.add_argument("--sections", help=f"쉼표로 구분한 섹션 ({', '.join(SECTIONS)})")
+    parser.add_argument("--quick", action="store_true", help="작은 입력으로 빠르게 실행")
+    parser.add_argument("--output", help="결과 JSON을 저장할 파일 (생략하면 표준 출력)")
+    parser.add_argument("--compare", metavar="BASELINE", help="이전 결과 JSON과 지표별 비율을 출력")
+    args = parser.parse_args()
+
+    sections = args.sections.split(",") if args.sections else None
+    unknown = set(sections or ()) - SECTIONS.keys()
+    if unknown:
+        parser.error(f"알 수 없는 섹션: {', '.join(sorted(unknown))}")
+
+    report = run(sections, args.quick)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\n{'metric':<60} {'baseline':>14} {'current':>14} {'ratio':>8}", file=sys.stderr)
+        for name, old, new, ratio in compare(baseline, report):
+            print(f"{name:<60} {old:14.6g} {new:14.6g} {ratio:8.3f}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import threading
+import time
+from collections import deque
+from decimal import Decimal
+from fractions import Fraction
+
+import numpy as np
+
+from calculator_logic import CalcResult, OPERATORS, calculate_batch, evaluate_memoized
+
+# 계산 기록
+# 세션마다 최근 계산(피연산자, 연산자, 결과)을 크기가 고정된 링 버퍼(deque)에 보관합니다.
+# 선택적으로 SQLite 저장소를 연결하면 기록이 디스크에도 추가되어 서버를 재시작해도
+# 최근 기록을 다시 불러올 수 있습니다. 저장소는 여러 세션이 공유하므로 각 행에 기록 소유자 id
+# (session)를 함께 저장하고, 불러올 때는 같은 id의 행만 읽습니다. 기록 전체는 calculate_batch()를 거쳐 한 번에
+# 재계산(replay)하거나 CSV로 내보낼 수 있습니다.
+
+HISTORY_SIZE = 200
+
+# 저장소에 문자열로 저장한 값을 백엔드의 수 타입으로 되돌리는 함수
+VALUE_PARSERS = {'float': float, 'decimal': Decimal, 'fraction': Fraction, 'complex': complex}
+
+
+def _is_complex(value):
+    return isinstance(value, (complex, np.complexfloating))
+
+
+def _parse_value(text, backend):
+    """
+    저장된 문자열을 수로 되돌립니다. float 모드에서도 음수의 분수 거듭제곱 등은 복소수 결과가
+    되므로("(1.7e-16+2.8j)"), 백엔드보다 문자열의 실제 형태를 먼저 봅니다.
+    """
+    if text is None:
+        return None
+    if text.endswith(('j', 'j)')):
+        return complex(text)
+    return VALUE_PARSERS.get(backend, float)(text)
+
+
+def _operand_text(value):
+    return CalcResult(value).format()
+
+
+def format_expression(num1, num2, operation, base=None):
+    """기록에 표시할 수식 문자열 ("3 + 4", "sin(30)", "log(100)")."""
+    operator = OPERATORS.get(operation)
+    if operator is not None and operator.arity == 1:
+        if operation == 'log' and base not in (None, 10):
+            return f"log({_operand_text(num1)}, {_operand_text(base)})"
+        return f"{operation}({_operand_text(num1)})"
+    return f"{_operand_text(num1)} {operation} {_operand_text(num2)}"
+
+
+class HistoryEntry:
+    """계산 기록 한 건."""
+
+    __slots__ = ('num1', 'num2', 'operation', 'base', 'backend', 'value', 'error', 'display',
+                 'created_at')
+
+    def __init__(self, num1, num2, operation, base, backend, value, error, display, created_at=None):
+        self.num1 = num1
+        self.num2 = num2
+        self.operation = operation
+        self.base = base
+        self.backend = backend
+        self.value = value
+        self.error = error
+        self.display = display
+        self.created_at = time.time() if created_at is None else created_at
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def expression(self):
+        return format_expression(self.num1, self.num2, self.operation, self.base)
+
+    def __repr__(self):
+        return f"HistoryEntry({self.expression} = {self.display})"
+
+
+class SQLiteHistoryStore:
+    """계산 기록을 SQLite 파일에 추가 저장하는 선택적 저장소."""
+
+    _COLUMNS = ('created_at', 'backend', 'operation', 'num1', 'num2', 'base', 'value', 'error', 'display',
+                'session')
+
+    def __init__(self, path):
+        import sqlite3 # 디스크 기록을 켠 경우에만 임포트합니다 (계산기 시작 시간).
+
+        self.path = path
+        # Streamlit은 세션마다 다른 스레드에서 스크립트를 실행하므로 스레드 검사를 끕니다.
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL, backend TEXT, operation TEXT, "
+                "num1 TEXT, num2 TEXT, base REAL, value TEXT, error TEXT, display TEXT, session TEXT)"
+            )
+            # session 열이 없던 이전 버전의 파일에는 열을 추가합니다 (기존 행은 소유자가 없어 불러오지 않습니다).
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(history)")}
+            if 'session' not in columns:
+                self._conn.execute("ALTER TABLE history ADD COLUMN session TEXT")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS history_session ON history (session, id)")
+
+    def append(self, entry, session):
+        """session(기록 소유자 id)의 기록으로 한 건을 추가합니다."""
+        def text(value):
+            return None if value is None else str(value)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT INTO history ({', '.join(self._COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (entry.created_at, entry.backend, entry.operation, text(entry.num1), text(entry.num2),
+                 entry.base, text(entry.value), entry.error, entry.display, session)
+            )
+
+    def load(self, session, limit=HISTORY_SIZE):
+        """session의 가장 최근 limit건을 오래된 순서로 반환합니다 (다른 세션의 기록은 읽지 않습니다)."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM history WHERE session = ? ORDER BY id DESC LIMIT ?",
+                (session, limit)
+            ).fetchall()
+        entries = []
+        for created_at, backend, operation, num1, num2, base, value, error, display, _ in reversed(rows):
+            entries.append(HistoryEntry(
+                _parse_value(num1, backend), _parse_value(num2, backend), operation, base, backend,
+                _parse_value(value, backend), error, display, created_at
+            ))
+        return entries
+
+    def clear(self, session=None):
+        """session의 기록을 지웁니다 (None이면 모든 세션)."""
+        with self._lock, self._conn:
+            if session is None:
+                self._conn.execute("DELETE FROM history")
+            else:
+                self._conn.execute("DELETE FROM history WHERE session = ?", (session,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CalculationHistory:
+    """크기가 고정된 계산 기록 링 버퍼 (가득 차면 가장 오래된 항목부터 버립니다)."""
+
+    def __init__(self, maxlen=HISTORY_SIZE, store=None, session=None):
+        """
+        store가 있으면 session(기록 소유자 id)의 최근 기록만 미리 불러오고 이후 기록도 그 id로 저장합니다.
+        session이 None이면 저장소에서 불러오지 않고 새 기록만 추가합니다.
+        """
+        self.store = store
+        self.session = session
+        preload = store.load(session, maxlen) if store is not None and session is not None else ()
+        self.entries = deque(preload, maxlen=maxlen)
+
+    def record(self, num1, num2, operation, base, result, backend='float'):
+        """evaluate() 결과(CalcResult) 한 건을 기록합니다."""
+        entry = HistoryEntry(num1, num2, operation, base, backend, result.value, result.error,
+                             result.format())
+        self.entries.append(entry)
+        if self.store is not None:
+            self.store.append(entry, self.session)
+        return entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    def clear(self):
+        """세션 기록을 비웁니다 (디스크 저장소는 그대로 둡니다)."""
+        self.entries.clear()
+
+    def to_frame(self):
+        """기록을 데이터프레임(수식, 결과, 백엔드, 시각)으로 반환합니다."""
+        import pandas as pd # 계산기 페이지 시작 시간을 줄이기 위해 내보낼 때만 임포트합니다.
+
+        entries = list(self.entries)
+        return pd.DataFrame({
+            'expression': [entry.expression for entry in entries],
+            'result': [entry.display for entry in entries],
+            'backend': [entry.backend for entry in entries],
+            'created_at': pd.to_datetime([entry.created_at for entry in entries], unit='s'),
+        })
+
+    def to_csv(self):
+        """기록을 CSV 문자열로 내보냅니다."""
+        return self.to_frame().to_csv(index=False)
+
+    def replay(self):
+        """
+        기록 전체를 다시 계산하여 CalcResult 목록으로 반환합니다.
+        float/complex 항목은 백엔드별로 calculate_batch() 한 번에 계산하고,
+        Decimal/Fraction 항목과 피연산자가 복소수인 float 항목은 메모이즈된 evaluate로 계산합니다.
+        """
+        entries = list(self.entries)
+        results = [None] * len(entries)
+        for backend in ('float', 'complex'):
+            rows = [i for i, entry in enumerate(entries) if entry.backend == backend
+                    and (backend == 'complex' or not (_is_complex(entry.num1) or _is_complex(entry.num2)))]
+            if not rows:
+                continue
+            dtype = np.complex128 if backend == 'complex' else np.float64
+            num1 = np.array([entries[i].num1 for i in rows], dtype=dtype)
+            num2 = np.array([np.nan if entries[i].num2 is None else entries[i].num2 for i in rows],
+                            dtype=dtype)
+            base = np.array([np.nan if entries[i].base is None else entries[i].base for i in rows])
+            ops = [entries[i].operation for i in rows]
+            values, errors = calculate_batch(num1, num2, ops, base, backend=backend)
+            for i, value, error in zip(rows, values.tolist(), errors.tolist()):
+                # 배치 경로는 오류 종류 대신 마스크만 반환하므로 오류 항목은 스칼라 경로로 다시 계산합니다.
+                results[i] = _scalar_result(entries[i]) if error else CalcResult(value)
+        for i, entry in enumerate(entries):
+            if results[i] is None:
+                results[i] = _scalar_result(entry)
+        return results
+
+
+def _scalar_result(entry):
+    return evaluate_memoized(entry.num1, entry.num2, entry.operation, entry.base, backend=entry.backend)
@@ -0,0 +1,216 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import numpy as np
+
+from calculator_logic import DEFAULT_DECIMAL_PRECISION, evaluate_memoized, parse_complex
+
+# Streamlit과 무관한 계산기 상태 기계
+# 계산기 페이지의 버튼 처리 로직(숫자, 소수점, AC, 단항/이항 연산자, =)을
+# __slots__ 객체 하나에 담았습니다. 페이지는 세션마다 엔진 객체 하나만 보관하고
+# 버튼 레이블을 press()로 전달하며, 같은 키 입력 시퀀스를 replay()로 일괄 재생하거나
+# 테스트/벤치마크할 수 있습니다.
+# 계산 결과는 화면 문자열과 별도로 value에 원래 타입(float, Decimal, Fraction, complex) 그대로
+# 보관하며, 사용자가 새 숫자를 입력하기 전까지는 화면 문자열을 다시 파싱하지 않고 이 값을 씁니다.
+
+# 수치 백엔드별로 화면 문자열을 피연산자로 바꾸는 함수
+# (Fraction은 "1/3" 형식을, complex는 "3+4i" 형식을 읽습니다)
+PARSERS = {'float': float, 'decimal': Decimal, 'fraction': Fraction, 'complex': parse_complex}
+
+
+class CalculatorEngine:
+    """버튼 기반 계산기의 상태와 키 입력 처리."""
+
+    __slots__ = ('current_input', 'operator', 'first_number', 'waiting_for_second', 'last_result',
+                 'value', 'backend', 'decimal_precision', '_parse', 'history')
+
+    def __init__(self, backend='float', decimal_precision=DEFAULT_DECIMAL_PRECISION, history=None):
+        self.history = history # calculation_history.CalculationHistory (None이면 기록하지 않음)
+        self.clear()
+        self.set_backend(backend, decimal_precision)
+
+    def set_backend(self, backend, decimal_precision=DEFAULT_DECIMAL_PRECISION):
+        """수치 백엔드('float', 'decimal', 'fraction', 'complex')를 바꿉니다. 화면 값은 유지됩니다."""
+        self._parse = PARSERS[backend]
+        self.backend = backend
+        self.decimal_precision = decimal_precision
+        self.value = None # 이전 백엔드의 값 대신 화면 문자열을 새 백엔드로 다시 읽습니다.
+
+    def _operand(self):
+        """화면에 표시된 피연산자: 계산 결과이면 보관된 값을, 입력 중이면 파싱한 값을 반환합니다."""
+        if self.value is not None:
+            return self.value
+        return self._parse(self.current_input)
+
+    def _show(self, result):
+        # 결과를 화면에 표시하고, 성공한 경우 값도 원래 타입 그대로 보관합니다.
+        # NumPy 스칼라(np.float64 등)는 파이썬 수로 바꿔, 다음 연산이 파이썬 float의 오류 규칙을 따르게 합니다.
+        self.current_input = result.format()
+        value = result.value if result.ok else None
+        self.value = value.item() if isinstance(value, np.generic) else value
+
+    def _evaluate(self, num1, num2, op, base=None):
+        if self.backend == 'float':
+            result = evaluate_memoized(num1, num2, op, base)
+        else:
+            result = evaluate_memoized(num1, num2, op, base, backend=self.backend,
+                                       decimal_precision=self.decimal_precision)
+        if self.history is not None:
+            self.history.record(num1, num2, op, base, result, self.backend)
+        return result
+
+    def clear(self):
+        """초기화 (AC) 버튼 클릭 처리"""
+        self.current_input = '0'         # 현재 화면에 표시되는 값
+        self.operator = None             # 선택된 연산자
+        self.first_number = None         # 첫 번째 숫자 (피연산자)
+        self.waiting_for_second = False  # 두 번째 숫자 입력을 기다리는지 여부
+        self.last_result = None          # 마지막 계산 결과 (연속 계산용)
+        self.value = None                # 화면에 표시된 계산 결과 값 (입력 중이면 None)
+
+    def number(self, number):
+        """숫자 버튼 클릭 처리"""
+        if self.waiting_for_second or self.current_input == '0' or self.last_result is not None:
+            self.current_input = str(number)
+            self.waiting_for_second = False
+            self.last_result = None
+        else:
+            self.current_input += str(number)
+        self.value = None
+
+    def decimal(self):
+        """소수점 버튼 클릭 처리"""
+        if '.' not in self.current_input:
+            self.current_input += '.'
+        self.value = None
+
+    def imaginary(self):
+        """허수 단위(i) 버튼 클릭 처리 (복소수 모드에서만 동작합니다)"""
+        if self.backend != 'complex' or self.current_input.endswith('i'):
+            return
+        if self.waiting_for_second or self.last_result is not None or self.current_input == '0':
+            self.current_input = '1i'
+            self.waiting_for_second = False
+            self.last_result = None
+        else:
+            self.current_input += 'i'
+        self.value = None
+
+    def unary(self, op):
+        """단항 연산 (sin, log 등) 처리"""
+        try:
+            num = self._operand()
+        except (ValueError, ArithmeticError):
+            self.current_input = "Error: Invalid Input"
+            return
+        base = 10 if op == 'log' else None
+        result = self._evaluate(num, None, op, base)
+
+        self._show(result)
+        if result.ok:
+            self.last_result = self.value
+        self.waiting_for_second = True
+
+    def binary_operator(self, op):
+        """이항 연산자 (+, -, *, / 등) 처리"""
+        try:
+            current_num = self._operand()
+        except (ValueError, ArithmeticError):
+            self.current_input = "Error: Invalid Input"
+            return
+
+        if self.first_number is None or self.last_result is not None:
+            self.first_number = current_num
+            self.operator = op
+            self.waiting_for_second = True
+            self.last_result = None
+            return
+
+        result = self._evaluate(self.first_number, current_num, self.operator)
+        self._show(result)
+        if result.ok:
+            self.first_number = self.value
+            self.operator = op
+        else:
+            self.first_number = None
+            self.operator = None
+        self.waiting_for_second = True
+
+    def equals(self):
+        """= 버튼 클릭 처리"""
+        if not (self.operator and self.first_number is not None):
+            return
+        try:
+            second_num = self._operand()
+        except (ValueError, ArithmeticError):
+            self.current_input = "Error: Invalid Input"
+            return
+
+        result = self._evaluate(self.first_number, second_num, self.operator)
+        self._show(result)
+        if result.ok:
+            self.first_number = None
+            self.operator = None
+            self.waiting_for_second = True
+            self.last_result = self.value
+
+    def recall(self, entry):
+        """계산 기록 항목의 결과를 다시 계산하지 않고 화면으로 불러옵니다."""
+        if not entry.ok:
+            return
+        self.current_input = entry.display
+        # 다른 백엔드에서 계산한 값이면 화면 문자열을 현재 백엔드로 다시 읽습니다.
+        self.value = entry.value if entry.backend == self.backend else None
+        self.waiting_for_second = True
+        if self.operator is None:
+            self.last_result = entry.value # 대기 중인 연산이 없으면 '=' 직후와 같은 상태
+
+    def press(self, key):
+        """버튼 레이블(예: '7', 'ADD', 'sin', '=')에 해당하는 키 입력을 처리합니다."""
+        action, arg = KEY_ACTIONS[key]
+        if arg is None:
+            action(self)
+        else:
+            action(self, arg)
+        return self.current_input
+
+    def replay(self, keys):
+        """키 입력 시퀀스를 차례로 처리하고 최종 화면 값을 반환합니다."""
+        actions = KEY_ACTIONS
+        for key in keys:
+            action, arg = actions[key]
+            if arg is None:
+                action(self)
+            else:
+                action(self, arg)
+        return self.current_input
+
+    def snapshot(self):
+        """현재 상태를 튜플로 반환합니다 (비교/디버깅용)."""
+        return (self.current_input, self.operator, self.first_number,
+                self.waiting_for_second, self.last_result)
+
+    def __repr__(self):
+        return f"CalculatorEngine(display={self.current_input!r})"
+
+
+# 버튼 레이블 -> (메서드, 인수). 계산기 화면의 레이블을 그대로 사용합니다.
+KEY_ACTIONS = {
+    **{str(digit): (CalculatorEngine.number, digit) for digit in range(10)},
+    '.': (CalculatorEngine.decimal, None),
+    'AC': (CalculatorEngine.clear, None),
+    '=': (CalculatorEngine.equals, None),
+    'ADD': (CalculatorEngine.binary_operator, '+'),
+    'SUB': (CalculatorEngine.binary_operator, '-'),
+    'MUL': (CalculatorEngine.binary_operator, '*'),
+    'DIV': (CalculatorEngine.binary_operator, '/'),
+    'mod': (CalculatorEngine.binary_operator, 'mod'),
+    'EXP': (CalculatorEngine.binary_operator, '**'),
+    'sin': (CalculatorEngine.unary, 'sin'),
+    'cos': (CalculatorEngine.unary, 'cos'),
+    'tan': (CalculatorEngine.unary, 'tan'),
+    'log': (CalculatorEngine.unary, 'log'),
+    'sqrt': (CalculatorEngine.unary, 'sqrt'),
+    'i': (CalculatorEngine.imaginary, None),
+    '': (lambda engine: None, None), # 공백 버튼
+}
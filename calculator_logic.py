@@ -1,55 +1,762 @@
+import decimal
+import math
+from decimal import Decimal
+from fractions import Fraction
+from functools import lru_cache
+
 import numpy as np
 import cmath # 복소수 계산을 위해 cmath 모듈을 가져옵니다.
 
-def calculate(num1, num2, operation, base=None):
+# --- 오류 코드 ---
+# 연산 결과는 CalcResult로 반환되며, 오류는 문자열 대신 아래의 오류 코드로 전달됩니다.
+ERR_DIVISION_BY_ZERO = 'division_by_zero'
+ERR_MODULO_BY_ZERO = 'modulo_by_zero'
+ERR_LOG_DOMAIN = 'log_domain'
+ERR_LOG_BASE = 'log_base'
+ERR_TAN_UNDEFINED = 'tan_undefined'
+ERR_INVALID_OPERATION = 'invalid_operation'
+ERR_CALCULATION = 'calculation'
+ERR_OVERFLOW = 'overflow'
+ERR_SQRT_DOMAIN = 'sqrt_domain'
+ERR_COMPLEX_UNDEFINED = 'complex_undefined'
+ERR_COMPLEX_RESULT = 'complex_result'
+ERR_INVALID_INPUT = 'invalid_input'
+
+ERROR_MESSAGES = {
+    ERR_DIVISION_BY_ZERO: "Error: Division by zero",
+    ERR_MODULO_BY_ZERO: "Error: Modulo by zero",
+    ERR_LOG_DOMAIN: "Error: Log domain error (x <= 0)",
+    ERR_LOG_BASE: "Error: Invalid log base",
+    ERR_TAN_UNDEFINED: "Error: Tangent undefined",
+    ERR_INVALID_OPERATION: "Error: Invalid operation",
+    ERR_OVERFLOW: "Error: Result too large",
+    ERR_SQRT_DOMAIN: "Error: Square root of negative number",
+    ERR_COMPLEX_UNDEFINED: "Error: Not defined for complex numbers",
+    ERR_COMPLEX_RESULT: "Error: Complex result (use complex mode)",
+    ERR_INVALID_INPUT: "Error: Invalid number",
+}
+
+
+class CalculationError(ArithmeticError):
+    """연산 커널이 정의역 오류 등을 알릴 때 발생시키는 예외 (오류 코드를 담습니다)."""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+
+class CalcResult:
+    """계산 결과: 값, 오류 코드, 표시 정밀도(유효 숫자)를 담는 경량 객체."""
+
+    __slots__ = ('value', 'error', 'precision', 'detail')
+
+    def __init__(self, value=None, error=None, precision=10, detail=None):
+        self.value = value
+        self.error = error
+        self.precision = precision
+        self.detail = detail # ERR_CALCULATION일 때의 원본 예외 메시지
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def message(self):
+        """오류 메시지 (기존 calculate()가 반환하던 문자열과 동일합니다)."""
+        if self.error is None:
+            return None
+        if self.error == ERR_CALCULATION:
+            return f"Calculation Error: {self.detail}"
+        return ERROR_MESSAGES.get(self.error, f"Error: {self.error}")
+
+    def format(self):
+        """계산기 화면에 표시할 문자열을 반환합니다."""
+        if self.error is not None:
+            return self.message
+        if isinstance(self.value, Fraction):
+            return _format_fraction(self.value, self.precision)
+        if isinstance(self.value, (complex, np.complexfloating)):
+            return format_complex(self.value, self.precision)
+        if isinstance(self.value, (int, float, np.number)):
+            return f"{self.value:.{self.precision}g}"
+        return str(self.value)
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"CalcResult(error={self.error!r})"
+        return f"CalcResult(value={self.value!r})"
+
+
+def _format_fraction(value, precision):
+    # 분모가 1이면 정수(큰 정수 포함) 전체를, 아니면 "분자/분모"를 표시합니다.
+    # 수천 자리를 넘는 값은 문자열 변환 제한이 있으므로 Decimal 지수 표기로 표시합니다.
+    if max(value.numerator.bit_length(), value.denominator.bit_length()) > MAX_DISPLAY_BITS:
+        with decimal.localcontext(prec=precision):
+            return f"{Decimal(value.numerator) / Decimal(value.denominator):.{precision - 1}E}"
+    if value.denominator == 1:
+        return str(value.numerator)
+    return f"{value.numerator}/{value.denominator}"
+
+
+def format_complex(value, precision=10):
     """
-    주어진 두 숫자와 연산자에 따라 계산을 수행합니다.
+    복소수를 계산기 화면 형식("3+4i", "-2i", "5")으로 표시합니다.
+    크기에 비해 무시할 만한(1e-15 배 이하) 실수부/허수부는 반올림 오차로 보고 0으로 표시합니다.
     """
+    value = complex(value)
+    if not (math.isfinite(value.real) and math.isfinite(value.imag)):
+        # inf/nan이 있으면 크기 기준의 정리(0으로 지우기)가 의미가 없으므로 그대로 표시합니다.
+        return f"{value.real:.{precision}g}{value.imag:+.{precision}g}i"
+    scale = abs(value) * 1e-15
+    real = 0.0 if abs(value.real) <= scale else value.real
+    imag = 0.0 if abs(value.imag) <= scale else value.imag
+    if imag == 0:
+        return f"{real + 0.0:.{precision}g}" # -0.0은 0으로 표시
+    if real == 0:
+        return f"{imag:.{precision}g}i"
+    return f"{real:.{precision}g}{imag:+.{precision}g}i"
+
+
+def parse_complex(text):
+    """계산기 화면 문자열("3+4i", "2.5i", "7")을 complex로 변환합니다."""
+    text = text.strip()
+    if text.endswith('i'):
+        text = text[:-1] + 'j'
+    return complex(text)
+
+
+# --- 연산자 레지스트리 ---
+
+class Operator:
+    """등록된 연산자: 스칼라 커널, 배치(벡터화) 커널, 피연산자 개수(arity)."""
+
+    __slots__ = ('name', 'arity', 'kernel', 'batch_kernel', 'code')
+
+    def __init__(self, name, arity, kernel, batch_kernel, code):
+        self.name = name
+        self.arity = arity
+        self.kernel = kernel
+        self.batch_kernel = batch_kernel
+        self.code = code
+
+
+OPERATORS = {}
+# 연산자 문자열과 정수 연산 코드의 대응표 (배치 계산에서 연산 코드 배열로 사용)
+OPERATIONS = []
+OPERATION_CODES = {}
+
+
+def _vectorize_kernel(kernel):
+    """배치 커널이 없는 연산자를 위해 스칼라 커널을 원소별로 적용하는 배치 커널을 만듭니다."""
+    def batch_kernel(a, b, base):
+        a, b, base = np.broadcast_arrays(a, b, base)
+        result = np.full(a.shape, np.nan)
+        errors = np.zeros(a.shape, dtype=bool)
+        for index in np.ndindex(a.shape):
+            try:
+                value = kernel(float(a[index]), float(b[index]),
+                               None if np.isnan(base[index]) else float(base[index]))
+                result[index] = value
+            except Exception:
+                errors[index] = True
+        return result, errors
+    return batch_kernel
+
+
+def register_operator(name, arity, kernel, batch_kernel=None):
+    """
+    연산자를 등록합니다.
+
+    kernel(num1, num2, base)는 값을 반환하거나 CalculationError(오류 코드)를 발생시키며,
+    batch_kernel(a, b, base)는 float64 배열을 받아 (결과, 오류 마스크)를 반환합니다.
+    batch_kernel을 생략하면 스칼라 커널을 원소별로 적용합니다.
+    """
+    if name in OPERATORS:
+        code = OPERATORS[name].code
+    else:
+        code = len(OPERATIONS)
+        OPERATIONS.append(name)
+        OPERATION_CODES[name] = code
+    operator = Operator(name, arity, kernel, batch_kernel or _vectorize_kernel(kernel), code)
+    OPERATORS[name] = operator
+    return operator
+
+
+# --- 스칼라 커널 ---
+
+def _divide(num1, num2, base):
+    if num2 == 0:
+        raise CalculationError(ERR_DIVISION_BY_ZERO)
+    return num1 / num2
+
+def _modulo(num1, num2, base):
+    if num2 == 0:
+        raise CalculationError(ERR_MODULO_BY_ZERO)
+    return num1 % num2
+
+def _log(num1, num2, base):
+    if num1 <= 0:
+        raise CalculationError(ERR_LOG_DOMAIN)
+    # base가 주어지지 않으면 자연로그(ln)
+    if base is None or base == 0:
+        return np.log(num1) # 자연로그 (ln)
+    elif base > 0 and base != 1:
+        return np.log(num1) / np.log(base) # 로그 밑변환 공식
+    raise CalculationError(ERR_LOG_BASE)
+
+def _sqrt(num1, num2, base):
+    if num1 < 0:
+        raise CalculationError(ERR_SQRT_DOMAIN)
+    return np.sqrt(num1)
+
+# NumPy 함수는 인수를 '라디안'으로 가정합니다.
+def _sin(num1, num2, base):
+    return np.sin(np.radians(num1)) # 각도를 라디안으로 변환
+
+def _cos(num1, num2, base):
+    return np.cos(np.radians(num1))
+
+def _tan(num1, num2, base):
+    # 90도와 그 홀수 배수 근처에서 오류를 처리할 수 있습니다.
+    if np.isclose(np.cos(np.radians(num1 % 180)), 0):
+        raise CalculationError(ERR_TAN_UNDEFINED)
+    return np.tan(np.radians(num1))
+
+def _python_number(value):
+    # NumPy 스칼라는 파이썬 수로 바꿉니다 (np.float64의 **는 범위를 넘어도 예외 없이 inf/nan을 반환).
+    if isinstance(value, np.generic):
+        value = value.item()
+    return float(value) if isinstance(value, int) else value
+
+def _power(num1, num2, base):
     try:
-        # 1. 사칙연산, Modulo, 지수 (Exponentiation)
-        if operation == '+':
-            return num1 + num2
-        elif operation == '-':
-            return num1 - num2
-        elif operation == '*':
-            return num1 * num2
-        elif operation == '/':
-            if num2 == 0:
-                return "Error: Division by zero"
-            return num1 / num2
-        elif operation == 'mod':
-            if num2 == 0:
-                return "Error: Modulo by zero"
-            return num1 % num2
-        elif operation == '**': # 지수
-            return num1 ** num2
-
-        # 2. 로그 연산 (num2는 무시)
-        elif operation == 'log':
-            if num1 <= 0:
-                return "Error: Log domain error (x <= 0)"
-            # base가 주어지지 않으면 자연로그(ln)
-            if base is None or base == 0:
-                return np.log(num1) # 자연로그 (ln)
-            elif base > 0 and base != 1:
-                return np.log(num1) / np.log(base) # 로그 밑변환 공식
-            else:
-                return "Error: Invalid log base"
-
-        # 3. 삼각함수 (num2는 무시)
-        # NumPy 함수는 인수를 '라디안'으로 가정합니다.
-        elif operation == 'sin':
-            return np.sin(np.radians(num1)) # 각도를 라디안으로 변환
-        elif operation == 'cos':
-            return np.cos(np.radians(num1))
-        elif operation == 'tan':
-            # 90도와 그 홀수 배수 근처에서 오류를 처리할 수 있습니다.
-            if np.isclose(np.cos(np.radians(num1 % 180)), 0):
-                 return "Error: Tangent undefined"
-            return np.tan(np.radians(num1))
-        
-        else:
-            return "Error: Invalid operation"
-            
+        a, b = _python_number(num1), _python_number(num2)
+        result = a ** b
+    except OverflowError:
+        raise CalculationError(ERR_OVERFLOW)
+    except ZeroDivisionError:
+        # 0의 음수 거듭제곱 (0 ** -1 = 1 / 0)
+        raise CalculationError(ERR_DIVISION_BY_ZERO)
+    # _batch_power와 같이 유한한 피연산자에서 나온 inf/nan은 오류로 처리합니다.
+    if not cmath.isfinite(result) and cmath.isfinite(a) and cmath.isfinite(b):
+        raise CalculationError(ERR_OVERFLOW)
+    return result
+
+
+# --- 배치 커널 (float64 배열 -> (결과, 오류 마스크)) ---
+
+def _no_errors(a):
+    return np.zeros(np.shape(a), dtype=bool)
+
+def _batch_power(a, b, base):
+    result = np.power(a, b)
+    # 스칼라 경로에서 OverflowError/ZeroDivisionError가 나는 경우와
+    # 음수의 분수 거듭제곱(실수 결과 없음)을 오류로 표시합니다.
+    return result, ~np.isfinite(result) & np.isfinite(a) & np.isfinite(b)
+
+def _batch_log(a, b, base):
+    ln = np.log(a)
+    natural = np.isnan(base) | (base == 0)
+    valid_base = (base > 0) & (base != 1)
+    result = np.where(natural, ln, ln / np.log(base))
+    return result, (a <= 0) | ~(natural | valid_base)
+
+def _batch_tan(a, b, base):
+    undefined = np.isclose(np.cos(np.radians(np.mod(a, 180))), 0)
+    return np.tan(np.radians(a)), undefined
+
+
+# 1. 사칙연산, Modulo, 지수 (Exponentiation)
+register_operator('+', 2, lambda num1, num2, base: num1 + num2,
+                  lambda a, b, base: (a + b, _no_errors(a)))
+register_operator('-', 2, lambda num1, num2, base: num1 - num2,
+                  lambda a, b, base: (a - b, _no_errors(a)))
+register_operator('*', 2, lambda num1, num2, base: num1 * num2,
+                  lambda a, b, base: (a * b, _no_errors(a)))
+register_operator('/', 2, _divide, lambda a, b, base: (np.divide(a, b), b == 0))
+register_operator('mod', 2, _modulo, lambda a, b, base: (np.mod(a, b), b == 0))
+register_operator('**', 2, _power, _batch_power) # 지수
+# 2. 로그 연산 (num2는 무시)
+register_operator('log', 1, _log, _batch_log)
+register_operator('sqrt', 1, _sqrt, lambda a, b, base: (np.sqrt(a), a < 0))
+# 3. 삼각함수 (num2는 무시)
+register_operator('sin', 1, _sin, lambda a, b, base: (np.sin(np.radians(a)), _no_errors(a)))
+register_operator('cos', 1, _cos, lambda a, b, base: (np.cos(np.radians(a)), _no_errors(a)))
+register_operator('tan', 1, _tan, _batch_tan)
+
+
+# --- 수치 백엔드 ---
+# 기본값인 'float'는 위의 float64/NumPy 커널을 그대로 사용합니다.
+# 'decimal'은 decimal.Decimal(정밀도 조절 가능), 'fraction'은 fractions.Fraction(정확한 유리수,
+# 분자/분모는 파이썬 큰 정수)로 계산합니다. 정확한 값이 존재하지 않는 초월함수(삼각함수 등)는
+# float 커널로 계산한 뒤 유효 숫자 15자리로 반올림하여 해당 백엔드의 수로 변환합니다.
+# 'complex'는 아래의 복소수 커널(cmath)을 사용합니다.
+
+DEFAULT_DECIMAL_PRECISION = 28
+# Fraction 거듭제곱 결과가 이 비트 수를 넘으면 계산하지 않고 ERR_OVERFLOW를 반환합니다.
+# (Decimal은 정밀도가 고정되어 있으므로 컨텍스트의 Emax를 넘을 때 나는 Overflow 신호를 그대로 씁니다.)
+MAX_EXACT_BITS = 1_000_000
+# 이 비트 수(약 4000자리)를 넘는 정수는 지수 표기로 표시합니다.
+MAX_DISPLAY_BITS = 13_000
+
+
+class NumericBackend:
+    """수치 백엔드: 피연산자 변환 함수와 연산자별 커널 (없는 연산자는 float 커널로 대체)."""
+
+    __slots__ = ('name', 'coerce', 'kernels')
+
+    def __init__(self, name, coerce, kernels):
+        self.name = name
+        self.coerce = coerce
+        self.kernels = kernels
+
+
+def _to_decimal(value):
+    # float는 최단 표현(repr)을 거쳐 변환하므로 0.1은 Decimal('0.1')이 됩니다.
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, Fraction):
+        return Decimal(value.numerator) / Decimal(value.denominator)
+    if isinstance(value, (float, np.floating)):
+        return Decimal(repr(float(value)))
+    return Decimal(value)
+
+
+def _to_fraction(value):
+    if isinstance(value, Fraction):
+        return value
+    if isinstance(value, (float, np.floating)):
+        return Fraction(repr(float(value)))
+    return Fraction(value)
+
+
+def _from_float(coerce, value):
+    # float 커널의 결과는 유효 숫자 15자리로 반올림하여 변환합니다 (sin(30) -> 0.5).
+    if isinstance(value, complex):
+        raise CalculationError(ERR_COMPLEX_RESULT)
+    return coerce(f"{float(value):.15g}")
+
+
+def _exact_mod(num1, num2, base):
+    if num2 == 0:
+        raise CalculationError(ERR_MODULO_BY_ZERO)
+    if isinstance(num1, Fraction):
+        return num1 % num2 # Fraction의 %는 float와 같은 정확한 floor 나머지입니다.
+    # Decimal의 %는 나머지를 정확히 구하지만 정수 몫의 자릿수가 정밀도를 넘으면 DivisionImpossible이므로,
+    # 몫의 자릿수만큼 정밀도를 늘려 계산합니다 (1e30 mod 7 = 1).
+    digits = max(num1.adjusted() - num2.adjusted() + 2, decimal.getcontext().prec)
+    with decimal.localcontext(prec=digits):
+        remainder = num1 % num2
+        # float의 %와 같이 결과의 부호는 나누는 수를 따릅니다 (Decimal의 %는 피제수를 따름).
+        if remainder and (remainder < 0) != (num2 < 0):
+            remainder += num2
+    return remainder
+
+
+def _check_power_size(num1, num2):
+    # 정수 지수의 정확한 거듭제곱 결과 크기를 미리 추정하여 과도한 계산을 막습니다.
+    bits = max(num1.numerator.bit_length(), num1.denominator.bit_length())
+    if abs(num2) * bits > MAX_EXACT_BITS:
+        raise CalculationError(ERR_OVERFLOW)
+
+
+def _fraction_power(num1, num2, base):
+    if num2.denominator == 1:
+        _check_power_size(num1, num2.numerator)
+        if num1 == 0 and num2 < 0:
+            raise ZeroDivisionError("0.0 cannot be raised to a negative power")
+        return num1 ** num2.numerator
+    # 분수 지수는 일반적으로 유리수가 아니므로 float로 계산합니다.
+    return _from_float(_to_fraction, float(num1) ** float(num2))
+
+
+def _decimal_power(num1, num2, base):
+    if num1 == 0:
+        if num2 < 0:
+            raise ZeroDivisionError("0.0 cannot be raised to a negative power")
+        if num2 == 0:
+            return Decimal(1) # float 백엔드와 같이 0 ** 0 = 1 (Decimal은 InvalidOperation)
+    if num1 < 0 and num2 != num2.to_integral_value():
+        raise CalculationError(ERR_COMPLEX_RESULT)
+    return num1 ** num2
+
+
+def _decimal_log(num1, num2, base):
+    if num1 <= 0:
+        raise CalculationError(ERR_LOG_DOMAIN)
+    if base is None or base == 0:
+        return num1.ln()
+    if base == 10:
+        return num1.log10() # 10의 거듭제곱이면 정확한 정수가 나옵니다.
+    if base > 0 and base != 1:
+        return num1.ln() / _to_decimal(base).ln()
+    raise CalculationError(ERR_LOG_BASE)
+
+
+def _decimal_sqrt(num1, num2, base):
+    if num1 < 0:
+        raise CalculationError(ERR_SQRT_DOMAIN)
+    return num1.sqrt()
+
+
+def _fraction_sqrt(num1, num2, base):
+    if num1 < 0:
+        raise CalculationError(ERR_SQRT_DOMAIN)
+    # 분자와 분모가 모두 완전제곱수이면 정확한 유리수 제곱근을 반환합니다.
+    numerator, denominator = math.isqrt(num1.numerator), math.isqrt(num1.denominator)
+    if numerator ** 2 == num1.numerator and denominator ** 2 == num1.denominator:
+        return Fraction(numerator, denominator)
+    return _from_float(_to_fraction, math.sqrt(num1))
+
+
+def _exact_divide(num1, num2, base):
+    if num2 == 0:
+        raise CalculationError(ERR_DIVISION_BY_ZERO)
+    return num1 / num2
+
+
+_EXACT_KERNELS = {
+    '+': lambda num1, num2, base: num1 + num2,
+    '-': lambda num1, num2, base: num1 - num2,
+    '*': lambda num1, num2, base: num1 * num2,
+    '/': _exact_divide,
+    'mod': _exact_mod,
+}
+
+# --- 복소수 백엔드 ---
+# 'complex'는 모든 연산을 복소수 영역에서 계산합니다. 음수의 로그, 음수의 제곱근, 음수의 분수
+# 거듭제곱은 오류 대신 주값(principal value)을 반환하고, 삼각함수는 복소수 인수(도 단위)도 받습니다.
+
+def _to_complex(value):
+    if isinstance(value, str):
+        return parse_complex(value)
+    return complex(value)
+
+
+def _complex_radians(z):
+    return z * (math.pi / 180)
+
+
+def _complex_mod(num1, num2, base):
+    # 나머지 연산은 복소수에서 정의되지 않으므로 실수 값에만 적용합니다.
+    if num1.imag or num2.imag:
+        raise CalculationError(ERR_COMPLEX_UNDEFINED)
+    return complex(_modulo(num1.real, num2.real, base))
+
+
+def _complex_log(num1, num2, base):
+    if num1 == 0:
+        raise CalculationError(ERR_LOG_DOMAIN)
+    if base is None or base == 0:
+        return cmath.log(num1)
+    if base == 1:
+        raise CalculationError(ERR_LOG_BASE)
+    if base == 10:
+        return cmath.log10(num1)
+    return cmath.log(num1) / cmath.log(base) # 음수 밑도 복소 로그로 계산합니다.
+
+
+def _complex_power(num1, num2, base):
+    try:
+        return num1 ** num2
+    except OverflowError:
+        raise CalculationError(ERR_OVERFLOW)
+    except ZeroDivisionError:
+        # 0의 음수/복소수 거듭제곱
+        raise CalculationError(ERR_DIVISION_BY_ZERO)
+
+
+def _complex_tan(num1, num2, base):
+    if num1.imag == 0 and np.isclose(np.cos(np.radians(num1.real % 180)), 0):
+        raise CalculationError(ERR_TAN_UNDEFINED)
+    return cmath.tan(_complex_radians(num1))
+
+
+_COMPLEX_KERNELS = {
+    '+': lambda num1, num2, base: num1 + num2,
+    '-': lambda num1, num2, base: num1 - num2,
+    '*': lambda num1, num2, base: num1 * num2,
+    '/': _exact_divide,
+    'mod': _complex_mod,
+    '**': _complex_power,
+    'log': _complex_log,
+    'sqrt': lambda num1, num2, base: cmath.sqrt(num1),
+    'sin': lambda num1, num2, base: cmath.sin(_complex_radians(num1)),
+    'cos': lambda num1, num2, base: cmath.cos(_complex_radians(num1)),
+    'tan': _complex_tan,
+}
+
+
+# complex128 배열용 배치 커널 (a, b는 complex128, base는 float64이며 NaN은 '밑 없음')
+
+def _complex_batch_mod(a, b, base):
+    errors = (a.imag != 0) | (b.imag != 0) | (b == 0)
+    return np.mod(a.real, b.real).astype(np.complex128), errors
+
+def _complex_batch_power(a, b, base):
+    result = np.power(a, b)
+    errors = ~np.isfinite(result) & np.isfinite(a) & np.isfinite(b)
+    # 스칼라 경로와 같이 0 ** 0은 1, 0의 음수/복소수 거듭제곱은 오류입니다.
+    zero = a == 0
+    result = np.where(zero & (b == 0), 1, result)
+    errors |= zero & ((b.real < 0) | (b.imag != 0))
+    return result, errors
+
+def _complex_batch_log(a, b, base):
+    ln = np.log(a)
+    natural = np.isnan(base) | (base == 0)
+    result = np.where(natural, ln, ln / np.log(base.astype(np.complex128)))
+    return result, (a == 0) | (~natural & (base == 1))
+
+def _complex_batch_tan(a, b, base):
+    undefined = (a.imag == 0) & np.isclose(np.cos(np.radians(np.mod(a.real, 180))), 0)
+    return np.tan(_complex_radians(a)), undefined
+
+
+_COMPLEX_BATCH_KERNELS = {
+    'mod': _complex_batch_mod,
+    '**': _complex_batch_power,
+    'log': _complex_batch_log,
+    'sqrt': lambda a, b, base: (np.sqrt(a), _no_errors(a)),
+    'sin': lambda a, b, base: (np.sin(_complex_radians(a)), _no_errors(a)),
+    'cos': lambda a, b, base: (np.cos(_complex_radians(a)), _no_errors(a)),
+    'tan': _complex_batch_tan,
+}
+
+
+BACKENDS = {
+    'float': None,
+    'decimal': NumericBackend('decimal', _to_decimal,
+                              {**_EXACT_KERNELS, '**': _decimal_power, 'log': _decimal_log,
+                               'sqrt': _decimal_sqrt}),
+    'fraction': NumericBackend('fraction', _to_fraction,
+                               {**_EXACT_KERNELS, '**': _fraction_power, 'sqrt': _fraction_sqrt}),
+    'complex': NumericBackend('complex', _to_complex, _COMPLEX_KERNELS),
+}
+
+
+def _evaluate_backend(backend, operator, num1, num2, base):
+    coerce = backend.coerce
+    kernel = backend.kernels.get(operator.name)
+    a = coerce(num1)
+    b = None if num2 is None else coerce(num2)
+    if kernel is not None:
+        return kernel(a, b, base)
+    # 백엔드 전용 커널이 없는 연산(삼각함수 등)은 float로 계산한 뒤 변환합니다.
+    return _from_float(coerce, operator.kernel(float(a), None if b is None else float(b), base))
+
+
+def evaluate(num1, num2, operation, base=None, precision=10, backend='float',
+             decimal_precision=DEFAULT_DECIMAL_PRECISION):
+    """
+    주어진 두 숫자와 연산자에 따라 계산을 수행하고 CalcResult를 반환합니다.
+    backend로 'float'(기본), 'decimal'(decimal_precision 자리), 'fraction', 'complex'를
+    선택할 수 있습니다.
+    """
+    operator = OPERATORS.get(operation)
+    if operator is None:
+        return CalcResult(error=ERR_INVALID_OPERATION, precision=precision)
+    if backend != 'float':
+        numeric = BACKENDS.get(backend)
+        if numeric is None:
+            raise ValueError(f"알 수 없는 수치 백엔드: {backend}")
+        try:
+            with decimal.localcontext(prec=decimal_precision):
+                value = _evaluate_backend(numeric, operator, num1, num2, base)
+            if backend == 'complex' and not cmath.isfinite(value):
+                # 실수부/허수부가 범위를 넘은 결과 (1e308 * 10 등)
+                raise CalculationError(ERR_OVERFLOW)
+            return CalcResult(value, precision=precision)
+        except CalculationError as e:
+            return CalcResult(error=e.code, precision=precision)
+        except decimal.Overflow:
+            return CalcResult(error=ERR_OVERFLOW, precision=precision)
+        except decimal.InvalidOperation:
+            return CalcResult(error=ERR_INVALID_INPUT, precision=precision)
+        except Exception as e:
+            return CalcResult(error=ERR_CALCULATION, precision=precision, detail=e)
+    try:
+        return CalcResult(operator.kernel(num1, num2, base), precision=precision)
+    except CalculationError as e:
+        return CalcResult(error=e.code, precision=precision)
     except Exception as e:
-        return f"Calculation Error: {e}"
+        return CalcResult(error=ERR_CALCULATION, precision=precision, detail=e)
+
+
+# 최근 계산 결과 메모 (LRU). 같은 피연산자/연산자/백엔드 조합은 다시 계산하지 않습니다.
+CALC_MEMO_SIZE = 1024
+
+
+@lru_cache(maxsize=CALC_MEMO_SIZE, typed=True)
+def _evaluate_memo(num1, num2, operation, base, precision, backend, decimal_precision):
+    return evaluate(num1, num2, operation, base, precision, backend, decimal_precision)
+
+
+def evaluate_memoized(num1, num2, operation, base=None, precision=10, backend='float',
+                      decimal_precision=DEFAULT_DECIMAL_PRECISION):
+    """
+    evaluate()의 메모이즈 버전입니다. 반환되는 CalcResult는 캐시와 공유되므로 수정하지 마세요.
+    해시할 수 없는 피연산자(배열 등)는 캐시를 거치지 않고 바로 계산합니다.
+    """
+    try:
+        return _evaluate_memo(num1, num2, operation, base, precision, backend, decimal_precision)
+    except TypeError:
+        return evaluate(num1, num2, operation, base, precision, backend, decimal_precision)
+
+
+def calculation_cache_info():
+    """계산 메모의 적중/미스 통계."""
+    return _evaluate_memo.cache_info()
+
+
+def calculate(num1, num2, operation, base=None, backend='float',
+              decimal_precision=DEFAULT_DECIMAL_PRECISION):
+    """
+    주어진 두 숫자와 연산자에 따라 계산을 수행합니다.
+    결과 숫자 또는 "Error: ..." 문자열을 반환합니다 (새 코드는 evaluate()를 사용하세요).
+    """
+    result = evaluate(num1, num2, operation, base, backend=backend, decimal_precision=decimal_precision)
+    return result.value if result.error is None else result.message
+
+
+# --- 배치(벡터화) 계산 ---
+# 배치 계산은 float64 배열('float')과 complex128 배열('complex')을 지원합니다.
+BATCH_BACKENDS = ('float', 'complex')
+
+
+def _batch_kernel(operation, a, b, base, backend='float'):
+    """단일 연산자를 배열 전체에 적용하고 (결과, 오류 마스크)를 반환합니다."""
+    operator = OPERATORS.get(operation)
+    if operator is None:
+        return np.full(np.shape(a), np.nan), np.ones(np.shape(a), dtype=bool)
+    if backend == 'complex':
+        # 사칙연산은 float 배치 커널이 complex128 배열에도 그대로 동작합니다.
+        return _COMPLEX_BATCH_KERNELS.get(operation, operator.batch_kernel)(a, b, base)
+    return operator.batch_kernel(a, b, base)
+
+
+def _as_float_array(values, shape=None, dtype=np.float64):
+    """None/스칼라/리스트/pandas 컬럼을 float64(또는 dtype) 배열로 변환합니다."""
+    if values is None:
+        values = np.nan
+    array = np.asarray(values, dtype=dtype)
+    if shape is not None:
+        array = np.broadcast_to(array, shape)
+    return array
+
+
+def _operation_codes(ops):
+    """연산자 문자열 배열을 연산 코드 배열로 바꿉니다 (알 수 없는 연산자는 -1, 코드 배열은 그대로)."""
+    if ops.dtype.kind not in 'OUS':
+        return ops
+    return np.array([OPERATION_CODES.get(op, -1) for op in ops.ravel()], dtype=np.int64).reshape(ops.shape)
+
+
+def calculate_batch(num1, num2, operation, base=None, backend='float'):
+    """
+    calculate()의 벡터화 버전입니다.
+
+    num1, num2, base에는 NumPy 배열 또는 pandas 컬럼(스칼라도 가능)을,
+    operation에는 연산자 문자열 하나 또는 연산자 문자열/연산 코드(OPERATION_CODES)
+    배열을 전달합니다. 단항 연산(log, sqrt, sin, cos, tan)에서는 num2가 무시됩니다.
+
+    반환값은 (결과 배열, 오류 마스크 배열) 튜플이며, 오류가 발생한 위치의
+    결과는 NaN입니다. 0으로 나누기, 로그 정의역, 탄젠트 미정의 규칙은
+    calculate()와 동일하게 적용됩니다. backend='complex'이면 num1, num2를
+    complex128 배열로 계산하며 결과도 complex128 배열입니다.
+    """
+    if backend not in BATCH_BACKENDS:
+        raise ValueError(f"배치 계산을 지원하지 않는 수치 백엔드: {backend}")
+    dtype = np.complex128 if backend == 'complex' else np.float64
+    a = _as_float_array(num1, dtype=dtype)
+    ops = np.asarray(operation)
+    shape = np.broadcast_shapes(a.shape, np.shape(num2) if num2 is not None else (),
+                                np.shape(base) if base is not None else (), ops.shape)
+    a = _as_float_array(a, shape, dtype)
+    b = _as_float_array(num2, shape, dtype)
+    base = _as_float_array(base, shape)
+
+    with np.errstate(all='ignore'):
+        if ops.ndim == 0:
+            op = ops.item()
+            if not isinstance(op, str):
+                op = OPERATIONS[op] if 0 <= op < len(OPERATIONS) else None
+            result, errors = _batch_kernel(op, a, b, base, backend)
+        else:
+            # 연산 코드 배열: 연산자별로 한 번씩만 유니버설 함수를 적용합니다.
+            codes = np.broadcast_to(_operation_codes(ops), shape)
+            result = np.full(shape, np.nan, dtype=dtype)
+            errors = np.ones(shape, dtype=bool)
+            for code in np.unique(codes):
+                if not 0 <= code < len(OPERATIONS):
+                    continue
+                mask = codes == code
+                value, error = _batch_kernel(OPERATIONS[code], a[mask], b[mask], base[mask], backend)
+                result[mask] = value
+                errors[mask] = error
+
+    result = np.where(errors, np.nan, result).astype(dtype, copy=False)
+    return result, errors
+
+
+# --- 배치 오류 코드 ---
+# 배치 커널은 오류 마스크만 반환하므로, 오류 행의 종류는 연산자별 조건 마스크(np.select)로 구합니다.
+# 값은 오류 코드 하나(오류 종류가 하나뿐인 연산자)이거나, 오류가 난 행의 (a, b, base)만 받아
+# evaluate()가 반환할 오류 코드 배열을 만드는 함수입니다. 표에 없는 연산자(사칙연산, 삼각함수 등)의 배치 커널은 오류를 표시하지 않습니다.
+
+def _select_codes(conditions, choices, default=ERR_CALCULATION):
+    return np.select(conditions, choices, default=default)
+
+def _power_error_codes(a, b, base):
+    # 유한한 피연산자에서 나온 inf/nan: 0의 음수 거듭제곱, 음수의 분수 거듭제곱(복소수), 범위 초과
+    return _select_codes([a == 0, (a < 0) & (np.floor(b) != b)], [ERR_DIVISION_BY_ZERO, ERR_COMPLEX_RESULT],
+                         ERR_OVERFLOW)
+
+
+_BATCH_ERROR_CODES = {
+    '/': lambda a, b, base: _select_codes([b == 0], [ERR_DIVISION_BY_ZERO]),
+    'mod': lambda a, b, base: _select_codes([b == 0], [ERR_MODULO_BY_ZERO]),
+    '**': _power_error_codes,
+    'log': lambda a, b, base: _select_codes([a <= 0], [ERR_LOG_DOMAIN], ERR_LOG_BASE),
+    'sqrt': ERR_SQRT_DOMAIN,
+    'tan': ERR_TAN_UNDEFINED,
+}
+
+_COMPLEX_BATCH_ERROR_CODES = {
+    '/': _BATCH_ERROR_CODES['/'],
+    'mod': lambda a, b, base: _select_codes([(a.imag != 0) | (b.imag != 0), b == 0],
+                                            [ERR_COMPLEX_UNDEFINED, ERR_MODULO_BY_ZERO]),
+    '**': lambda a, b, base: _select_codes([a == 0], [ERR_DIVISION_BY_ZERO], ERR_OVERFLOW),
+    'log': lambda a, b, base: _select_codes([a == 0], [ERR_LOG_DOMAIN], ERR_LOG_BASE),
+    'tan': ERR_TAN_UNDEFINED,
+}
+
+
+def batch_error_codes(num1, num2, operation, base, errors, backend='float'):
+    """
+    calculate_batch()의 오류 마스크(errors)를 evaluate()와 같은 오류 코드 배열로 바꿉니다.
+    반환값은 object 배열이며 오류가 없는 위치는 None입니다. 행마다 스칼라 경로로 다시 계산하지 않고
+    연산자별 조건 마스크로 한 번에 구합니다. float 모드에서 음수의 분수 거듭제곱은 evaluate()가
+    복소수 값을 반환하지만 배치 결과에는 담을 수 없으므로 ERR_COMPLEX_RESULT가 됩니다.
+    """
+    errors = np.asarray(errors, dtype=bool)
+    shape = errors.shape
+    dtype = np.complex128 if backend == 'complex' else np.float64
+    a = _as_float_array(num1, shape, dtype)
+    b = _as_float_array(num2, shape, dtype)
+    base = _as_float_array(base, shape)
+    ops = np.asarray(operation)
+    if ops.ndim == 0 and isinstance(ops.item(), str):
+        ops = np.asarray(OPERATION_CODES.get(ops.item(), -1))
+    codes = np.broadcast_to(_operation_codes(ops), shape)
+    table = _COMPLEX_BATCH_ERROR_CODES if backend == 'complex' else _BATCH_ERROR_CODES
+
+    result = np.full(shape, None, dtype=object)
+    for code in np.unique(codes[errors]):
+        mask = errors & (codes == code)
+        if not 0 <= code < len(OPERATIONS):
+            result[mask] = ERR_INVALID_OPERATION
+            continue
+        classify = table.get(OPERATIONS[code], ERR_CALCULATION)
+        result[mask] = classify if isinstance(classify, str) else classify(a[mask], b[mask], base[mask])
+    return result
@@ -0,0 +1,48 @@
+import os
+import uuid
+
+import streamlit as st
+# calculator_engine.py는 같은 디렉토리에 있다고 가정합니다.
+from calculator_engine import CalculatorEngine
+from calculation_history import CalculationHistory, SQLiteHistoryStore
+
+# 계산기 세션 상태
+# app.py의 단독 계산기와 계산기 페이지가 함께 쓰는 세션 상태 초기화입니다. app.py가 매 재실행
+# 임포트하므로 페이지 모듈(calculator_page)에 의존하지 않습니다 (sqlite3도 저장소를 만들 때만 임포트됩니다).
+
+# 이 환경 변수에 SQLite 파일 경로를 지정하면 계산 기록이 디스크에도 저장됩니다.
+HISTORY_DB_ENV = "CALC_HISTORY_DB"
+# 디스크 기록의 소유자 id를 담는 URL 쿼리 매개변수. 같은 URL로 다시 접속하면 자신의 기록만 다시 불러옵니다.
+HISTORY_ID_PARAM = "history"
+
+
+@st.cache_resource
+def _history_store(path):
+    """모든 세션이 공유하는 SQLite 기록 저장소 (연결 하나)."""
+    return SQLiteHistoryStore(path)
+
+
+def _history_id():
+    """이 브라우저 세션의 기록 소유자 id (URL 쿼리 매개변수에 없으면 새로 만들어 넣습니다)."""
+    history_id = st.query_params.get(HISTORY_ID_PARAM)
+    if not history_id:
+        history_id = uuid.uuid4().hex
+        st.query_params[HISTORY_ID_PARAM] = history_id
+    return history_id
+
+
+def _new_history():
+    db_path = os.environ.get(HISTORY_DB_ENV)
+    if not db_path:
+        return CalculationHistory()
+    # 저장소는 모든 세션이 공유하므로 이 세션 소유의 기록만 불러오고 저장합니다.
+    return CalculationHistory(store=_history_store(db_path), session=_history_id())
+
+
+def init_calculator_state():
+    """계산기 전용 세션 상태를 초기화합니다 (세션마다 계산기 엔진과 계산 기록 하나)."""
+    if 'calculator' not in st.session_state:
+        st.session_state.calculator = CalculatorEngine(history=_new_history())
+    elif st.session_state.calculator.history is None:
+        # 기록 없이 만들어진 엔진에도 계산 기록을 연결합니다.
+        st.session_state.calculator.history = _new_history()
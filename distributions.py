@@ -0,0 +1,223 @@
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+# 확률 시뮬레이터용 이산 분포 계층
+# 각 분포는 결과 레이블(labels), 정확한 이론 확률 질량 함수(pmf),
+# 그리고 결과 인덱스(0 ~ k-1)를 벡터화하여 뽑는 sample()을 제공합니다.
+# simulation_engine은 sample() 결과에 np.bincount를 적용해 횟수를 집계합니다.
+
+# 포아송처럼 지지집합이 무한한 분포는 꼬리 확률이 이 값보다 작아지는 지점에서
+# 마지막 결과를 "k 이상" 구간으로 묶습니다.
+TAIL_PROBABILITY = 1e-6
+
+# 결과별 빈도의 신뢰구간 계산 방법
+#   wilson       결과마다 따로 구한 Wilson 점수 구간 (각 구간이 신뢰수준을 만족)
+#   multinomial  Goodman 동시 신뢰구간 (모든 결과의 구간이 함께 신뢰수준을 만족, 본페로니 보정)
+INTERVAL_METHODS = ('wilson', 'multinomial')
+
+# 매개변수 상한 (Streamlit 페이지 입력 위젯과 API가 함께 사용). 결과 수와 pmf 계산량이 이 값들에 비례합니다.
+MAX_DICE_SIDES = 1000
+MAX_NUM_DICE = 100
+MAX_CATEGORIES = 1000
+MAX_BINOMIAL_N = 10_000
+MAX_POISSON_LAM = 1000.0
+
+
+class Distribution:
+    """이산 분포의 기본 클래스."""
+
+    name = "분포"
+
+    @property
+    def labels(self):
+        """결과 레이블 목록 (결과 인덱스 순서)."""
+        raise NotImplementedError
+
+    def pmf(self):
+        """결과 인덱스별 정확한 이론 확률 (합계 1)."""
+        raise NotImplementedError
+
+    def sample(self, rng, size):
+        """결과 인덱스(0 ~ k-1) 배열을 size개 뽑습니다."""
+        raise NotImplementedError
+
+    @property
+    def num_outcomes(self):
+        return len(self.labels)
+
+    def __repr__(self):
+        params = ", ".join(f"{k}={v!r}" for k, v in vars(self).items() if not k.startswith('_'))
+        return f"{type(self).__name__}({params})"
+
+
+class Dice(Distribution):
+    """k면체 주사위 N개를 던진 눈의 합 (N=1이면 일반 주사위)."""
+
+    name = "주사위"
+
+    def __init__(self, sides=6, num_dice=1):
+        if sides < 2 or num_dice < 1:
+            raise ValueError("주사위는 2면 이상, 1개 이상이어야 합니다.")
+        self.sides = int(sides)
+        self.num_dice = int(num_dice)
+
+    @property
+    def labels(self):
+        return [str(total) for total in range(self.num_dice, self.num_dice * self.sides + 1)]
+
+    def pmf(self):
+        # 주사위 한 개의 균등 분포를 N번 합성곱하여 합의 분포를 구합니다.
+        single = np.full(self.sides, 1 / self.sides)
+        pmf = single
+        for _ in range(self.num_dice - 1):
+            pmf = np.convolve(pmf, single)
+        return pmf
+
+    def sample(self, rng, size):
+        if self.num_dice == 1:
+            return rng.integers(0, self.sides, size=size, dtype=np.int32)
+        # 합 - N이 결과 인덱스입니다. 주사위마다 한 번씩 누적하여 (N, size) 배열을 만들지 않습니다.
+        totals = np.zeros(size, dtype=np.int32)
+        for _ in range(self.num_dice):
+            totals += rng.integers(0, self.sides, size=size, dtype=np.int32)
+        return totals
+
+
+class Categorical(Distribution):
+    """사용자가 지정한 레이블과 가중치의 범주형 분포."""
+
+    name = "범주형"
+
+    def __init__(self, labels, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(labels) != len(weights) or len(labels) == 0:
+            raise ValueError("레이블과 가중치의 개수가 같아야 합니다.")
+        if (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("가중치는 0 이상이고 합이 0보다 커야 합니다.")
+        self._labels = [str(label) for label in labels]
+        self.weights = weights / weights.sum()
+
+    @property
+    def labels(self):
+        return self._labels
+
+    def pmf(self):
+        return self.weights
+
+    def sample(self, rng, size):
+        # 누적분포에 대한 이진 탐색으로 인덱스를 뽑습니다 (역변환 샘플링).
+        cdf = np.cumsum(self.weights)
+        cdf[-1] = 1.0
+        return np.searchsorted(cdf, rng.random(size), side='right').astype(np.int32)
+
+
+class Coin(Categorical):
+    """앞면 확률이 p인 (가중) 동전."""
+
+    name = "동전"
+
+    def __init__(self, p_heads=0.5):
+        if not 0 <= p_heads <= 1:
+            raise ValueError("앞면 확률은 0과 1 사이여야 합니다.")
+        super().__init__(["앞면 (Head)", "뒷면 (Tail)"], [p_heads, 1 - p_heads])
+        self.p_heads = p_heads
+
+
+class Binomial(Distribution):
+    """시행 n번, 성공 확률 p인 이항 분포 (성공 횟수)."""
+
+    name = "이항"
+
+    def __init__(self, n, p):
+        if n < 1 or not 0 <= p <= 1:
+            raise ValueError("이항 분포는 n >= 1, 0 <= p <= 1 이어야 합니다.")
+        self.n = int(n)
+        self.p = float(p)
+
+    @property
+    def labels(self):
+        return [str(k) for k in range(self.n + 1)]
+
+    def pmf(self):
+        k = np.arange(self.n + 1)
+        if self.p in (0.0, 1.0):
+            return (k == (self.n if self.p == 1.0 else 0)).astype(np.float64)
+        # 큰 n에서도 넘치지 않도록 로그 공간에서 계산합니다.
+        log_comb = np.array([math.lgamma(self.n + 1) - math.lgamma(i + 1) - math.lgamma(self.n - i + 1)
+                             for i in k])
+        return np.exp(log_comb + k * math.log(self.p) + (self.n - k) * math.log1p(-self.p))
+
+    def sample(self, rng, size):
+        return rng.binomial(self.n, self.p, size=size).astype(np.int32)
+
+
+class Poisson(Distribution):
+    """평균 lam인 포아송 분포. 꼬리는 마지막 "k 이상" 구간으로 묶습니다."""
+
+    name = "포아송"
+
+    def __init__(self, lam):
+        if lam <= 0:
+            raise ValueError("포아송 분포의 평균은 0보다 커야 합니다.")
+        self.lam = float(lam)
+        # 꼬리 확률이 TAIL_PROBABILITY보다 작아지는 최소 k를 마지막 구간으로 사용합니다.
+        k = np.arange(int(self.lam + 10 * math.sqrt(self.lam) + 10) + 1)
+        log_pmf = k * math.log(self.lam) - self.lam - np.array([math.lgamma(i + 1) for i in k])
+        tail = 1 - np.cumsum(np.exp(log_pmf))
+        small = tail < TAIL_PROBABILITY
+        self._max_k = int(np.argmax(small)) if small.any() else int(k[-1])
+
+    @property
+    def labels(self):
+        return [str(k) for k in range(self._max_k)] + [f"{self._max_k}+"]
+
+    def pmf(self):
+        k = np.arange(self._max_k)
+        pmf = np.exp(k * math.log(self.lam) - self.lam - np.array([math.lgamma(i + 1) for i in k]))
+        return np.append(pmf, max(0.0, 1 - pmf.sum()))
+
+    def sample(self, rng, size):
+        return np.minimum(rng.poisson(self.lam, size=size), self._max_k).astype(np.int32)
+
+
+def chi_square(counts, pmf):
+    """
+    관측 횟수와 이론 확률로 카이제곱 적합도 통계량과 자유도를 계산합니다.
+    기대 횟수가 0인 구간은 제외합니다.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    expected = np.asarray(pmf, dtype=np.float64) * counts.sum()
+    mask = expected > 0
+    statistic = float(np.sum((counts[mask] - expected[mask]) ** 2 / expected[mask]))
+    return statistic, int(mask.sum()) - 1
+
+
+def interval_z(confidence=0.95, num_outcomes=1, method='wilson'):
+    """신뢰수준과 방법에 해당하는 표준정규 분위수 z (다항 동시 구간은 결과 수로 보정)."""
+    if method not in INTERVAL_METHODS:
+        raise ValueError(f"알 수 없는 신뢰구간 방법: {method}")
+    if not 0 < confidence < 1:
+        raise ValueError("신뢰수준은 0과 1 사이여야 합니다.")
+    alpha = 1 - confidence
+    if method == 'multinomial' and num_outcomes > 2:
+        alpha /= num_outcomes
+    return NormalDist().inv_cdf(1 - alpha / 2)
+
+
+def confidence_intervals(counts, z):
+    """
+    결과별 횟수 벡터로 각 결과 확률의 Wilson 점수 신뢰구간 (하한, 상한) 배열을 계산합니다.
+    z에 interval_z(..., method='multinomial')을 넘기면 Goodman 동시 신뢰구간이 됩니다.
+    횟수 벡터만으로 계산하므로(결과 수 k에 대해 O(k)) 청크마다 다시 계산해도 비용이 작습니다.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    if total == 0:
+        return np.zeros_like(counts), np.ones_like(counts)
+    p = counts / total
+    z2 = z * z
+    center = (p + z2 / (2 * total)) / (1 + z2 / total)
+    half = z * np.sqrt(p * (1 - p) / total + z2 / (4 * total * total)) / (1 + z2 / total)
+    return np.clip(center - half, 0.0, 1.0), np.clip(center + half, 0.0, 1.0)
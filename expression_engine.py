@@ -0,0 +1,306 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+
+from calculator_logic import CalcResult, _batch_kernel, batch_error_codes
+
+# 수식 엔진: "sin(30)*2 + log(100, 10) mod 7" 같은 수식 문자열을 AST로 파싱하고,
+# AST를 한 번만 클로저로 컴파일한 뒤 정규화된 수식 텍스트를 키로 LRU 캐시에 보관합니다.
+# 컴파일된 수식은 calculate_batch()와 같은 (결과, 오류 마스크) 규약을 따르므로
+# 변수에 스칼라 대신 NumPy 배열을 바인딩하면 그대로 벡터화 평가됩니다.
+
+EXPRESSION_CACHE_SIZE = 256
+
+# 수식에서 사용할 수 있는 함수 (이름: 허용 인수 개수)
+FUNCTIONS = {'sin': (1,), 'cos': (1,), 'tan': (1,), 'log': (1, 2), 'sqrt': (1,)}
+CONSTANTS = {'pi': np.pi, 'e': np.e}
+
+_TOKEN_RE = re.compile(r"\s*(?:((?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(\*\*|[-+*/^(),])|([A-Za-z_]\w*))")
+
+
+class ExpressionError(ValueError):
+    """수식의 구문 오류 또는 잘못된 변수 바인딩."""
+
+
+def tokenize(text):
+    """수식 문자열을 토큰 목록으로 분리합니다."""
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise ExpressionError(f"알 수 없는 문자: {text[pos:].strip()[0]!r}")
+        number, op, name = match.groups()
+        if number is not None:
+            tokens.append(number)
+        elif op is not None:
+            tokens.append('**' if op == '^' else op)
+        else:
+            tokens.append(name.lower())
+        pos = match.end()
+    return tokens
+
+
+def normalize(text):
+    """캐시 키로 사용할 정규화된 수식 텍스트를 반환합니다 (공백/대소문자/^ 차이 제거)."""
+    return " ".join(tokenize(text))
+
+
+# --- 파서 (재귀 하강, 우선순위: 거듭제곱 > 단항 부호 > 곱셈/나눗셈/mod > 덧셈/뺄셈) ---
+# AST 노드는 튜플입니다: ('num', 값), ('var', 이름), ('neg', 노드),
+# ('binop', 연산자, 왼쪽, 오른쪽), ('call', 함수명, (인수, ...))
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, expected=None):
+        token = self.peek()
+        if token is None or (expected is not None and token != expected):
+            raise ExpressionError(f"'{expected or '피연산자'}'가 필요하지만 {token!r}을(를) 만났습니다.")
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ExpressionError("수식이 비어 있습니다.")
+        node = self.expr()
+        if self.peek() is not None:
+            raise ExpressionError(f"예상하지 못한 토큰: {self.peek()!r}")
+        return node
+
+    def expr(self):
+        node = self.term()
+        while self.peek() in ('+', '-'):
+            op = self.take()
+            node = ('binop', op, node, self.term())
+        return node
+
+    def term(self):
+        node = self.unary()
+        while self.peek() in ('*', '/', 'mod'):
+            op = self.take()
+            node = ('binop', op, node, self.unary())
+        return node
+
+    def unary(self):
+        if self.peek() in ('+', '-'):
+            op = self.take()
+            operand = self.unary()
+            return ('neg', operand) if op == '-' else operand
+        return self.power()
+
+    def power(self):
+        node = self.atom()
+        if self.peek() == '**':
+            self.take()
+            node = ('binop', '**', node, self.unary())  # 오른쪽 결합
+        return node
+
+    def atom(self):
+        token = self.take()
+        if token == '(':
+            node = self.expr()
+            self.take(')')
+            return node
+        if token[0].isdigit() or token[0] == '.':
+            return ('num', float(token))
+        if token[0].isalpha() or token[0] == '_':
+            if self.peek() == '(':
+                return self.call(token)
+            if token in FUNCTIONS or token == 'mod':
+                raise ExpressionError(f"'{token}' 뒤에는 괄호가 필요합니다.")
+            if token in CONSTANTS:
+                return ('num', CONSTANTS[token])
+            return ('var', token)
+        raise ExpressionError(f"예상하지 못한 토큰: {token!r}")
+
+    def call(self, name):
+        if name not in FUNCTIONS:
+            raise ExpressionError(f"지원하지 않는 함수: {name}")
+        self.take('(')
+        args = [self.expr()]
+        while self.peek() == ',':
+            self.take()
+            args.append(self.expr())
+        self.take(')')
+        if len(args) not in FUNCTIONS[name]:
+            raise ExpressionError(f"{name}() 함수의 인수 개수가 올바르지 않습니다: {len(args)}")
+        return ('call', name, tuple(args))
+
+
+def parse(text):
+    """수식 문자열을 AST 튜플로 파싱합니다."""
+    return _Parser(tokenize(text)).parse()
+
+
+# --- 컴파일러: AST -> env를 받아 (값, 오류 마스크)를 반환하는 클로저 ---
+
+_NO_ERROR = np.False_
+_NAN = np.float64(np.nan)
+
+
+def _compile_node(node):
+    kind = node[0]
+    if kind == 'num':
+        value = np.float64(node[1])
+        return lambda env: (value, _NO_ERROR)
+    if kind == 'var':
+        name = node[1]
+
+        def load(env):
+            try:
+                return env[name], _NO_ERROR
+            except KeyError:
+                raise ExpressionError(f"변수 '{name}'의 값이 주어지지 않았습니다.") from None
+        return load
+    if kind == 'neg':
+        operand = _compile_node(node[1])
+
+        def negate(env):
+            value, errors = operand(env)
+            return -value, errors
+        return negate
+    if kind == 'binop':
+        op, left, right = node[1], _compile_node(node[2]), _compile_node(node[3])
+
+        def binop(env):
+            a, a_err = left(env)
+            b, b_err = right(env)
+            value, errors = _batch_kernel(op, a, b, _NAN)
+            return value, errors | a_err | b_err
+        return binop
+    if kind == 'call':
+        name, args = node[1], tuple(_compile_node(arg) for arg in node[2])
+        if name == 'log':
+            # 계산기의 log 버튼과 같이 밑을 생략하면 상용로그(밑 10)를 사용합니다.
+            base_fn = args[1] if len(args) == 2 else (lambda env: (np.float64(10), _NO_ERROR))
+
+            def log(env):
+                a, a_err = args[0](env)
+                base, base_err = base_fn(env)
+                value, errors = _batch_kernel('log', a, base, base)
+                return value, errors | a_err | base_err
+            return log
+        arg = args[0]
+
+        def call(env):
+            a, a_err = arg(env)
+            value, errors = _batch_kernel(name, a, _NAN, _NAN)
+            return value, errors | a_err
+        return call
+    raise ExpressionError(f"알 수 없는 AST 노드: {kind}")
+
+
+def _explain(node, env):
+    """
+    _compile_node와 같은 계산을 AST를 따라 직접 수행하며 (값, 오류 마스크, 오류 코드 배열)을 반환합니다.
+    오류가 난 위치에는 가장 안쪽(먼저 계산되는) 연산의 오류 코드가 남습니다. 오류가 있을 때만 쓰는 느린 경로입니다.
+    """
+    kind = node[0]
+    if kind in ('num', 'var'):
+        value = np.float64(node[1]) if kind == 'num' else env[node[1]]
+        return value, _NO_ERROR, np.array(None, dtype=object)
+    if kind == 'neg':
+        value, errors, codes = _explain(node[1], env)
+        return -value, errors, codes
+    op, args = (node[1], node[2:]) if kind == 'binop' else (node[1], node[2])
+    if op == 'log' and len(args) == 1:
+        args = (args[0], ('num', 10.0))
+    children = [_explain(arg, env) for arg in args]
+    a = children[0][0]
+    b = children[1][0] if len(children) == 2 else _NAN
+    base = b if op == 'log' else _NAN
+    value, errors = _batch_kernel(op, a, b, base)
+    errors = np.broadcast_to(errors, np.shape(value))
+    codes = batch_error_codes(a, b, op, base, errors)
+    for _, child_errors, child_codes in reversed(children):
+        codes = np.where(child_errors, child_codes, codes)
+        errors = errors | child_errors
+    return value, errors, codes
+
+
+def _variables(node, found=None):
+    found = set() if found is None else found
+    if node[0] == 'var':
+        found.add(node[1])
+    elif node[0] == 'neg':
+        _variables(node[1], found)
+    elif node[0] == 'binop':
+        _variables(node[2], found)
+        _variables(node[3], found)
+    elif node[0] == 'call':
+        for arg in node[2]:
+            _variables(arg, found)
+    return found
+
+
+class CompiledExpression:
+    """컴파일된 수식. 변수 값을 키워드 인수로 받아 (결과, 오류 마스크)를 반환합니다."""
+
+    __slots__ = ('text', 'ast', 'variables', '_fn')
+
+    def __init__(self, text, ast):
+        self.text = text
+        self.ast = ast
+        self.variables = frozenset(_variables(ast))
+        self._fn = _compile_node(ast)
+
+    def __call__(self, **variables):
+        env = {name: np.asarray(value, dtype=np.float64) for name, value in variables.items()}
+        with np.errstate(all='ignore'):
+            value, errors = self._fn(env)
+        value = np.asarray(value, dtype=np.float64)
+        errors = np.asarray(errors, dtype=bool)
+        if value.shape != errors.shape:
+            errors = np.broadcast_to(errors, value.shape)
+        return np.where(errors, np.nan, value), errors
+
+    def error_codes(self, **variables):
+        """
+        __call__과 같은 인수로 평가하여, 오류 위치에는 calculator_logic의 오류 코드(ERR_*)를,
+        나머지 위치에는 None을 담은 배열을 반환합니다.
+        """
+        env = {name: np.asarray(value, dtype=np.float64) for name, value in variables.items()}
+        with np.errstate(all='ignore'):
+            value, errors, codes = _explain(self.ast, env)
+        shape = np.shape(value)
+        return np.where(np.broadcast_to(errors, shape), np.broadcast_to(codes, shape), None)
+
+    def __repr__(self):
+        return f"CompiledExpression({self.text!r})"
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def _compile_normalized(normalized_text):
+    return CompiledExpression(normalized_text, _Parser(normalized_text.split()).parse())
+
+
+def compile_expression(text):
+    """수식을 컴파일합니다. 같은 정규화 텍스트의 수식은 캐시에서 재사용됩니다."""
+    return _compile_normalized(normalize(text))
+
+
+def evaluate_expression(text, **variables):
+    """
+    수식을 스칼라 값으로 평가합니다. calculate()와 마찬가지로 숫자 또는
+    오류 문자열("Error: Division by zero" 등, 배열이면 첫 번째 오류 위치의 메시지)을 반환하며,
+    구문 오류는 ExpressionError(ValueError)로 발생합니다.
+    """
+    compiled = compile_expression(text)
+    value, errors = compiled(**variables)
+    if errors.any():
+        code = compiled.error_codes(**variables)[errors][0]
+        return CalcResult(error=code, detail="Invalid expression result").message
+    return value.item() if value.ndim == 0 else value
+
+
+def expression_cache_info():
+    """컴파일 캐시의 적중/미스 통계를 반환합니다."""
+    return _compile_normalized.cache_info()
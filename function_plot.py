@@ -0,0 +1,210 @@
+import numpy as np
+
+from calculator_logic import OPERATORS
+from expression_engine import ExpressionError, compile_expression
+
+# 함수 그래프 계층
+# 계산기 연산자 또는 수식(expression_engine)을 x 범위 전체에 대해 한 번의 벡터화 평가로 계산합니다.
+# 오류가 난 점(tan 미정의, 로그 정의역 등)은 예외 대신 NaN으로 가려 그래프의 끊김으로 표시합니다.
+#
+#   1. 균등 격자 평가        x = linspace(x_min, x_max, num_points)
+#   2. 적응형 세분화          정의역 경계(유효/오류가 바뀌는 구간)와 값이 크게 뛰는 구간만 더 촘촘히 다시 평가
+#   3. 불연속점 끊기          세분화한 뒤에도 크게 뛰는 구간을 이분해 보고, 점프가 줄지 않으면(점근선, mod의 계단 등)
+#                             NaN을 넣어 선을 끊음
+#   4. 표시용 축소(decimate)  x 구간마다 최소/최대(와 끊김) 점만 남겨 브라우저로 보내는 점 수를 제한
+#
+# 삼각함수는 계산기와 같이 도(degree) 단위입니다.
+
+VARIABLE = 'x'
+REFINE_FACTOR = 8          # 세분화할 구간 하나를 나누는 수
+MAX_REFINE_DEPTH = 4       # 세분화 반복 횟수 (최대 REFINE_FACTOR ** MAX_REFINE_DEPTH배 촘촘해짐)
+JUMP_FRACTION = 0.05       # 이웃한 두 점의 차이가 값 범위의 이 비율을 넘으면 세분화
+BISECT_STEPS = 8           # 불연속 판정에 사용하는 이분 횟수
+DISPLAY_POINTS = 4000      # 표시용 축소 후 x 구간(bucket) 수
+
+
+def operator_expression(operation, operand=None):
+    """
+    계산기 연산자를 x에 대한 수식 문자열로 바꿉니다.
+    단항 연산은 "tan(x)", 이항 연산은 "x ** (2)"처럼 operand를 두 번째 피연산자로 사용하고,
+    log의 operand는 밑입니다 (생략하면 계산기와 같이 밑 10).
+    """
+    if operation not in OPERATORS:
+        raise ExpressionError(f"지원하지 않는 연산자: {operation}")
+    if operation == 'log':
+        return f"log({VARIABLE})" if operand is None else f"log({VARIABLE}, {operand!r})"
+    if OPERATORS[operation].arity == 1:
+        return f"{operation}({VARIABLE})"
+    if operand is None:
+        raise ExpressionError(f"'{operation}' 연산에는 두 번째 피연산자가 필요합니다.")
+    return f"{VARIABLE} {operation} ({operand!r})"
+
+
+def compile_function(text):
+    """x 하나만 변수로 사용하는 수식을 컴파일합니다 (다른 변수가 있으면 ExpressionError)."""
+    compiled = compile_expression(text)
+    unknown = compiled.variables - {VARIABLE}
+    if unknown:
+        raise ExpressionError(f"변수는 {VARIABLE}만 사용할 수 있습니다: {', '.join(sorted(unknown))}")
+    return compiled
+
+
+class FunctionSamples:
+    """
+    적응형 샘플링 결과. x는 오름차순이며 y의 NaN은 오류 점 또는 불연속 끊김입니다.
+    """
+
+    __slots__ = ('text', 'x', 'y', 'base_points', 'refined_points', 'error_points', 'breaks')
+
+    def __init__(self, text, x, y, base_points, refined_points, error_points, breaks):
+        self.text = text
+        self.x = x
+        self.y = y
+        self.base_points = base_points
+        self.refined_points = refined_points  # 세분화로 추가된 점 수
+        self.error_points = error_points      # 오류(NaN)로 가려진 평가 점 수
+        self.breaks = breaks                  # 불연속으로 끊은 위치 수
+
+    def __len__(self):
+        return len(self.x)
+
+
+def _jump_scale(y):
+    # 점근선 근처의 극단값에 휘둘리지 않도록 5~95 백분위 범위를 값 범위로 사용합니다.
+    finite = y[np.isfinite(y)]
+    if not len(finite):
+        return 1.0
+    low, high = np.percentile(finite, [5, 95])
+    return (high - low) or max(abs(high), 1.0)
+
+
+def _flag_intervals(y, threshold):
+    """세분화할 구간(i, i+1)의 시작 인덱스와 구간별 점프 크기."""
+    invalid = np.isnan(y)
+    with np.errstate(invalid='ignore'):
+        jump = np.abs(np.diff(y))
+    edge = invalid[1:] != invalid[:-1]
+    flagged = np.flatnonzero(edge | (jump > threshold))
+    return flagged, np.where(edge, np.inf, jump)[flagged]
+
+
+def _discontinuous(evaluate, x0, x1, y0, y1):
+    """
+    구간 [x0, x1]마다 불연속 여부를 판정합니다. 연속 함수라면 이분할 때마다 점프가 대략 절반으로 줄지만,
+    점근선이나 계단에서는 점프가 큰 쪽 절반에 그대로 남거나 중점 값이 양 끝 범위를 벗어납니다.
+    """
+    jump = np.abs(y1 - y0)
+    broken = np.zeros(len(x0), dtype=bool)
+    for _ in range(BISECT_STEPS):
+        if not len(x0):
+            break
+        xm = (x0 + x1) / 2
+        ym = evaluate(xm)
+        with np.errstate(invalid='ignore'):
+            broken |= ~((np.minimum(y0, y1) <= ym) & (ym <= np.maximum(y0, y1)))
+            left = np.abs(ym - y0) >= np.abs(y1 - ym)
+        x1, y1 = np.where(left, xm, x1), np.where(left, ym, y1)
+        x0, y0 = np.where(left, x0, xm), np.where(left, y0, ym)
+    with np.errstate(invalid='ignore'):
+        return broken | (np.abs(y1 - y0) > jump / 2)
+
+
+def sample_function(text, x_min, x_max, num_points, refine_budget=None):
+    """
+    수식 text를 [x_min, x_max]에서 num_points개의 균등 격자로 평가한 뒤 적응형으로 세분화합니다.
+    refine_budget은 세분화로 추가할 최대 점 수입니다 (기본: num_points).
+    """
+    if not x_min < x_max:
+        raise ValueError("x 최솟값은 최댓값보다 작아야 합니다.")
+    if num_points < 2:
+        raise ValueError("샘플 수는 2 이상이어야 합니다.")
+    compiled = compile_function(text)
+
+    def evaluate(x):
+        return compiled(**{VARIABLE: x})[0]
+
+    x = np.linspace(x_min, x_max, int(num_points))
+    y = evaluate(x)
+    threshold = JUMP_FRACTION * _jump_scale(y)
+    budget = int(num_points if refine_budget is None else refine_budget)
+    added = 0
+    steps = np.arange(1, REFINE_FACTOR) / REFINE_FACTOR
+
+    for _ in range(MAX_REFINE_DEPTH):
+        flagged, jump = _flag_intervals(y, threshold)
+        limit = (budget - added) // len(steps)
+        if not len(flagged) or limit <= 0:
+            break
+        if len(flagged) > limit:
+            # 예산을 넘으면 점프가 큰 구간(정의역 경계 포함)부터 세분화합니다.
+            flagged = np.sort(flagged[np.argsort(jump)[-limit:]])
+        left = x[flagged]
+        new_x = (left[:, None] + (x[flagged + 1] - left)[:, None] * steps).ravel()
+        positions = np.repeat(flagged + 1, len(steps))
+        x = np.insert(x, positions, new_x)
+        y = np.insert(y, positions, evaluate(new_x))
+        added += len(new_x)
+
+    error_points = int(np.count_nonzero(np.isnan(y)))
+    # 세분화한 뒤에도 크게 뛰는 구간 중 불연속인 곳에 NaN을 넣어 선을 끊습니다.
+    flagged, jump = _flag_intervals(y, threshold)
+    flagged = flagged[np.isfinite(jump)]
+    breaks = flagged[_discontinuous(evaluate, x[flagged], x[flagged + 1], y[flagged], y[flagged + 1])]
+    if len(breaks):
+        x = np.insert(x, breaks + 1, (x[breaks] + x[breaks + 1]) / 2)
+        y = np.insert(y, breaks + 1, np.nan)
+    return FunctionSamples(compiled.text, x, y, int(num_points), added, error_points, len(breaks))
+
+
+def _first_per_bucket(indices, bucket):
+    if not len(indices):
+        return indices
+    b = bucket[indices]
+    return indices[np.r_[True, b[1:] != b[:-1]]]
+
+
+def decimate(x, y, max_buckets=DISPLAY_POINTS):
+    """
+    표시용으로 점 수를 줄입니다. x 범위를 max_buckets개의 같은 폭 구간으로 나누고, 구간마다
+    최솟값/최댓값 점과 첫 NaN(끊김)만 남기므로 곡선의 윤곽과 끊긴 위치가 보존됩니다.
+    반환 점 수는 최대 3 * max_buckets + 2개입니다.
+    """
+    if len(x) <= 3 * max_buckets + 2:
+        return x, y
+    span = x[-1] - x[0]
+    bucket = np.minimum(((x - x[0]) / span * max_buckets).astype(np.int64), max_buckets - 1)
+    invalid = np.isnan(y)
+    # x가 정렬되어 있으므로 구간이 연속 블록입니다. 블록별 최솟값/최댓값을 reduceat으로 구한 뒤
+    # 그 값과 같은 첫 점을 고릅니다.
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    counts = np.diff(np.r_[starts, len(x)])
+    low_values = np.where(invalid, np.inf, y)
+    high_values = np.where(invalid, -np.inf, y)
+    low = np.flatnonzero(low_values == np.repeat(np.minimum.reduceat(low_values, starts), counts))
+    high = np.flatnonzero(high_values == np.repeat(np.maximum.reduceat(high_values, starts), counts))
+    keep = np.concatenate([
+        _first_per_bucket(low, bucket),
+        _first_per_bucket(high, bucket),
+        _first_per_bucket(np.flatnonzero(invalid), bucket),
+        [0, len(x) - 1],
+    ])
+    keep = np.unique(keep)
+    return x[keep], y[keep]
+
+
+def build_function_figure(x, y, title):
+    """축소된 (x, y)로 Plotly 선 그래프를 만듭니다. NaN 위치에서는 선이 끊깁니다."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Scatter(x=x, y=y, mode='lines', connectgaps=False, name=title,
+                               hovertemplate="x=%{x:.6g}<br>y=%{y:.6g}<extra></extra>"))
+    finite = y[np.isfinite(y)]
+    if len(finite):
+        # 점근선 근처의 극단값 때문에 곡선이 납작해지지 않도록 y축을 1~99 백분위로 맞춥니다.
+        low, high = np.percentile(finite, [1, 99])
+        pad = (high - low) * 0.1 or 1.0
+        fig.update_yaxes(range=[low - pad, high + pad])
+    fig.update_layout(title=f"y = {title}", xaxis_title=VARIABLE, yaxis_title="y",
+                      height=500, margin=dict(l=0, r=0, t=60, b=0))
+    return fig
+
@@ -0,0 +1,88 @@
+import streamlit as st
+
+from calculator_logic import OPERATIONS, OPERATORS
+from expression_engine import ExpressionError
+from function_plot import DISPLAY_POINTS, build_function_figure, decimate, operator_expression, sample_function
+from profiling import stage
+
+# 기본 샘플 수 선택지 (10^6 이상도 표시용 축소 후 수천 개의 점만 브라우저로 보냅니다)
+SAMPLE_COUNTS = [1_000, 10_000, 100_000, 1_000_000, 2_000_000, 5_000_000]
+DISPLAY_POINT_CHOICES = [1_000, 2_000, DISPLAY_POINTS, 8_000]
+INPUT_MODES = ["계산기 연산자", "수식"]
+
+
+# 같은 함수/범위/샘플 수의 재실행(위젯 조작)에서는 샘플링을 다시 하지 않고 축소된 점만 재사용합니다.
+@st.cache_data(max_entries=16, show_spinner=False)
+def _plot_data(text, x_min, x_max, num_points, display_points):
+    with stage("sample"):
+        samples = sample_function(text, x_min, x_max, num_points)
+    with stage("decimate"):
+        x, y = decimate(samples.x, samples.y, display_points)
+    stats = {
+        'expression': samples.text,
+        'evaluated': len(samples) - samples.breaks,
+        'refined': samples.refined_points,
+        'errors': samples.error_points,
+        'breaks': samples.breaks,
+        'displayed': len(x),
+    }
+    return x, y, stats
+
+
+def function_input():
+    """함수 입력 위젯을 그리고 x에 대한 수식 문자열을 반환합니다."""
+    mode = st.radio("함수 입력 방식", INPUT_MODES, horizontal=True, key="plot_input_mode")
+    if mode == "수식":
+        return st.text_input("y = f(x)", value="tan(x)", key="plot_expression",
+                             help="예: sin(x) * 2 + log(x, 2), x ** 3 mod 7 (삼각함수는 도 단위)")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        operation = st.selectbox("연산자", OPERATIONS, index=OPERATIONS.index('tan'), key="plot_operation")
+    with col2:
+        if operation == 'log':
+            base = st.number_input("로그의 밑 (0이면 10)", value=0.0, key="plot_log_base")
+            return operator_expression(operation, base or None)
+        if OPERATORS[operation].arity == 2:
+            operand = st.number_input("두 번째 피연산자", value=2.0, key="plot_operand")
+            return operator_expression(operation, operand)
+    return operator_expression(operation)
+
+
+def function_plot_page():
+    """함수 그래프 페이지 UI를 렌더링합니다."""
+    st.header("📈 함수 그래프")
+    st.caption("계산기 연산자나 수식을 x 범위 전체에 대해 한 번에 벡터화 계산합니다. "
+               "정의되지 않는 점(tan 90° 등)과 불연속점에서는 선이 끊깁니다.")
+
+    text = function_input()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        x_min = st.number_input("x 최솟값", value=-360.0, key="plot_x_min")
+    with col2:
+        x_max = st.number_input("x 최댓값", value=360.0, key="plot_x_max")
+    with col3:
+        num_points = st.select_slider("샘플 수", options=SAMPLE_COUNTS, value=100_000,
+                                      format_func=lambda n: f"{n:,}", key="plot_num_points")
+    with col4:
+        display_points = st.select_slider("표시 구간 수", options=DISPLAY_POINT_CHOICES, value=DISPLAY_POINTS,
+                                          format_func=lambda n: f"{n:,}", key="plot_display_points")
+
+    if not text.strip():
+        st.info("그래프로 그릴 수식을 입력하세요. 예: sin(x) * 2")
+        return
+    try:
+        x, y, stats = _plot_data(text, float(x_min), float(x_max), int(num_points), int(display_points))
+    except (ExpressionError, ValueError) as e:
+        st.error(f"그래프를 그릴 수 없습니다: {e}")
+        return
+
+    with stage("render_chart"):
+        st.plotly_chart(build_function_figure(x, y, stats['expression']), use_container_width=True)
+    st.caption(
+        f"평가한 점 {stats['evaluated']:,}개 (적응형 세분화 {stats['refined']:,}개 포함), "
+        f"오류로 가려진 점 {stats['errors']:,}개, 불연속 끊김 {stats['breaks']:,}곳 · "
+        f"브라우저로 보낸 점 {stats['displayed']:,}개"
+    )
+
+# --- function_plot_page.py 끝 ---
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+# 대륙 x 연도 집계 큐브
+# 전체 long 테이블에 대해 (대륙, 연도) 조합 키를 만들고 np.bincount(weights=...) 몇 번으로
+# 모든 연도의 대륙별 합계를 한 번에 계산합니다. 결과는 (대륙 수 x 연도 수) 행의 작은
+# 데이터프레임(큐브)이며, 화면의 드릴다운 뷰는 원본을 다시 집계하지 않고 큐브에서 잘라 씁니다.
+#
+# 큐브 컬럼:
+#   population        대륙 인구 합계
+#   countries         국가 수
+#   area              면적 합계 (km²)
+#   density           인구 / 면적 (명/km²)
+#   weighted_density  인구 가중 밀도: sum(인구_i * 밀도_i) / sum(인구_i)
+#   annual_growth     이전 스냅샷 대비 연평균 성장률 (%)
+#   world_share       해당 연도 세계 인구 대비 비율 (%)
+
+
+def build_continent_cube(population_df, countries_df):
+    """long 인구 테이블과 국가 속성 테이블로 (continent, year) 인덱스의 집계 큐브를 만듭니다."""
+    continent = population_df['continent'].astype('category')
+    continents = continent.cat.categories
+    years = np.unique(population_df['year'].to_numpy())
+
+    cont_codes = continent.cat.codes.to_numpy().astype(np.int64)
+    year_pos = np.searchsorted(years, population_df['year'].to_numpy())
+    keys = cont_codes * len(years) + year_pos
+    size = len(continents) * len(years)
+
+    population = population_df['population'].to_numpy(dtype=np.float64)
+    area_by_iso = pd.Series(countries_df['area'].to_numpy(dtype=np.float64),
+                            index=countries_df['iso_a3'].astype(str))
+    area = area_by_iso.reindex(population_df['iso_a3'].astype(str)).to_numpy()
+    has_area = np.isfinite(area) & (area > 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        density = np.where(has_area, population / area, 0.0)
+        totals = np.bincount(keys, weights=population, minlength=size)
+        counts = np.bincount(keys, minlength=size)
+        areas = np.bincount(keys, weights=np.where(has_area, area, 0.0), minlength=size)
+        weighted = np.bincount(keys, weights=population * density, minlength=size)
+
+        shape = (len(continents), len(years))
+        totals_2d = totals.reshape(shape)
+        world = totals_2d.sum(axis=0)
+        growth = np.full(shape, np.nan)
+        spans = np.diff(years).astype(np.float64)
+        growth[:, 1:] = ((totals_2d[:, 1:] / totals_2d[:, :-1]) ** (1 / spans) - 1) * 100
+
+        cube = pd.DataFrame({
+            'population': totals,
+            'countries': counts,
+            'area': areas,
+            'density': totals / areas,
+            'weighted_density': weighted / totals,
+            'annual_growth': growth.ravel(),
+            'world_share': (totals_2d / world * 100).ravel(),
+        }, index=pd.MultiIndex.from_product([continents.astype(str), years], names=['continent', 'year']))
+    return cube[cube['countries'] > 0]
+
+
+def continent_view(cube, year):
+    """year년의 대륙별 집계 (인구 내림차순)."""
+    return cube.xs(year, level='year').sort_values('population', ascending=False)
+
+
+def continent_history(cube, continent):
+    """한 대륙의 연도별 집계."""
+    return cube.xs(continent, level='continent')
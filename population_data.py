@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+# 인구 데이터 로더
+# CSV를 처음 한 번만 파싱하여 컬럼별 .npy 파일(컬럼형 바이너리 캐시)로 저장하고,
+# 이후에는 메모리 맵(np.load(mmap_mode='r'))으로 바로 읽습니다.
+# 캐시 디렉터리는 원본 파일의 절대 경로와 (크기, 수정 시각)으로 구분됩니다. 파일이 바뀌면 새 디렉터리에
+# 쓰므로, 다른 세션이 메모리 맵으로 읽고 있는 .npy 파일을 덮어쓰지 않습니다. 새 캐시는 임시 디렉터리에
+# 모두 쓴 뒤 os.replace로 한 번에 옮기므로, 캐시 디렉터리가 보이면 항상 완전한 상태입니다.
+#
+# 번들된 world_population.csv는 연도마다 "2022 Population" 같은 컬럼이 있는 wide 형식이므로,
+# 캐시에 저장하기 전에 한 번만 year / iso_a3 / population 컬럼의 long 형식으로 변환합니다.
+
+CACHE_DIR = os.path.join(".cache", "population")
+CACHE_FORMAT_VERSION = 3
+
+# wide 형식의 연도별 인구 컬럼 (소문자 변환 후): "2022 population"
+YEAR_COLUMN_RE = re.compile(r"^(\d{4}) population$")
+
+
+def file_hash(file_path):
+    """파일 내용의 SHA-256 해시를 반환합니다."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_dir(file_path, cache_dir):
+    # 이름이 같은 다른 위치의 CSV와 캐시를 공유하지 않도록 절대 경로의 해시를 붙입니다.
+    resolved = os.path.realpath(file_path)
+    digest = hashlib.sha256(resolved.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(resolved)}-{digest}")
+
+
+def _cache_path(file_path, cache_dir, name):
+    stat = os.stat(file_path)
+    return os.path.join(_source_dir(file_path, cache_dir), f"{name}-{stat.st_size}-{stat.st_mtime_ns}")
+
+
+def _read_meta(cache_path):
+    try:
+        with open(os.path.join(cache_path, "meta.json"), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_is_fresh(meta):
+    """캐시 디렉터리 이름이 원본 파일의 크기/수정 시각을 담으므로 형식 버전만 확인합니다."""
+    return meta is not None and meta.get('version') == CACHE_FORMAT_VERSION
+
+
+def _write_columns(df, cache_path):
+    columns = []
+    categorical = []
+    for i, column in enumerate(df.columns):
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # 범주형 컬럼은 정수 코드와 범주 목록을 따로 저장합니다.
+            np.save(os.path.join(cache_path, f"{i}.categories.npy"),
+                    series.cat.categories.to_numpy().astype(str), allow_pickle=False)
+            values = series.cat.codes.to_numpy()
+            categorical.append(column)
+        else:
+            values = series.to_numpy()
+            if values.dtype == object:
+                # 문자열 컬럼은 고정 폭 유니코드 배열로 저장하여 pickle 없이 메모리 맵으로 읽습니다.
+                values = values.astype(str)
+        np.save(os.path.join(cache_path, f"{i}.npy"), values, allow_pickle=False)
+        columns.append(column)
+    meta = {'version': CACHE_FORMAT_VERSION, 'columns': columns, 'categorical': categorical}
+    with open(os.path.join(cache_path, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+def _write_cache(df, cache_path):
+    """
+    임시 디렉터리에 캐시를 모두 쓴 뒤 cache_path로 원자적으로 옮깁니다.
+    다른 프로세스가 먼저 같은 캐시를 만들었다면 그쪽을 그대로 쓰고 임시 디렉터리는 지웁니다.
+    """
+    parent = os.path.dirname(cache_path)
+    os.makedirs(parent, exist_ok=True)
+    tmp_path = tempfile.mkdtemp(prefix=f".{os.path.basename(cache_path)}.", dir=parent)
+    try:
+        _write_columns(df, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        if not _cache_is_fresh(_read_meta(cache_path)):
+            raise
+        return
+    _remove_stale(cache_path)
+
+
+def _remove_stale(cache_path):
+    # 같은 원본의 이전 버전 캐시를 지웁니다. 메모리 맵으로 열려 있는 파일은 (POSIX에서) 닫힐 때까지 유효하고,
+    # 지울 수 없으면 (Windows 등) 다음 기회에 다시 시도합니다.
+    parent, current = os.path.split(cache_path)
+    name = current.split('-', 1)[0]
+    for entry in os.listdir(parent):
+        if entry != current and entry.split('-', 1)[0] == name and not entry.startswith('.'):
+            shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+
+
+def _read_cache(meta, cache_path):
+    data = {}
+    for i, column in enumerate(meta['columns']):
+        values = np.load(os.path.join(cache_path, f"{i}.npy"), mmap_mode='r', allow_pickle=False)
+        if column in meta['categorical']:
+            categories = np.load(os.path.join(cache_path, f"{i}.categories.npy"), allow_pickle=False)
+            values = pd.Categorical.from_codes(values, categories=categories)
+        data[column] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def _cached_frame(file_path, cache_dir, name, build):
+    """
+    build()로 만든 데이터프레임을 원본 파일 기준으로 캐시합니다.
+    캐시 디렉터리에 쓸 수 없으면 build() 결과를 그대로 반환합니다.
+    """
+    cache_path = _cache_path(file_path, cache_dir, name)
+    meta = _read_meta(cache_path)
+    if _cache_is_fresh(meta):
+        return _read_cache(meta, cache_path)
+
+    df = build()
+    try:
+        _write_cache(df, cache_path)
+    except OSError:
+        return df
+    return _read_cache(_read_meta(cache_path), cache_path)
+
+
+def _read_raw_csv(file_path):
+    df = pd.read_csv(file_path)
+    # 데이터프레임의 컬럼 이름을 모두 소문자로 변경하여 접근을 쉽게 합니다.
+    df.columns = df.columns.str.lower()
+    return df
+
+
+def normalize_population_schema(df):
+    """
+    wide 형식(<연도> population 컬럼, cca3)을 감지하면 long 형식
+    (iso_a3, country, continent, year, population)으로 한 번에 변환합니다.
+    국가 코드/이름/대륙은 범주형, 연도는 int16이며 행은 연도순으로 정렬됩니다.
+    이미 long 형식(year 컬럼 보유)이면 연도순 정렬만 합니다.
+    """
+    if 'year' in df.columns:
+        return df.sort_values('year', kind='stable').reset_index(drop=True)
+
+    year_columns = sorted(
+        (int(match.group(1)), column)
+        for column in df.columns
+        if (match := YEAR_COLUMN_RE.match(column))
+    )
+    if not year_columns or 'cca3' not in df.columns:
+        return df
+
+    years = np.array([year for year, _ in year_columns], dtype=np.int16)
+    # (국가 수, 연도 수) 행렬을 전치하여 펼치면 연도별로 연속된 행이 됩니다.
+    values = df[[column for _, column in year_columns]].to_numpy(dtype=np.int64)
+    num_countries = len(df)
+    long = {
+        'iso_a3': np.tile(df['cca3'].to_numpy(), len(years)),
+        'year': np.repeat(years, num_countries),
+        'population': values.T.ravel(),
+    }
+    for source, target in (('country/territory', 'country'), ('continent', 'continent')):
+        if source in df.columns:
+            long[target] = np.tile(df[source].to_numpy(), len(years))
+    result = pd.DataFrame(long)
+    for column in ('iso_a3', 'country', 'continent'):
+        if column in result.columns:
+            result[column] = result[column].astype('category')
+    return result
+
+
+def read_population_csv(file_path, cache_dir=CACHE_DIR):
+    """
+    CSV를 long 형식(year, iso_a3, population, ...)으로 정규화하여
+    컬럼형 바이너리 캐시를 거쳐 로드합니다 (컬럼 이름은 소문자).
+    """
+    return _cached_frame(file_path, cache_dir, 'long',
+                         lambda: normalize_population_schema(_read_raw_csv(file_path)))
+
+
+# wide CSV의 국가별 속성 컬럼 (소문자) -> 국가 테이블 컬럼 이름
+COUNTRY_COLUMNS = {
+    'cca3': 'iso_a3',
+    'country/territory': 'country',
+    'capital': 'capital',
+    'continent': 'continent',
+    'area (km²)': 'area',
+    'density (per km²)': 'density',
+    'growth rate': 'growth_rate',
+    'world population percentage': 'world_share',
+}
+
+
+def normalize_country_table(df):
+    """wide CSV에서 국가별 속성(면적, 밀도, 성장률 등)만 골라 국가당 한 행의 테이블로 만듭니다."""
+    columns = {source: target for source, target in COUNTRY_COLUMNS.items() if source in df.columns}
+    if 'cca3' not in columns:
+        return pd.DataFrame({'iso_a3': pd.Series(dtype='category')})
+    result = df[list(columns)].rename(columns=columns).reset_index(drop=True)
+    for column in ('iso_a3', 'country', 'continent'):
+        if column in result.columns:
+            result[column] = result[column].astype('category')
+    return result
+
+
+def read_country_table(file_path, cache_dir=CACHE_DIR):
+    """국가별 속성 테이블(iso_a3, country, continent, area, density, growth_rate, ...)을 캐시를 거쳐 로드합니다."""
+    return _cached_frame(file_path, cache_dir, 'countries',
+                         lambda: normalize_country_table(_read_raw_csv(file_path)))
+
+
+def build_year_index(df, column='year'):
+    """
+    연도별로 정렬된 데이터프레임에서 {연도: 행 slice} 인덱스를 만듭니다.
+    df.iloc[index[year]]는 불리언 마스크 + copy() 대신 O(1) 슬라이스 뷰를 반환합니다.
+    """
+    years = df[column].to_numpy()
+    if len(years) == 0:
+        return {}
+    starts = np.flatnonzero(np.r_[True, years[1:] != years[:-1]])
+    stops = np.r_[starts[1:], len(years)]
+    index = {years[start].item(): slice(int(start), int(stop)) for start, stop in zip(starts, stops)}
+    if len(index) != len(starts):
+        raise ValueError(f"'{column}' 컬럼이 정렬되어 있지 않습니다.")
+    return index
+
+
+class PopulationStore:
+    """
+    프로세스 전체에서 공유하는 읽기 전용 인구 데이터셋.
+    세션은 이 객체의 프레임을 복사하지 않고 연도별 슬라이스 뷰나 페이지 단위 뷰만 사용합니다.
+    지도/모델/집계 큐브 같은 파생 결과도 derived()로 데이터셋당 한 번만 만들어 공유합니다.
+    """
+
+    def __init__(self, file_path, cache_dir=CACHE_DIR):
+        self.file_path = file_path
+        self.version = file_hash(file_path)
+        self.frame = read_population_csv(file_path, cache_dir)
+        self.countries = read_country_table(file_path, cache_dir)
+        self._year_index = None
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    @property
+    def year_index(self):
+        """{연도: 행 slice} 인덱스 ('year' 컬럼이 없으면 KeyError)."""
+        if self._year_index is None:
+            self._year_index = build_year_index(self.frame)
+        return self._year_index
+
+    def year_view(self, year):
+        """year년의 행들 (복사 없는 슬라이스 뷰)."""
+        return self.frame.iloc[self.year_index[year]]
+
+    def year_page(self, year, page, page_size):
+        """year년 행 중 page번째(0부터) 페이지의 뷰와 전체 페이지 수를 반환합니다."""
+        rows = self.year_index[year]
+        num_rows = rows.stop - rows.start
+        num_pages = max(1, -(-num_rows // page_size))
+        page = min(max(page, 0), num_pages - 1)
+        start = rows.start + page * page_size
+        return self.frame.iloc[start:min(start + page_size, rows.stop)], num_pages
+
+    def derived(self, name, build):
+        """데이터셋에서 파생된 결과를 이름별로 한 번만 만들어 공유합니다 (스레드 안전)."""
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = build()
+            return self._derived[name]
@@ -0,0 +1,88 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+# 인구 지도(choropleth) 생성 계층
+# 연도마다 px.choropleth를 새로 만드는 대신, animation_frame='year'인 애니메이션 지도를
+# 데이터셋 버전당 한 번만 만듭니다. 연도별 색상 바 눈금(최소/중간값/최대)은 미리 계산해
+# 각 프레임의 layout에 넣어 두므로, 슬라이더로 연도를 바꾸는 것은 브라우저 안에서의
+# 프레임 전환일 뿐 서버 재실행이 필요하지 않습니다.
+# 만든 지도는 world_population_page가 JSON으로 결과 캐시(result_cache)에 저장하고,
+# 선택한 연도가 처음 표시되는 복사본(select_year)을 연도마다 한 번만 만들어 공유합니다.
+
+COLOR_SCALE = "Viridis"
+
+
+def colorbar_stats(df, year_index):
+    """연도별 (최소, 중간값, 최대) 인구를 {연도: (min, median, max)}로 반환합니다."""
+    population = df['population'].to_numpy()
+    stats = {}
+    for year, rows in year_index.items():
+        values = population[rows]
+        stats[year] = (values.min(), np.median(values), values.max())
+    return stats
+
+
+def _colorbar(stats):
+    pop_min, pop_median, pop_max = stats
+    return dict(
+        title="인구 수",
+        tickvals=[pop_min, pop_median, pop_max],
+        ticktext=[
+            f"{pop_min:,.0f} (최소)",
+            f"{pop_median:,.0f} (중간값)",
+            f"{pop_max:,.0f} (최대)"
+        ]
+    )
+
+
+def _show_frame(fig, index):
+    # 초기 화면(트레이스, 제목/색상 범위, 슬라이더 위치)을 index번째 프레임으로 맞춥니다.
+    frame = fig.frames[index]
+    fig.update_traces(selector=0, **frame.data[0].to_plotly_json())
+    fig.update_layout(frame.layout)
+    fig.layout.sliders[0].active = index
+    return fig
+
+
+def select_year(fig, year):
+    """애니메이션 지도 fig의 복사본을 year년 프레임이 처음 표시되도록 맞춰 반환합니다 (fig는 그대로)."""
+    names = [frame.name for frame in fig.frames]
+    if str(year) not in names:
+        raise KeyError(year)
+    return _show_frame(go.Figure(fig), names.index(str(year)))
+
+
+def build_animated_choropleth(df, year_index):
+    """
+    연도별 프레임을 가진 애니메이션 choropleth 지도를 만듭니다.
+    처음에는 가장 최근 연도가 표시됩니다 (다른 연도는 select_year로 맞춥니다).
+    """
+    years = sorted(year_index)
+    stats = colorbar_stats(df, year_index)
+    hover_name = 'country' if 'country' in df.columns else 'iso_a3'
+
+    fig = px.choropleth(
+        df,
+        locations='iso_a3',           # 국가 코드 컬럼 (ISO-3)
+        color='population',           # 색상 구분에 사용할 값 (인구)
+        hover_name=hover_name,
+        animation_frame='year',
+        category_orders={'year': years},
+        color_continuous_scale=COLOR_SCALE,
+        projection="natural earth"
+    )
+
+    # 프레임마다 해당 연도의 색상 범위, 색상 바 눈금, 제목을 미리 넣어 둡니다.
+    for frame in fig.frames:
+        year = int(frame.name)
+        pop_min, _, pop_max = stats[year]
+        frame.layout = dict(
+            title_text=f"{year}년 국가별 인구 분포",
+            coloraxis=dict(cmin=pop_min, cmax=pop_max, colorbar=_colorbar(stats[year]))
+        )
+
+    _show_frame(fig, len(fig.frames) - 1)
+    fig.update_layout(height=600, margin=dict(l=0, r=0, t=60, b=0))
+    return fig
+
@@ -0,0 +1,80 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# 임의 연도 인구 조회
+# 데이터셋은 1970, 1980, ..., 2022년 스냅샷만 있으므로, 국가 x 연도 인구 행렬을 한 번 만들어 두고
+# 스냅샷 사이는 기하(지수) 보간으로, 마지막 스냅샷 이후는 국가별 연간 성장률(growth rate,
+# 예: 1.0257 = 연 2.57%)로 외삽합니다. 모든 계산은 전체 국가에 대한 배열 연산 한 번이며,
+# 연도별 결과는 메모이즈됩니다.
+
+YEAR_CACHE_SIZE = 256
+MAX_QUERY_YEAR = 2100 # 외삽할 수 있는 마지막 연도 (페이지 입력과 API가 함께 사용)
+
+
+class PopulationModel:
+    """국가 x 연도 인구 행렬과 성장률로 임의 연도의 인구를 추정합니다."""
+
+    def __init__(self, population_df, countries_df=None):
+        iso = population_df['iso_a3'].astype('category')
+        self.iso_codes = np.asarray(iso.cat.categories)
+        self.years = np.unique(population_df['year'].to_numpy()).astype(np.float64)
+
+        # long 테이블을 (국가, 연도) 행렬로 펼칩니다 (누락된 값은 NaN).
+        rows = iso.cat.codes.to_numpy()
+        cols = np.searchsorted(self.years, population_df['year'].to_numpy())
+        self.matrix = np.full((len(self.iso_codes), len(self.years)), np.nan)
+        self.matrix[rows, cols] = population_df['population'].to_numpy()
+
+        self.growth = np.ones(len(self.iso_codes))
+        if countries_df is not None and 'growth_rate' in countries_df.columns:
+            growth = pd.Series(countries_df['growth_rate'].to_numpy(),
+                               index=countries_df['iso_a3'].astype(str))
+            self.growth = growth.reindex(self.iso_codes).fillna(1.0).to_numpy()
+
+        self._position = {code: i for i, code in enumerate(self.iso_codes)}
+        self._population_in = lru_cache(maxsize=YEAR_CACHE_SIZE)(self._compute)
+
+    def _compute(self, year):
+        years = self.years
+        if year < years[0]:
+            raise ValueError(f"{years[0]:.0f}년 이전의 인구는 추정할 수 없습니다: {year}")
+        if year > MAX_QUERY_YEAR:
+            raise ValueError(f"{MAX_QUERY_YEAR}년 이후의 인구는 추정할 수 없습니다: {year}")
+        if year >= years[-1]:
+            # 마지막 스냅샷 이후: 연간 성장률로 외삽
+            result = self.matrix[:, -1] * self.growth ** (year - years[-1])
+        else:
+            # 스냅샷 사이: 두 스냅샷의 기하 보간 (값이 0 이하이면 선형 보간)
+            j = int(np.searchsorted(years, year, side='right')) - 1
+            p0, p1 = self.matrix[:, j], self.matrix[:, j + 1]
+            t = (year - years[j]) / (years[j + 1] - years[j])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                geometric = p0 * (p1 / p0) ** t
+            result = np.where((p0 > 0) & (p1 > 0), geometric, p0 + (p1 - p0) * t)
+        result.setflags(write=False) # 메모이즈된 결과이므로 읽기 전용
+        return result
+
+    def population_in(self, year):
+        """모든 국가의 year년 추정 인구 배열 (iso_codes 순서, 읽기 전용)."""
+        return self._population_in(float(year))
+
+    def query(self, year, iso_a3=None):
+        """
+        year년 인구를 추정합니다. iso_a3가 주어지면 해당 국가(또는 국가 목록)의 값만,
+        생략하면 전체 국가의 pd.Series(index=iso_a3)를 반환합니다.
+        """
+        values = self.population_in(year)
+        if iso_a3 is None:
+            return pd.Series(values, index=self.iso_codes, name=year)
+        if isinstance(iso_a3, str):
+            return float(values[self._position[iso_a3]])
+        return values[[self._position[code] for code in iso_a3]]
+
+    def world_total(self, year):
+        """year년 전 세계 추정 인구 합계."""
+        return float(np.nansum(self.population_in(year)))
+
+    def cache_info(self):
+        return self._population_in.cache_info()
@@ -1,86 +1,303 @@
 import streamlit as st
 import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 import pandas as pd
+import time
+
+from distributions import (
+    MAX_BINOMIAL_N, MAX_CATEGORIES, MAX_DICE_SIDES, MAX_NUM_DICE, MAX_POISSON_LAM,
+    Binomial, Categorical, Coin, Dice, Poisson, chi_square, confidence_intervals, interval_z
+)
+from profiling import stage, timed_iter
+from result_cache import get_cache
+from simulation_engine import (
+    SIMULATION_CACHE, default_workers, iter_adaptive_simulation, iter_simulation, new_seed, simulation_key
+)
+
+# 부분 결과(히스토그램)를 화면에 갱신하는 최소 간격 (초). 그리기가 오래 걸리면 간격을
+# 마지막 그리기 시간의 RENDER_BACKOFF배로 늘려, 그리기가 시뮬레이션 시간을 차지하지 않게 합니다.
+STREAM_INTERVAL_SEC = 0.3
+RENDER_BACKOFF = 4
+MAX_BAR_LABELS = 50 # 결과 수가 이보다 많으면 막대 위의 횟수 표시를 생략합니다 (호버로 확인)
+
+RUN_MODES = ["고정 횟수", "목표 정밀도 (조기 종료)"]
+CONFIDENCE_LEVELS = [0.90, 0.95, 0.99]
+# 화면에 표시할 신뢰구간 방법 이름 -> distributions.INTERVAL_METHODS
+INTERVAL_METHODS = {
+    "Wilson (결과별)": 'wilson',
+    "다항 동시 구간 (Goodman)": 'multinomial',
+}
+
+SIMULATION_TYPES = [
+    "주사위 던지기 (Dice)",
+    "동전 던지기 (Coin)",
+    "범주형 분포 (Categorical)",
+    "이항 분포 (Binomial)",
+    "포아송 분포 (Poisson)",
+]
+
+def distribution_inputs(simulation_type):
+    """선택한 시뮬레이션의 매개변수 입력 위젯을 그리고 분포 객체를 반환합니다."""
+    col1, col2 = st.columns(2)
+    
+    if simulation_type == "주사위 던지기 (Dice)":
+        with col1:
+            sides = st.number_input("주사위 면의 수", min_value=2, max_value=MAX_DICE_SIDES, value=6,
+                                    key="dice_sides")
+        with col2:
+            num_dice = st.number_input("주사위 개수 (눈의 합)", min_value=1, max_value=MAX_NUM_DICE, value=1,
+                                       key="dice_count")
+        return Dice(int(sides), int(num_dice))
+    
+    if simulation_type == "동전 던지기 (Coin)":
+        with col1:
+            p_heads = st.slider("앞면이 나올 확률", min_value=0.0, max_value=1.0, value=0.5, step=0.01, key="coin_p")
+        return Coin(p_heads)
+    
+    if simulation_type == "범주형 분포 (Categorical)":
+        spec = st.text_input(
+            "결과:가중치 목록 (쉼표로 구분)",
+            value="A:1, B:2, C:3",
+            key="categorical_spec"
+        )
+        pairs = [item.rsplit(':', 1) for item in spec.split(',') if item.strip()]
+        if any(len(pair) != 2 for pair in pairs):
+            raise ValueError("각 항목은 '결과:가중치' 형식이어야 합니다.")
+        if len(pairs) > MAX_CATEGORIES:
+            raise ValueError(f"결과는 최대 {MAX_CATEGORIES:,}개까지 입력할 수 있습니다.")
+        return Categorical([label.strip() for label, _ in pairs], [float(weight) for _, weight in pairs])
+    
+    if simulation_type == "이항 분포 (Binomial)":
+        with col1:
+            n = st.number_input("시행 횟수 n", min_value=1, max_value=MAX_BINOMIAL_N, value=10, key="binom_n")
+        with col2:
+            p = st.slider("성공 확률 p", min_value=0.0, max_value=1.0, value=0.5, step=0.01, key="binom_p")
+        return Binomial(int(n), p)
+    
+    with col1:
+        lam = st.number_input("평균 λ", min_value=0.01, max_value=MAX_POISSON_LAM, value=3.0, key="poisson_lam")
+    return Poisson(lam)
 
 def probability_page():
     """확률 시뮬레이터 페이지 UI를 렌더링합니다."""
     st.header("🎲 확률 시뮬레이터")
     
     # --- 1. 입력 설정 ---
+    run_mode = st.radio("실행 방식", RUN_MODES, horizontal=True, key="sim_run_mode")
+    adaptive = run_mode == RUN_MODES[1]
     col1, col2 = st.columns(2)
     
     with col1:
         simulation_type = st.selectbox(
             "시뮬레이션 선택",
-            options=["주사위 던지기 (Dice)", "동전 던지기 (Coin)"],
+            options=list(SIMULATION_TYPES),
             key="sim_type"
         )
         
     with col2:
         num_trials = st.number_input(
-            "실행 횟수 (시행 횟수)",
+            "최대 실행 횟수 (목표 정밀도에 도달하면 멈춤)" if adaptive else "실행 횟수 (시행 횟수)",
             min_value=1,
-            max_value=100000,
+            max_value=1_000_000_000,
             value=1000,
             step=100,
             key="num_trials"
         )
         
+    col3, col4 = st.columns(2)
+    
+    with col3:
+        seed_text = st.text_input(
+            "난수 시드 (비워두면 무작위, 같은 시드면 같은 결과)",
+            value="",
+            key="sim_seed"
+        )
+        
+    with col4:
+        workers = st.number_input(
+            "병렬 워커 수",
+            min_value=1,
+            max_value=default_workers(),
+            value=default_workers(),
+            step=1,
+            key="sim_workers"
+        )
+        
+    col5, col6, col7 = st.columns(3)
+    
+    with col5:
+        confidence = st.selectbox("신뢰수준", CONFIDENCE_LEVELS, index=1, format_func=lambda c: f"{c:.0%}",
+                                  key="sim_confidence")
+        
+    with col6:
+        method_label = st.selectbox("신뢰구간 방법", list(INTERVAL_METHODS), key="sim_interval_method")
+        method = INTERVAL_METHODS[method_label]
+        
+    with col7:
+        target = st.number_input(
+            "목표 오차 ± (%p, 모든 결과의 신뢰구간 반폭)",
+            min_value=0.001,
+            max_value=10.0,
+            value=0.1,
+            step=0.05,
+            format="%.3f",
+            disabled=not adaptive,
+            key="sim_target_margin"
+        )
+        
+    try:
+        distribution = distribution_inputs(simulation_type)
+    except ValueError as e:
+        st.error(f"분포 매개변수가 올바르지 않습니다: {e}")
+        return
+        
     st.markdown("---")
     
     # --- 2. 시뮬레이션 및 결과 계산 ---
     
     if st.button("시뮬레이션 실행", key="run_sim"):
         
-        # 결과 저장 딕셔너리
-        results = {}
-        
-        if simulation_type == "주사위 던지기 (Dice)":
-            # 1~6 사이의 정수 난수 생성
-            rolls = np.random.randint(1, 7, size=num_trials)
-            st.subheader("주사위 던지기 결과")
-            # 결과 집계 (1, 2, 3, 4, 5, 6)
-            for i in range(1, 7):
-                results[str(i)] = np.sum(rolls == i)
-            
-            # 이론적 확률과 비교
-            expected_prob = 1 / 6
-            st.info(f"이론적 확률 (각 면): {expected_prob:.4f} (약 16.67%)")
-            
-        else: # 동전 던지기 (Coin)
-            # 0 (뒷면) 또는 1 (앞면) 난수 생성
-            flips = np.random.randint(0, 2, size=num_trials)
-            st.subheader("동전 던지기 결과")
-            # 결과 집계 (앞면, 뒷면)
-            results["앞면 (Head)"] = np.sum(flips == 1)
-            results["뒷면 (Tail)"] = np.sum(flips == 0)
-
-            # 이론적 확률과 비교
-            expected_prob = 0.5
-            st.info(f"이론적 확률 (각 면): {expected_prob:.4f} (50%)")
+        try:
+            seed = int(seed_text) if seed_text.strip() else new_seed()
+            if seed < 0:
+                raise ValueError(seed)
+        except ValueError:
+            st.error("시드는 0 이상의 정수여야 합니다.")
+            return
+        
+        labels = distribution.labels
+        pmf = distribution.pmf()
+        st.subheader(f"{distribution.name} 시뮬레이션 결과")
+        
+        # 이론적 확률과 비교 (분포의 정확한 PMF로 계산)
+        if np.allclose(pmf, pmf[0]):
+            st.info(f"이론적 확률 (각 결과): {pmf[0]:.4f} (약 {pmf[0] * 100:.2f}%)")
+        else:
+            st.info("이론적 확률: 그래프의 ◆ 표시(기대 빈도)와 표의 '기대 빈도 (%)' 컬럼을 참고하세요.")
 
-        # --- 3. Plotly 시각화 ---
-        
-        # 데이터프레임 생성
-        df = pd.DataFrame(results.items(), columns=['결과', '횟수'])
-        df['빈도 (%)'] = (df['횟수'] / num_trials) * 100
-        
-        # Plotly 막대 그래프 생성
-        fig = px.bar(
-            df, 
-            x='결과', 
-            y='빈도 (%)', 
-            text='횟수',
-            title=f"총 {num_trials}회 시뮬레이션 결과",
-            labels={'결과': '결과', '빈도 (%)': '빈도 (%)', '횟수': '발생 횟수'},
-            color='결과'
-        )
-        fig.update_traces(textposition='outside')
-        fig.update_layout(xaxis={'categoryorder':'total ascending'})
+        # --- 3. 청크 단위 시뮬레이션 및 Plotly 시각화 (부분 결과를 스트리밍) ---
         
-        st.plotly_chart(fig, use_container_width=True)
+        progress = st.progress(0.0)
+        chart_placeholder = st.empty()
+        last_update = 0.0
+        interval = STREAM_INTERVAL_SEC
+        z = interval_z(confidence, distribution.num_outcomes, method)
         
+        # 시드를 직접 입력한 실행은 결과 캐시에서 찾습니다. 같은 설정으로 다시 실행하면 (다른 세션이나
+        # 서버를 다시 시작한 뒤에도) 계산하지 않고 최종 결과만 바로 그립니다.
+        cache = get_cache(SIMULATION_CACHE)
+        options = dict(adaptive=True, margin=target / 100, confidence=confidence, method=method) if adaptive \
+            else dict(adaptive=False)
+        key = simulation_key(distribution, int(num_trials), seed, **options) if seed_text.strip() else None
+        cached = cache.get(key) if key else None
+        
+        # 적응형 실행은 배치마다 신뢰구간을 갱신하고 목표 오차에 도달하면 멈춥니다.
+        if cached is not None:
+            runs = iter([cached])
+        elif adaptive:
+            runs = ((state.done, state.counts, state) for state in iter_adaptive_simulation(
+                distribution, target / 100, int(num_trials), confidence, method,
+                seed=seed, workers=int(workers)))
+        else:
+            runs = ((done, counts, None) for done, counts in iter_simulation(
+                distribution, int(num_trials), seed=seed, workers=int(workers)))
+        
+        # 프로파일링 중이면 난수 생성(청크 계산)과 차트 갱신 시간을 따로 누적합니다.
+        state = None
+        for done, counts, state in timed_iter(runs, "simulation"):
+            finished = done >= num_trials or (state is not None and state.converged)
+            if not finished and time.perf_counter() - last_update < interval:
+                continue
+            render_start = time.perf_counter()
+            with stage("render_chart"):
+                if state is None:
+                    low, high = confidence_intervals(counts, z)
+                    progress.progress(done / num_trials, text=f"{done:,} / {num_trials:,}회 진행 중")
+                else:
+                    low, high = state.low, state.high
+                    # 구간 반폭은 대략 1/sqrt(시행 횟수)로 줄어드므로 목표까지의 진행률을 추정할 수 있습니다.
+                    fraction = max(done / num_trials, min(1.0, (target / 100 / state.margin) ** 2))
+                    progress.progress(fraction, text=f"{done:,}회 진행 중 · 현재 ±{state.margin * 100:.3f}%p "
+                                                     f"(목표 ±{target:.3f}%p)")
+                df = _results_frame(labels, counts, pmf, done, low, high)
+                statistic, dof = chi_square(counts, pmf)
+                chart_placeholder.plotly_chart(_results_figure(df, done, statistic, confidence),
+                                               use_container_width=True)
+            # 다음 갱신 시각은 청크 수가 아니라 경과 시간(그리기를 마친 시각과 그리기 비용)으로 정합니다.
+            last_update = time.perf_counter()
+            interval = max(STREAM_INTERVAL_SEC, RENDER_BACKOFF * (last_update - render_start))
+        
+        progress.empty()
+        if cached is not None:
+            st.caption("같은 설정의 이전 실행 결과를 결과 캐시에서 불러왔습니다 (다시 계산하지 않음).")
+        elif key:
+            cache.put(key, (done, counts, state))
+        if state is not None:
+            _adaptive_summary(state, int(num_trials), target, confidence)
+        st.info(f"카이제곱 적합도 통계량: χ² = {statistic:.3f} (자유도 {dof})")
+        st.caption(f"사용된 시드: {seed} (이 시드를 입력하면 워커 수와 관계없이 같은 결과가 재현됩니다.)")
         st.dataframe(df)
 
+
+def _adaptive_summary(state, max_trials, target, confidence):
+    """적응형 실행의 결과: 실제로 사용한 시행 횟수와 최대 횟수 대비 절약한 시간(추정)."""
+    if not state.converged:
+        st.warning(f"최대 {max_trials:,}회를 모두 실행했지만 목표 오차 ±{target:.3f}%p에 도달하지 못했습니다 "
+                   f"(현재 ±{state.margin * 100:.3f}%p). 최대 실행 횟수를 늘려 보세요.")
+        return
+    saved = max(0.0, state.estimated_seconds(max_trials) - state.elapsed)
+    st.success(
+        f"목표 정밀도 달성: {state.done:,}회 시행으로 모든 결과의 {confidence:.0%} 신뢰구간이 "
+        f"±{target:.3f}%p 이내입니다 (최대 {max_trials:,}회의 {state.done / max_trials:.1%}만 사용). "
+        f"실행 시간 {state.elapsed:.2f}초, 최대 횟수까지 실행하는 것보다 약 {saved:.2f}초 절약 (추정)."
+    )
+
+
+def _results_frame(labels, counts, pmf, num_trials, low, high):
+    """결과별 횟수 벡터, 이론 확률, 신뢰구간으로 결과 데이터프레임을 만듭니다."""
+    df = pd.DataFrame({'결과': labels, '횟수': counts})
+    df['빈도 (%)'] = (df['횟수'] / num_trials) * 100
+    df['신뢰구간 하한 (%)'] = low * 100
+    df['신뢰구간 상한 (%)'] = high * 100
+    df['기대 빈도 (%)'] = pmf * 100
+    return df
+
+
+def _results_figure(df, num_trials, statistic, confidence):
+    """
+    결과 데이터프레임으로 시뮬레이션 빈도 막대(신뢰구간 오차 막대 포함)와 기대 빈도 점을 겹친 그래프를 만듭니다.
+    결과가 수천 개(이항 분포 n=2000 등)여도 렌더링 비용이 일정하도록 막대는 트레이스 하나로 그리고
+    색만 결과마다 다르게 지정합니다.
+    """
+    palette = px.colors.qualitative.Plotly
+    frequency = df['빈도 (%)'].to_numpy()
+    labels = df['결과'].astype(str).to_numpy()
+    fig = go.Figure(go.Bar(
+        x=labels,
+        y=frequency,
+        text=df['횟수'] if len(df) <= MAX_BAR_LABELS else None,
+        textposition='outside',
+        customdata=df['횟수'],
+        hovertemplate="결과=%{x}<br>빈도 (%)=%{y:.4f}<br>발생 횟수=%{customdata:,}<extra></extra>",
+        error_y=dict(type='data', array=df['신뢰구간 상한 (%)'].to_numpy() - frequency,
+                     arrayminus=frequency - df['신뢰구간 하한 (%)'].to_numpy()),
+        marker_color=[palette[i % len(palette)] for i in range(len(df))],
+        name='빈도 (%)',
+        showlegend=False,
+    ))
+    fig.add_scatter(
+        x=labels,
+        y=df['기대 빈도 (%)'],
+        mode='markers',
+        marker={'symbol': 'diamond', 'size': 10, 'color': 'black'},
+        name='기대 빈도 (%)'
+    )
+    fig.update_layout(
+        title=f"총 {num_trials:,}회 시뮬레이션 결과 (χ² = {statistic:.2f}, 오차 막대: {confidence:.0%} 신뢰구간)",
+        xaxis={'title': '결과', 'type': 'category', 'categoryorder': 'array', 'categoryarray': list(labels)},
+        yaxis_title='빈도 (%)',
+    )
+    return fig
+
 # --- probability_page.py 끝 ---
@@ -0,0 +1,212 @@
+import contextvars
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# 재실행(rerun) 단위 프로파일링
+# Streamlit은 버튼을 누를 때마다 스크립트 전체를 다시 실행합니다. 프로파일링이 켜진 재실행에서는
+# stage(이름) 블록마다 고해상도 타이머(perf_counter)와 tracemalloc 메모리 증감을 기록하고,
+# 재실행이 끝나면 단계별 시간 분해와 누적 통계(p50/p95)를 만듭니다.
+# 프로파일링이 꺼져 있으면 stage()는 컨텍스트 변수 하나를 확인하고 바로 통과합니다.
+#
+# 현재 재실행의 프로파일은 contextvars로 보관하므로, 세션마다 다른 스레드에서 실행되는
+# 스크립트끼리 섞이지 않습니다. 다만 tracemalloc은 프로세스 전역이므로 메모리 값(단계별 증감과
+# 재실행의 최대 추가 메모리)은 같은 시간에 실행된 다른 세션의 할당도 포함합니다. 다른 프로파일링
+# 재실행과 겹친 재실행은 shared_memory로 표시하고, 최대치 초기화(reset_peak)는 겹치지 않을 때만 합니다.
+# pandas는 분해표를 만들 때만 임포트하므로 프로파일링이 꺼진 세션의 시작 시간에는 영향을 주지 않습니다.
+
+PROFILE_ENV = "APP_PROFILE"   # "1"이면 기본으로 프로파일링을 켭니다.
+ROLLING_WINDOW = 200          # 단계별로 보관할 최근 측정 수
+RERUN_STAGE = "rerun"         # 재실행 전체 시간을 기록하는 단계 이름
+
+_current = contextvars.ContextVar('rerun_profile', default=None)
+
+# tracemalloc은 프로세스 전역이므로, 프로파일링 중인 재실행이 하나라도 있는 동안만 켜 둡니다.
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_starts = 0 # 지금까지 시작된 프로파일링 재실행 수 (측정 구간이 겹쳤는지 확인용)
+
+
+def env_enabled():
+    """환경 변수(APP_PROFILE)로 프로파일링이 기본 활성화되어 있는지 여부."""
+    return os.environ.get(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _start_tracing():
+    """tracemalloc을 켜고 (다른 프로파일링 재실행이 진행 중이었는지, 시작 번호)를 반환합니다."""
+    global _tracing_users, _tracing_starts
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        overlapped = _tracing_users > 0
+        if not overlapped:
+            # 최대치 초기화는 진행 중인 다른 재실행의 측정을 지우므로 혼자일 때만 합니다.
+            tracemalloc.reset_peak()
+        _tracing_users += 1
+        _tracing_starts += 1
+        return overlapped, _tracing_starts
+
+
+def _stop_tracing():
+    """tracemalloc 사용을 끝내고 지금까지의 시작 번호를 반환합니다."""
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return _tracing_starts
+
+
+class StageTiming:
+    """한 단계의 누적 측정값 (같은 이름의 단계가 여러 번 실행되면 합산합니다)."""
+
+    __slots__ = ('path', 'depth', 'calls', 'seconds', 'memory')
+
+    def __init__(self, path, depth):
+        self.path = path
+        self.depth = depth
+        self.calls = 0
+        self.seconds = 0.0
+        self.memory = 0 # 단계 동안 늘어난 추적 메모리 (바이트)
+
+
+class RerunProfile:
+    """한 번의 재실행 동안 실행된 단계들의 시간과 메모리 증감."""
+
+    def __init__(self):
+        self.stages = {}  # 경로("page/load_data") -> StageTiming (처음 시작된 순서)
+        self._stack = []
+        self.total = None
+        self.peak_memory = None # 프로세스 전체의 최대 추가 메모리 (바이트)
+        # 다른 세션의 프로파일링 재실행과 측정 구간이 겹쳤는지 (겹치면 메모리 값에 그 할당도 섞입니다)
+        self.shared_memory, self._start_number = _start_tracing()
+        self._memory_start = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+
+    def _push(self, name):
+        path = f"{self._stack[-1][0]}/{name}" if self._stack else name
+        if path not in self.stages:
+            # 시작 순서대로 등록하므로 분해표에서 상위 단계가 하위 단계보다 먼저 나옵니다.
+            self.stages[path] = StageTiming(path, len(self._stack))
+        self._stack.append((path, time.perf_counter(), tracemalloc.get_traced_memory()[0]))
+
+    def _pop(self):
+        path, start, memory = self._stack.pop()
+        timing = self.stages[path]
+        timing.calls += 1
+        timing.seconds += time.perf_counter() - start
+        timing.memory += tracemalloc.get_traced_memory()[0] - memory
+
+    def finish(self):
+        if self.total is None:
+            self.total = time.perf_counter() - self._start
+            current, peak = tracemalloc.get_traced_memory()
+            self.peak_memory = peak - self._memory_start
+            if _stop_tracing() != self._start_number:
+                self.shared_memory = True # 이 재실행 도중 다른 재실행이 시작됨
+        return self
+
+    def frame(self):
+        """
+        단계별 분해표: 단계, 호출 수, 시간(ms), 자체 시간(ms, 하위 단계 제외), 메모리 증감(KB).
+        자체 시간은 하위 단계로 나누지 않은 나머지(위젯 렌더링 등)입니다.
+        """
+        import pandas as pd
+
+        child_seconds = {}
+        for timing in self.stages.values():
+            parent = timing.path.rpartition('/')[0]
+            if parent:
+                child_seconds[parent] = child_seconds.get(parent, 0.0) + timing.seconds
+        rows = [(RERUN_STAGE, 0, 1, self.total,
+                 self.total - sum(t.seconds for t in self.stages.values() if t.depth == 0),
+                 self.peak_memory)]
+        for timing in self.stages.values():
+            rows.append((timing.path, timing.depth + 1, timing.calls, timing.seconds,
+                         timing.seconds - child_seconds.get(timing.path, 0.0), timing.memory))
+        df = pd.DataFrame(rows, columns=['stage', 'depth', 'calls', 'ms', 'self_ms', 'memory_kb'])
+        df[['ms', 'self_ms']] *= 1000
+        df['memory_kb'] /= 1024
+        return df
+
+
+def start_rerun():
+    """이번 재실행의 프로파일링을 시작하고 RerunProfile을 반환합니다."""
+    profile = RerunProfile()
+    _current.set(profile)
+    return profile
+
+
+def finish_rerun(profile):
+    """프로파일링을 끝내고 측정이 완료된 프로파일을 반환합니다."""
+    if _current.get() is profile:
+        _current.set(None)
+    return profile.finish()
+
+
+@contextmanager
+def stage(name):
+    """프로파일링 중이면 블록의 시간과 메모리 증감을 name 단계로 기록합니다."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    profile._push(name)
+    try:
+        yield
+    finally:
+        profile._pop()
+
+
+def timed_iter(iterable, name):
+    """반복자의 각 next() 호출 시간만 name 단계로 누적합니다 (소비하는 쪽의 시간은 제외)."""
+    iterator = iter(iterable)
+    while True:
+        with stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+class ProfileStats:
+    """재실행 프로파일의 단계별 최근 측정(링 버퍼)과 p50/p95 통계."""
+
+    def __init__(self, window=ROLLING_WINDOW):
+        self.window = window
+        self.samples = {}  # 단계 -> deque[(ms, memory_kb)]
+
+    def add(self, profile):
+        for row in profile.frame().itertuples(index=False):
+            samples = self.samples.get(row.stage)
+            if samples is None:
+                samples = self.samples[row.stage] = deque(maxlen=self.window)
+            samples.append((row.ms, row.memory_kb))
+
+    def __len__(self):
+        return len(self.samples.get(RERUN_STAGE, ()))
+
+    def summary(self):
+        """단계별 측정 수, 마지막/p50/p95/최대 시간(ms), 평균 메모리 증감(KB)."""
+        import pandas as pd
+
+        rows = []
+        for name, samples in self.samples.items():
+            values = np.array(samples)
+            ms = values[:, 0]
+            p50, p95 = np.percentile(ms, [50, 95])
+            rows.append((name, len(ms), ms[-1], p50, p95, ms.max(), values[:, 1].mean()))
+        return pd.DataFrame(rows, columns=['stage', 'samples', 'last_ms', 'p50_ms', 'p95_ms', 'max_ms',
+                                           'mean_memory_kb'])
+
+    def to_csv(self):
+        return self.summary().to_csv(index=False)
+
+    def clear(self):
+        self.samples.clear()
@@ -0,0 +1,74 @@
+import streamlit as st
+
+from profiling import ProfileStats, env_enabled, finish_rerun, start_rerun
+from result_cache import cache_stats
+
+# 사이드바 프로파일링 패널
+# 환경 변수 APP_PROFILE=1 또는 사이드바 토글로 켜며, 켜져 있는 동안 재실행마다
+# 단계별 시간 분해를 사이드바에 표시하고 세션별 누적 통계(p50/p95)를 CSV로 내보낼 수 있습니다.
+# 결과 캐시(result_cache)의 적중/미스 카운터는 프로파일링 여부와 관계없이 항상 표시합니다 (프로세스 전체 값).
+
+TOGGLE_KEY = "profile_enabled"
+
+
+def start_profiling():
+    """프로파일링이 켜져 있으면 이번 재실행의 측정을 시작합니다 (꺼져 있으면 None)."""
+    # 토글 위젯은 재실행 마지막에 그려지므로, 여기서는 이전 재실행에서 저장된 값을 읽습니다.
+    if not st.session_state.get(TOGGLE_KEY, env_enabled()):
+        return None
+    return start_rerun()
+
+
+def stop_profiling(profile):
+    """
+    이번 재실행의 측정을 끝냅니다 (여러 번 호출해도 됩니다). 페이지 예외, st.stop(), 재실행 중단으로
+    스크립트가 끝나도 tracemalloc이 켜진 채 남지 않도록 finally 블록에서 호출합니다.
+    """
+    if profile is not None:
+        finish_rerun(profile)
+
+
+def render_profile_sidebar(profile):
+    """프로파일링 토글, 결과 캐시 통계와, 측정 중이었다면 이번 재실행의 분해표 및 누적 통계를 그립니다."""
+    st.sidebar.markdown("---")
+    st.sidebar.toggle("⏱️ 성능 프로파일링", value=env_enabled(), key=TOGGLE_KEY)
+    render_cache_stats()
+    if profile is None:
+        return
+
+    stop_profiling(profile)
+    if 'profile_stats' not in st.session_state:
+        st.session_state.profile_stats = ProfileStats()
+    stats = st.session_state.profile_stats
+    stats.add(profile)
+
+    breakdown = profile.frame()
+    breakdown['stage'] = ["· " * depth + name.rpartition('/')[2]
+                          for depth, name in zip(breakdown['depth'], breakdown['stage'])]
+    # tracemalloc은 프로세스 전역이므로 메모리 값은 같은 시간에 실행된 다른 세션의 할당도 포함합니다.
+    shared = " · 다른 세션의 재실행과 겹쳐 함께 측정됨" if profile.shared_memory else ""
+    st.sidebar.caption(f"이번 재실행: {profile.total * 1000:,.1f} ms, "
+                       f"최대 추가 메모리 (프로세스 전체) {profile.peak_memory / 1024:,.0f} KB{shared}")
+    st.sidebar.dataframe(breakdown.drop(columns='depth').round(2), hide_index=True)
+
+    with st.sidebar.expander(f"누적 통계 (최근 {len(stats)}회 재실행)"):
+        st.dataframe(stats.summary().round(2), hide_index=True)
+        st.download_button("CSV로 내보내기", stats.to_csv, file_name="rerun_profile.csv",
+                           mime="text/csv", key="profile_export")
+        st.button("통계 초기화", key="profile_reset", on_click=stats.clear)
+
+
+def render_cache_stats():
+    """결과 캐시별 적중/미스 횟수와 계층별 사용량을 사이드바에 표시합니다."""
+    stats = cache_stats()
+    with st.sidebar.expander(f"결과 캐시 ({len(stats)}개)"):
+        if not stats:
+            st.caption("아직 사용된 결과 캐시가 없습니다.")
+            return
+        # 매 재실행 그려지므로, 캐시가 사용된 뒤에만 (이미 로드된) pandas를 임포트합니다.
+        import pandas as pd
+
+        df = pd.DataFrame(stats).set_index('name')
+        df['disk_kb'] = pd.to_numeric(df.pop('disk_bytes')) / 1024
+        df['disk_limit_mb'] = df.pop('disk_limit_bytes') / (1024 * 1024)
+        st.dataframe(df.round(3))
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# 내용 주소(content-addressed) 결과 캐시
+# 계산 결과를 정규화된 매개변수의 SHA-256 해시로 찾습니다. 같은 매개변수(분포와 시행 횟수와 시드,
+# 데이터셋 해시와 연도 등)의 결과는 어느 세션에서 요청하든 한 번만 계산됩니다.
+#
+#   메모리 계층  프로세스 전체가 공유하는 LRU (항목 수 상한)
+#   디스크 계층  .cache/results/<이름>/ 아래의 pickle 파일 (전체 바이트 상한, 오래 쓰지 않은 파일부터 제거)
+#              서버를 다시 시작해도 남으며, 같은 디렉터리를 쓰는 여러 프로세스가 함께 사용합니다.
+#
+# 캐시별 적중/미스 횟수는 cache_stats()로 모아 운영자용 화면(사이드바, API /cache)에 표시합니다.
+# 디스크 계층은 이 앱이 직접 쓴 파일만 읽는다는 전제로 pickle을 사용합니다.
+
+CACHE_DIR_ENV = "RESULT_CACHE_DIR"     # 디스크 계층 위치 (빈 문자열이면 디스크 계층을 끕니다)
+DEFAULT_CACHE_DIR = os.path.join(".cache", "results")
+DEFAULT_MEMORY_ITEMS = 128
+DEFAULT_DISK_BYTES = 256 * 1024 * 1024
+EVICT_TO_FRACTION = 0.9                # 디스크 상한을 넘으면 이 비율까지 줄입니다.
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def canonical(value):
+    """
+    매개변수를 JSON으로 직렬화할 수 있는 정규형으로 바꿉니다. 딕셔너리는 키 순서와 무관하고,
+    NumPy 값은 파이썬 값으로, 분포 같은 객체는 클래스 이름과 공개 속성으로 표현됩니다.
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        # 1과 1.0이 같은 키가 되도록 정수 값의 실수는 정수로 표현합니다.
+        value = float(value)
+        return int(value) if value.is_integer() else value
+    if isinstance(value, np.ndarray):
+        return [canonical(item) for item in value.tolist()]
+    if isinstance(value, dict):
+        return {str(key): canonical(item) for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [canonical(item) for item in value]
+    if hasattr(value, '__dict__'):
+        state = {key: item for key, item in vars(value).items() if not key.startswith('_')}
+        return {'__type__': type(value).__name__, **canonical(state)}
+    raise TypeError(f"캐시 키로 사용할 수 없는 값: {value!r}")
+
+
+def cache_key(**params):
+    """정규화된 매개변수의 SHA-256 해시 (내용 주소)."""
+    text = json.dumps(canonical(params), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _default_cache_dir():
+    return os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+
+
+class ResultCache:
+    """메모리 LRU 계층과 크기 제한이 있는 디스크 계층을 가진 결과 캐시 (스레드 안전)."""
+
+    def __init__(self, name, memory_items=DEFAULT_MEMORY_ITEMS, disk_bytes=DEFAULT_DISK_BYTES, cache_dir=None):
+        self.name = name
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        root = _default_cache_dir() if cache_dir is None else cache_dir
+        self.disk_dir = os.path.join(root, name) if root and disk_bytes > 0 else None
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_usage = None  # 디스크 계층 사용량 추정값 (처음 쓸 때 디렉터리를 훑어 구함)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    # --- 메모리 계층 ---
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    # --- 디스크 계층 ---
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.pkl")
+
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        try:
+            # 수정 시각을 최근 사용 시각으로 씁니다 (제거 순서 결정).
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def _store(self, key, value):
+        path = self._path(key)
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(data) > self.disk_bytes:
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 원자적으로 교체합니다.
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            return
+        with self._lock:
+            self.writes += 1
+            if self._disk_usage is not None:
+                self._disk_usage += len(data)
+        if self._disk_usage is None or self._disk_usage > self.disk_bytes:
+            self._evict()
+
+    def _disk_entries(self):
+        entries = []
+        for root, _, files in os.walk(self.disk_dir):
+            for file_name in files:
+                if file_name.endswith('.pkl'):
+                    try:
+                        stat = os.stat(os.path.join(root, file_name))
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, os.path.join(root, file_name)))
+        return entries
+
+    def _evict(self):
+        """디스크 사용량이 상한을 넘으면 오래 사용하지 않은 파일부터 지웁니다."""
+        entries = self._disk_entries()
+        usage = sum(size for _, size, _ in entries)
+        removed = 0
+        if usage > self.disk_bytes:
+            target = self.disk_bytes * EVICT_TO_FRACTION
+            for _, size, path in sorted(entries):
+                if usage <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                usage -= size
+                removed += 1
+        with self._lock:
+            self._disk_usage = usage
+            self.evictions += removed
+
+    # --- 공개 API ---
+
+    def get(self, key, default=None):
+        """키의 값을 메모리, 디스크 순서로 찾습니다 (없으면 default)."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+        if self.disk_dir is not None:
+            value = self._load(key)
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, value)
+                return value
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def put(self, key, value):
+        """값을 두 계층에 모두 저장합니다 (None은 저장하지 않습니다)."""
+        if value is None:
+            return
+        self._remember(key, value)
+        if self.disk_dir is not None:
+            self._store(key, value)
+
+    def get_or_compute(self, key, compute):
+        """캐시에 있으면 그 값을, 없으면 compute()를 실행해 저장한 값을 반환합니다."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self, disk=False):
+        """메모리 계층(과 disk=True이면 디스크 계층)과 카운터를 비웁니다."""
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = self.disk_hits = self.misses = self.writes = self.evictions = 0
+        if disk and self.disk_dir is not None:
+            for _, _, path in self._disk_entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            with self._lock:
+                self._disk_usage = 0
+
+    def stats(self):
+        """적중/미스 카운터와 계층별 사용량."""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'name': self.name,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else None,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'memory_items': len(self._memory),
+                'disk_bytes': self._disk_usage,
+                'disk_limit_bytes': self.disk_bytes if self.disk_dir is not None else 0,
+            }
+
+
+def get_cache(name, **options):
+    """이름별로 프로세스에 하나뿐인 ResultCache를 반환합니다 (처음 요청할 때 만듭니다)."""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = _caches[name] = ResultCache(name, **options)
+        return cache
+
+
+def cache_stats():
+    """등록된 모든 캐시의 통계 목록."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    return [cache.stats() for cache in caches]
+
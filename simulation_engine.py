@@ -0,0 +1,203 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from distributions import Dice, confidence_intervals, interval_z
+from result_cache import cache_key
+
+# 청크(chunk) 단위 몬테카를로 시뮬레이션 엔진
+# 전체 시행 배열을 한 번에 만들지 않고 고정 크기 청크로 난수를 생성한 뒤,
+# 청크마다 np.bincount 한 번으로 결과별 횟수를 누적합니다.
+# 메모리 사용량은 시행 횟수와 무관하게 청크 크기에 비례합니다.
+#
+# 재현성: 각 청크는 사용자 시드의 SeedSequence에서 청크 번호로 파생한
+# 독립 난수 스트림을 사용합니다. 따라서 같은 시드와 청크 크기라면 워커 수나
+# 백엔드(직렬/스레드/프로세스)와 관계없이 병합된 횟수가 비트 단위로 동일합니다.
+
+DEFAULT_CHUNK_SIZE = 1_000_000
+BACKENDS = ('serial', 'thread', 'process')
+
+# 시뮬레이션 결과를 보관하는 결과 캐시(result_cache) 이름
+SIMULATION_CACHE = "simulation"
+
+# 적응형(조기 종료) 실행의 첫 배치 크기. 이후 배치는 DEFAULT_CHUNK_SIZE까지 두 배씩 커집니다.
+ADAPTIVE_FIRST_CHUNK = 10_000
+
+
+def new_seed():
+    """재현용으로 보여줄 수 있는 새 무작위 시드(정수)를 만듭니다."""
+    return int(np.random.SeedSequence().entropy)
+
+
+def _seed_sequence(seed):
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(new_seed() if seed is None else seed)
+
+
+def _chunk_seed(root, index):
+    """루트 SeedSequence의 index번째 자식 (root.spawn()과 같은 스트림, O(1))."""
+    return np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (index,),
+                                  pool_size=root.pool_size)
+
+
+def _chunk_counts(task):
+    """한 청크를 실행해 결과 인덱스별 횟수 벡터를 반환합니다."""
+    seed, distribution, size = task
+    rng = np.random.Generator(np.random.PCG64(seed))
+    return np.bincount(distribution.sample(rng, size), minlength=distribution.num_outcomes)
+
+
+def _chunk_tasks(root, distribution, num_trials, chunk_size):
+    for index, start in enumerate(range(0, num_trials, chunk_size)):
+        yield _chunk_seed(root, index), distribution, min(chunk_size, num_trials - start)
+
+
+def _as_distribution(distribution):
+    # 정수 k는 결과 k개의 균등 분포(k면체 주사위)로 취급합니다.
+    return Dice(distribution) if isinstance(distribution, int) else distribution
+
+
+def simulation_key(distribution, num_trials, seed, **options):
+    """
+    시뮬레이션 결과의 캐시 키: 분포(종류, 매개변수, 결과 레이블), 시행 횟수, 시드와 실행 옵션.
+    결과는 워커 수/백엔드와 무관하므로(청크별 독립 난수 스트림) 키에 넣지 않습니다.
+    """
+    distribution = _as_distribution(distribution)
+    return cache_key(kind='simulation', distribution=distribution, labels=distribution.labels,
+                     num_trials=int(num_trials), seed=int(seed), **options)
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def _run_chunks(tasks, workers, backend):
+    """
+    청크 작업을 실행하여 청크 순서대로 횟수 벡터를 생성합니다.
+    풀에는 workers * 2개까지만 미리 제출하므로, 소비하는 쪽이 중간에 멈추면(조기 종료)
+    아직 시작하지 않은 청크는 취소되고 남은 시행은 계산하지 않습니다.
+    """
+    if workers <= 1 or backend == 'serial':
+        for task in tasks:
+            yield _chunk_counts(task)
+        return
+
+    executor_cls = ProcessPoolExecutor if backend == 'process' else ThreadPoolExecutor
+    executor = executor_cls(max_workers=workers)
+    pending = deque()
+    try:
+        # 제출 순서대로 결과를 꺼내므로 부분 결과도 워커 수와 무관합니다.
+        for task in tasks:
+            pending.append(executor.submit(_chunk_counts, task))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_simulation(distribution, num_trials, seed=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                    workers=1, backend='thread'):
+    """
+    분포(distributions.Distribution 또는 균등 분포의 결과 개수)에서
+    시뮬레이션을 청크 단위로 실행하며, 청크마다
+    (지금까지의 시행 횟수, 누적 횟수 벡터)를 생성(yield)합니다.
+
+    workers가 2 이상이면 청크를 스레드 풀(NumPy 난수 생성기는 GIL을 해제합니다)
+    또는 프로세스 풀(backend='process')에 분배하고, 청크 순서대로 병합합니다.
+    누적 횟수 벡터는 매번 새 배열로 전달되므로 호출 측에서 보관해도 안전합니다.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 백엔드: {backend}")
+    distribution = _as_distribution(distribution)
+    tasks = _chunk_tasks(_seed_sequence(seed), distribution, num_trials, chunk_size)
+    counts = np.zeros(distribution.num_outcomes, dtype=np.int64)
+    done = 0
+
+    for chunk in _run_chunks(tasks, workers, backend):
+        counts += chunk
+        done += int(chunk.sum())
+        yield done, counts.copy()
+
+
+def simulate(distribution, num_trials, seed=None, chunk_size=DEFAULT_CHUNK_SIZE,
+             workers=1, backend='thread'):
+    """시뮬레이션을 끝까지 실행하고 최종 횟수 벡터를 반환합니다."""
+    counts = np.zeros(_as_distribution(distribution).num_outcomes, dtype=np.int64)
+    for _, counts in iter_simulation(distribution, num_trials, seed, chunk_size, workers, backend):
+        pass
+    return counts
+
+
+def _adaptive_tasks(root, distribution, max_trials):
+    # 배치 크기 순서가 시드와 max_trials만으로 정해지므로, 적응형 실행도 워커 수와 무관하게 재현됩니다.
+    index = done = 0
+    size = ADAPTIVE_FIRST_CHUNK
+    while done < max_trials:
+        size = min(size, max_trials - done)
+        yield _chunk_seed(root, index), distribution, size
+        index += 1
+        done += size
+        size = min(size * 2, DEFAULT_CHUNK_SIZE)
+
+
+class AdaptiveProgress:
+    """적응형 시뮬레이션의 중간/최종 상태."""
+
+    __slots__ = ('done', 'counts', 'low', 'high', 'converged', 'elapsed')
+
+    def __init__(self, done, counts, low, high, converged, elapsed):
+        self.done = done            # 지금까지의 시행 횟수
+        self.counts = counts        # 누적 횟수 벡터 (매번 새 배열)
+        self.low = low              # 결과별 확률의 신뢰구간 하한
+        self.high = high            # 결과별 확률의 신뢰구간 상한
+        self.converged = converged  # 모든 결과의 구간 반폭이 목표 이하인지 여부
+        self.elapsed = elapsed      # 시작 후 경과 시간 (초)
+
+    @property
+    def margin(self):
+        """현재 가장 넓은 신뢰구간의 반폭 (±)."""
+        return float((self.high - self.low).max() / 2)
+
+    def estimated_seconds(self, num_trials):
+        """지금까지의 처리 속도로 num_trials회를 모두 실행했을 때의 예상 시간 (초)."""
+        return self.elapsed / self.done * num_trials if self.done else 0.0
+
+
+def iter_adaptive_simulation(distribution, margin, max_trials, confidence=0.95, method='wilson',
+                             seed=None, workers=1, backend='thread'):
+    """
+    목표 정밀도에 도달하면 멈추는 시뮬레이션입니다. 배치(첫 배치 ADAPTIVE_FIRST_CHUNK회, 이후 두 배씩)를
+    실행할 때마다 결과별 확률의 신뢰구간(distributions.confidence_intervals)을 누적 횟수로 갱신하고
+    AdaptiveProgress를 생성합니다. 모든 결과의 구간 반폭이 margin 이하가 되거나 max_trials에
+    도달하면 끝나며, 마지막으로 생성된 진행 상태의 converged가 목표 달성 여부입니다.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 백엔드: {backend}")
+    if not 0 < margin < 1:
+        raise ValueError("목표 오차는 0과 1 사이여야 합니다.")
+    distribution = _as_distribution(distribution)
+    z = interval_z(confidence, distribution.num_outcomes, method)
+    tasks = _adaptive_tasks(_seed_sequence(seed), distribution, max_trials)
+    counts = np.zeros(distribution.num_outcomes, dtype=np.int64)
+    done = 0
+    start = time.perf_counter()
+
+    chunks = _run_chunks(tasks, workers, backend)
+    try:
+        for chunk in chunks:
+            counts += chunk
+            done += int(chunk.sum())
+            low, high = confidence_intervals(counts, z)
+            converged = bool(((high - low) / 2 <= margin).all())
+            yield AdaptiveProgress(done, counts.copy(), low, high, converged, time.perf_counter() - start)
+            if converged:
+                return
+    finally:
+        # 조기 종료 시 풀에 제출해 두었던 나머지 청크를 취소합니다.
+        chunks.close()
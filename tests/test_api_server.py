@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import numpy as np
+import pytest
+
+from api_server import ApiError, handle_calculate, handle_continents, handle_population, handle_simulate
+
+
+def _status(handler, payload=None, query=None):
+    with pytest.raises(ApiError) as info:
+        handler(payload or {}, query or {})
+    return info.value.status
+
+
+@pytest.mark.parametrize('payload', [
+    {'trials': 'abc'}, {'trials': None}, {'trials': [1]}, {'trials': 1.5}, {'seed': 'x'},
+    {'margin': 'x'}, {'confidence': None, 'margin': 0.1},
+])
+def test_simulate_rejects_malformed_fields(payload):
+    assert _status(handle_simulate, payload) == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize('distribution', [
+    {'type': 'dice', 'sides': 2_000_000}, {'type': 'dice', 'num_dice': 101},
+    {'type': 'binomial', 'n': 10**6, 'p': 0.5}, {'type': 'poisson', 'lam': 1e6},
+    {'type': 'categorical', 'labels': list(range(1001)), 'weights': [1] * 1001},
+    {'type': 'dice', 'sides': float('inf')},
+])
+def test_simulate_caps_distribution_size(distribution):
+    payload = {'distribution': distribution, 'trials': 10}
+    assert _status(handle_simulate, payload) == HTTPStatus.BAD_REQUEST
+
+
+def test_simulate_small_request():
+    response = handle_simulate({'distribution': {'type': 'dice', 'sides': 6}, 'trials': 100}, {})
+    assert sum(response['counts']) == 100
+
+
+def test_calculate_rejects_nested_operands():
+    payload = {'num1': [[1, 2], [3, 4]], 'num2': [1, 2], 'operation': '+'}
+    assert _status(handle_calculate, payload) == HTTPStatus.BAD_REQUEST
+
+
+def test_calculate_flags_missing_second_operand():
+    response = handle_calculate({'num1': [3, 30], 'operation': ['+', 'sin']}, {})
+    assert response['error'] == [True, False]
+    assert response['result'][0] is None and np.isclose(response['result'][1], 0.5)
+
+
+@pytest.mark.parametrize('year', ['1e300', '2030.5', 'abc', '9999', '1000'])
+def test_population_rejects_bad_years(year):
+    assert _status(handle_population, query={'year': [year]}) == HTTPStatus.BAD_REQUEST
+
+
+def test_population_and_continent_years():
+    assert handle_population({}, {'year': ['2030']})['world_total'] > 0
+    assert _status(handle_continents, query={'year': ['1e300']}) == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,60 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from batch_calculator import compute_chunk, process_chunk
+from calculator_logic import (
+    ERR_COMPLEX_RESULT, ERR_DIVISION_BY_ZERO, ERR_INVALID_INPUT, ERR_INVALID_OPERATION, ERR_LOG_BASE, ERR_LOG_DOMAIN,
+    ERR_MODULO_BY_ZERO, ERR_OVERFLOW, ERR_SQRT_DOMAIN, ERROR_MESSAGES
+)
+
+
+def _rows(*rows):
+    return pd.DataFrame(rows, columns=['num1', 'num2', 'operation', 'base'])
+
+
+def test_complex_result_in_float_mode_is_an_error():
+    # 배치 경로는 오류로 표시하지만 스칼라 evaluate는 복소수 값을 반환하는 경우
+    result, messages = compute_chunk(np.array([-8.0, 2.0]), np.array([0.5, 3.0]),
+                                     np.array(['**', '**'], dtype=object), np.full(2, np.nan))
+    assert np.isnan(result[0])
+    assert messages[0] == ERROR_MESSAGES[ERR_COMPLEX_RESULT]
+    assert result[1] == 8.0 and messages[1] == ""
+
+
+def test_missing_operand_is_an_error():
+    result, messages = compute_chunk(np.array([3.0, 30.0]), np.array([np.nan, np.nan]),
+                                     np.array(['+', 'sin'], dtype=object), np.full(2, np.nan))
+    assert messages[0] == ERROR_MESSAGES[ERR_INVALID_INPUT]
+    assert messages[1] == "" and np.isclose(result[1], 0.5)
+
+
+def test_every_row_has_a_result_or_an_error():
+    chunk = _rows((-8, 0.5, '**', None), (1, 0, '/', None), (3, None, '+', None), (2, 10, '**', None),
+                  (-1, None, 'log', None), (1, 2, '?', None))
+    text, error_rows = process_chunk(chunk, fmt='csv', header=True)
+    out = pd.read_csv(io.StringIO(text))
+    assert not (out['result'].isna() & out['error'].isna()).any()
+    assert error_rows == int(out['error'].notna().sum()) == 5
+
+    text, _ = process_chunk(chunk, fmt='jsonl')
+    assert '"result":null,"error":null' not in text
+
+
+def test_error_messages_follow_the_scalar_error_codes():
+    result, messages = compute_chunk(
+        np.array([1.0, 1.0, 0.0, 1e10, -4.0, 5.0, 0.0, 1.0]), np.array([0.0, 0.0, -1.0, 40.0, 0, 0, 0, 0]),
+        np.array(['/', 'mod', '**', '**', 'sqrt', 'log', 'log', '?'], dtype=object),
+        np.array([np.nan] * 5 + [1.0, np.nan, np.nan]))
+    assert list(messages) == [ERROR_MESSAGES[code] for code in (
+        ERR_DIVISION_BY_ZERO, ERR_MODULO_BY_ZERO, ERR_DIVISION_BY_ZERO, ERR_OVERFLOW, ERR_SQRT_DOMAIN,
+        ERR_LOG_BASE, ERR_LOG_DOMAIN, ERR_INVALID_OPERATION)]
+    assert np.isnan(result).all()
+
+
+def test_large_all_error_chunk():
+    n = 100_000
+    result, messages = compute_chunk(np.ones(n), np.zeros(n), np.full(n, '/', dtype=object), np.full(n, np.nan))
+    assert np.isnan(result).all()
+    assert (messages == ERROR_MESSAGES[ERR_DIVISION_BY_ZERO]).all()
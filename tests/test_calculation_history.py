@@ -0,0 +1,37 @@
+import sqlite3
+
+from calculation_history import CalculationHistory, SQLiteHistoryStore
+from calculator_logic import evaluate
+
+
+def _record(history, num1, num2, operation):
+    history.record(num1, num2, operation, None, evaluate(num1, num2, operation))
+
+
+def test_new_session_does_not_preload_other_sessions(tmp_path):
+    store = SQLiteHistoryStore(str(tmp_path / "history.db"))
+    alice = CalculationHistory(store=store, session="alice")
+    _record(alice, 1.0, 2.0, '+')
+    _record(alice, 3.0, 4.0, '*')
+
+    assert len(CalculationHistory(store=store, session="bob")) == 0
+    assert len(CalculationHistory(store=store)) == 0
+    restored = CalculationHistory(store=store, session="alice")
+    assert [entry.display for entry in restored] == ["3", "12"]
+
+
+def test_old_database_gains_session_column(tmp_path):
+    path = str(tmp_path / "history.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE history (id INTEGER PRIMARY KEY AUTOINCREMENT, created_at REAL, backend TEXT, "
+            "operation TEXT, num1 TEXT, num2 TEXT, base REAL, value TEXT, error TEXT, display TEXT)"
+        )
+        conn.execute("INSERT INTO history (backend, operation, num1, num2, value, display) "
+                     "VALUES ('float', '+', '1.0', '1.0', '2.0', '2')")
+    conn.close()
+    store = SQLiteHistoryStore(path)
+    assert store.load("anyone") == []
+    history = CalculationHistory(store=store, session="anyone")
+    _record(history, 2.0, 2.0, '+')
+    assert len(store.load("anyone")) == 1
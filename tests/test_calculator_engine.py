@@ -0,0 +1,31 @@
+import math
+
+from calculator_engine import CalculatorEngine
+from calculator_logic import ERR_OVERFLOW, evaluate, format_complex
+
+
+def test_engine_keeps_python_numbers():
+    engine = CalculatorEngine()
+    engine.replay(['3', '0', 'sin'])
+    assert type(engine.value) is float
+
+
+def test_power_after_unary_result_is_never_nan():
+    # cos(200) < 0 이므로 0.5 거듭제곱은 nan이 아니라 복소수 결과(float 모드의 기존 규칙)입니다.
+    display = CalculatorEngine().replay(['2', '0', '0', 'cos', 'EXP', '0', '.', '5', '='])
+    assert display != "nan" and display.endswith('i')
+
+
+def test_power_overflow_is_an_error():
+    assert CalculatorEngine().replay(['1', '0', 'EXP', '4', '0', '0', '=']) == "Error: Result too large"
+    assert evaluate(10.0, 400.0, '**').error == ERR_OVERFLOW
+
+
+def test_complex_overflow_is_an_error():
+    result = evaluate(1e308, 10, '*', backend='complex')
+    assert not result.ok and result.error == ERR_OVERFLOW
+
+
+def test_format_complex_keeps_infinite_parts():
+    text = format_complex(complex(math.inf, 1.0))
+    assert text.startswith('inf')
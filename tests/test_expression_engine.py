@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from calculator_logic import (
+    ERR_DIVISION_BY_ZERO, ERR_LOG_BASE, ERR_LOG_DOMAIN, ERR_MODULO_BY_ZERO, ERR_OVERFLOW, ERR_SQRT_DOMAIN,
+    ERR_TAN_UNDEFINED, ERROR_MESSAGES
+)
+from expression_engine import ExpressionError, compile_expression, evaluate_expression
+
+
+@pytest.mark.parametrize('text', ['', '   ', '\t\n'])
+def test_empty_expression_is_an_expression_error(text):
+    with pytest.raises(ExpressionError, match="비어 있습니다"):
+        compile_expression(text)
+    with pytest.raises(ExpressionError):
+        evaluate_expression(text)
+
+
+def test_expression_still_compiles_after_empty_input():
+    assert evaluate_expression(" 2 ^ 3 + x ", x=1) == 9.0
+
+
+@pytest.mark.parametrize('text, code', [
+    ('1 / 0', ERR_DIVISION_BY_ZERO),
+    ('5 mod 0', ERR_MODULO_BY_ZERO),
+    ('log(0)', ERR_LOG_DOMAIN),
+    ('log(5, 1)', ERR_LOG_BASE),
+    ('sqrt(-1)', ERR_SQRT_DOMAIN),
+    ('tan(90)', ERR_TAN_UNDEFINED),
+    ('10 ** 400', ERR_OVERFLOW),
+    ('sqrt(1 / 0) + 1', ERR_DIVISION_BY_ZERO),
+])
+def test_evaluate_expression_reports_the_specific_error(text, code):
+    assert evaluate_expression(text) == ERROR_MESSAGES[code]
+
+
+def test_error_codes_per_element():
+    codes = compile_expression("1 / x + sqrt(x - 2)").error_codes(x=np.array([0.0, 1.0, 3.0]))
+    assert list(codes) == [ERR_DIVISION_BY_ZERO, ERR_SQRT_DOMAIN, None]
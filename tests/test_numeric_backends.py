@@ -0,0 +1,34 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from calculator_logic import ERR_COMPLEX_RESULT, ERR_MODULO_BY_ZERO, ERR_OVERFLOW, evaluate
+
+
+@pytest.mark.parametrize('num1, num2, expected', [
+    ('1e30', '7', 1), ('-1e30', '7', 6), ('10', '-3', -2), ('-10', '3', 2), ('7.5', '2', Decimal('1.5')),
+])
+def test_decimal_mod_is_exact_floor_mod(num1, num2, expected):
+    result = evaluate(num1, num2, 'mod', backend='decimal')
+    assert result.ok and result.value == expected
+
+
+def test_fraction_mod_matches_decimal():
+    assert evaluate('1e30', '7', 'mod', backend='fraction').value == Fraction(1)
+    assert evaluate('1', '0', 'mod', backend='decimal').error == ERR_MODULO_BY_ZERO
+
+
+@pytest.mark.parametrize('backend', ['decimal', 'fraction'])
+def test_zero_to_the_zero_is_one(backend):
+    assert evaluate(0.0, 0.0, '**', backend=backend).value == 1
+
+
+@pytest.mark.parametrize('backend', ['decimal', 'fraction'])
+def test_negative_base_fractional_exponent(backend):
+    assert evaluate(-8.0, 0.5, '**', backend=backend).error == ERR_COMPLEX_RESULT
+
+
+def test_decimal_power_limits_follow_context():
+    assert evaluate(10.0, 999999.0, '**', backend='decimal').value == Decimal('1e999999')
+    assert evaluate(1.5, 9999999.0, '**', backend='decimal').error == ERR_OVERFLOW
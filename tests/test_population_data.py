@@ -0,0 +1,47 @@
+import os
+
+import pandas as pd
+
+from population_data import read_population_csv
+
+
+def _write_csv(path, populations):
+    pd.DataFrame({
+        'CCA3': ['AAA', 'BBB'],
+        'Continent': ['Asia', 'Europe'],
+        '2020 Population': populations,
+        '2022 Population': [p + 1 for p in populations],
+    }).to_csv(path, index=False)
+
+
+def _cache_entries(cache_dir):
+    return sorted(os.path.relpath(os.path.join(root, d), cache_dir)
+                  for root, dirs, _ in os.walk(cache_dir) for d in dirs)
+
+
+def test_changed_csv_does_not_overwrite_a_mapped_cache(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    csv = tmp_path / "world_population.csv"
+    _write_csv(csv, [10, 20])
+    old = read_population_csv(str(csv), cache_dir)
+
+    _write_csv(csv, [30, 40])
+    os.utime(csv, ns=(os.stat(csv).st_atime_ns, os.stat(csv).st_mtime_ns + 1_000_000_000))
+    new = read_population_csv(str(csv), cache_dir)
+
+    # 이전 프레임이 메모리 맵으로 읽던 파일은 그대로 유효하고, 새 프레임은 바뀐 값을 읽습니다.
+    assert list(old['population']) == [10, 20, 11, 21]
+    assert list(new['population']) == [30, 40, 31, 41]
+    assert not any(os.path.basename(entry).startswith('.') for entry in _cache_entries(cache_dir))
+
+
+def test_same_basename_in_different_directories_does_not_share_a_cache(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    for name, populations in (("a", [1, 2]), ("b", [5, 6])):
+        (tmp_path / name).mkdir()
+        _write_csv(tmp_path / name / "world_population.csv", populations)
+    first = read_population_csv(str(tmp_path / "a" / "world_population.csv"), cache_dir)
+    second = read_population_csv(str(tmp_path / "b" / "world_population.csv"), cache_dir)
+    assert list(first['population']) == [1, 2, 2, 3]
+    assert list(second['population']) == [5, 6, 6, 7]
+    assert len(os.listdir(cache_dir)) == 2
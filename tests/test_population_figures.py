@@ -0,0 +1,26 @@
+import pandas as pd
+
+from population_data import build_year_index
+from population_figures import build_animated_choropleth, select_year
+
+
+def _frame():
+    return pd.DataFrame({
+        'iso_a3': ['KOR', 'JPN'] * 3,
+        'year': [2000, 2000, 2010, 2010, 2020, 2020],
+        'population': [46, 126, 49, 128, 51, 125],
+    })
+
+
+def test_selected_year_is_the_initial_frame():
+    df = _frame()
+    fig = build_animated_choropleth(df, build_year_index(df))
+    assert fig.layout.sliders[0].active == 2
+
+    shown = select_year(fig, 2000)
+    assert shown.layout.sliders[0].active == 0
+    assert shown.layout.title.text.startswith("2000")
+    assert list(shown.data[0].z) == [46, 126]
+    # 공유하는 원본 지도는 바뀌지 않습니다.
+    assert fig.layout.sliders[0].active == 2
+    assert list(fig.data[0].z) == [51, 125]
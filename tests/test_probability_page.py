@@ -0,0 +1,26 @@
+import numpy as np
+
+from distributions import Binomial, confidence_intervals, interval_z
+from probability_page import MAX_BAR_LABELS, _results_figure, _results_frame
+
+
+def _figure(distribution, num_trials=100_000):
+    pmf = distribution.pmf()
+    counts = np.random.default_rng(0).multinomial(num_trials, pmf / pmf.sum())
+    low, high = confidence_intervals(counts, interval_z(0.95))
+    df = _results_frame(distribution.labels, counts, pmf, num_trials, low, high)
+    return _results_figure(df, num_trials, 0.0, 0.95)
+
+
+def test_many_outcomes_use_a_single_bar_trace():
+    # 결과마다 트레이스를 만들면 이항 분포 n=2000에서 2002개가 되어 그리기가 수 초씩 걸립니다.
+    fig = _figure(Binomial(2000, 0.5))
+    assert len(fig.data) == 2
+    assert len(fig.data[0].x) == 2001
+    assert fig.data[0].text is None
+
+
+def test_few_outcomes_show_counts_on_bars():
+    fig = _figure(Binomial(MAX_BAR_LABELS - 1, 0.5))
+    assert len(fig.data[0].text) == MAX_BAR_LABELS
+    assert (np.asarray(fig.data[0].error_y.array) >= 0).all()
@@ -0,0 +1,24 @@
+import tracemalloc
+
+from profiling import finish_rerun, stage, start_rerun
+
+
+def test_single_rerun_measures_its_own_peak():
+    profile = start_rerun()
+    with stage("work"):
+        data = bytearray(1 << 20)
+    del data
+    finish_rerun(profile)
+    assert not profile.shared_memory
+    assert profile.peak_memory >= 1 << 20
+    assert not tracemalloc.is_tracing()
+
+
+def test_overlapping_reruns_are_flagged_as_shared():
+    first = start_rerun()
+    second = start_rerun()
+    finish_rerun(second)
+    assert tracemalloc.is_tracing()
+    finish_rerun(first)
+    assert first.shared_memory and second.shared_memory
+    assert not tracemalloc.is_tracing()
@@ -2,36 +2,124 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import os # 파일 경로 관리를 위해 os 모듈 추가
+import plotly.io as pio
+
+from population_aggregates import build_continent_cube, continent_history, continent_view
+from population_data import PopulationStore
+from population_figures import build_animated_choropleth, select_year
+from population_query import MAX_QUERY_YEAR, PopulationModel
+from profiling import stage
+from result_cache import cache_key, get_cache
 
 # 🚨 로컬 파일 경로 설정
 # world_population.csv 파일이 app.py 및 world_population_page.py와 같은 디렉토리에 있다고 가정합니다.
 CSV_FILE_PATH = "world_population.csv"
 
-# 캐시 키를 파일 이름과 크기로 설정하여, 파일이 변경되면 자동으로 다시 로드하도록 설정합니다.
-@st.cache_data
+# 미리보기 표의 페이지당 행 수 선택지
+PREVIEW_PAGE_SIZES = [25, 50, 100]
+
+# 그래프 JSON을 보관하는 결과 캐시 이름 (데이터셋 해시 + 보기 이름 + 연도/대륙으로 찾습니다)
+POPULATION_CACHE = "population"
+
+# 데이터셋은 프로세스 전체에서 하나의 읽기 전용 객체로 공유됩니다 (세션마다 복사하지 않음).
+# 캐시 키에 파일의 수정 시각을 포함하여, 파일이 변경되면 자동으로 다시 로드하도록 설정합니다.
+@st.cache_resource(max_entries=2)
+def _get_store(file_path, mtime):
+    # CSV는 처음 한 번만 파싱되고, 이후에는 컬럼형 바이너리 캐시(population_data)에서 읽습니다.
+    return PopulationStore(file_path)
+
+def get_store(file_path):
+    """공유 인구 데이터셋(PopulationStore)을 반환합니다."""
+    return _get_store(file_path, os.path.getmtime(file_path))
+
 def load_data(file_path):
-    """로컬 CSV 파일을 로드하고 캐싱합니다."""
+    """로컬 CSV 파일을 로드하고 캐싱합니다 (공유 읽기 전용 프레임)."""
     try:
         # 파일이 존재하는지 확인
         if not os.path.exists(file_path):
             st.error(f"파일을 찾을 수 없습니다: {file_path}. 해당 파일이 앱 폴더에 있는지 확인해 주세요.")
             return pd.DataFrame() 
             
-        df = pd.read_csv(file_path)
-        # 데이터프레임의 컬럼 이름을 모두 소문자로 변경하여 접근을 쉽게 합니다.
-        df.columns = df.columns.str.lower()
-        return df
+        return get_store(file_path).frame
     except Exception as e:
         st.error(f"데이터 로드 중 오류가 발생했습니다. CSV 파일의 형식이나 인코딩을 확인하세요: {e}")
         return pd.DataFrame() # 빈 데이터프레임 반환
 
+def load_year_index(file_path):
+    """{연도: 행 slice} 인덱스를 반환합니다 (연도 선택 시 O(1) 슬라이스 뷰에 사용)."""
+    return get_store(file_path).year_index
+
+def _cached_figure(store, view, build, **params):
+    """
+    (데이터셋 해시, 보기 이름, 매개변수)를 키로 결과 캐시에서 그래프 JSON을 찾아 Figure로 복원합니다.
+    캐시에 없을 때만 build()로 그래프를 만듭니다. 디스크 계층 덕분에 서버를 다시 시작해도 재사용됩니다.
+    """
+    key = cache_key(dataset=store.version, view=view, **params)
+    return pio.from_json(get_cache(POPULATION_CACHE).get_or_compute(key, lambda: build().to_json()))
+
+def load_choropleth(file_path, year):
+    """
+    year년 프레임이 처음 표시되는 애니메이션 인구 지도를 반환합니다 (수정하지 마세요).
+    전체 지도는 데이터셋별로 한 번만 만들고, 연도별 복사본도 연도마다 한 번만 만들어 모든 세션이 공유합니다.
+    """
+    store = get_store(file_path)
+    fig = store.derived('choropleth', lambda: _cached_figure(
+        store, 'choropleth', lambda: build_animated_choropleth(store.frame, store.year_index)))
+    return store.derived(f"choropleth/{year}", lambda: select_year(fig, year))
+
+def load_continent_figure(file_path, year, by_continent):
+    """year년 대륙별 인구 막대 그래프 (연도마다 한 번만 만들어 모든 세션이 공유, 수정하지 마세요)."""
+    store = get_store(file_path)
+    return store.derived(f"continent_figure/{year}", lambda: _cached_figure(
+        store, 'continent_figure', lambda: _continent_figure(by_continent), year=year))
+
+def load_continent_history_figure(file_path, continent, history):
+    """대륙의 연도별 인구 선 그래프 (대륙마다 한 번만 만들어 모든 세션이 공유, 수정하지 마세요)."""
+    store = get_store(file_path)
+    return store.derived(f"continent_history_figure/{continent}", lambda: _cached_figure(
+        store, 'continent_history_figure', lambda: _continent_history_figure(continent, history),
+        continent=continent))
+
+def _continent_figure(by_continent):
+    fig = px.bar(
+        by_continent.reset_index(),
+        x='continent',
+        y='population',
+        text='world_share',
+        labels={'continent': '대륙', 'population': '인구 수', 'world_share': '세계 비중 (%)'},
+        title="대륙별 인구 (막대 위: 세계 비중 %)"
+    )
+    fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+    return fig
+
+def _continent_history_figure(continent, history):
+    return px.line(
+        history.reset_index(),
+        x='year',
+        y='population',
+        markers=True,
+        labels={'year': '연도', 'population': '인구 수'},
+        title=f"{continent} 연도별 인구"
+    )
+
+def load_population_model(file_path):
+    """임의 연도 인구 추정(보간/성장률 외삽) 모델을 반환합니다."""
+    store = get_store(file_path)
+    return store.derived('model', lambda: PopulationModel(store.frame, store.countries))
+
+def load_continent_cube(file_path):
+    """(continent, year) 인덱스의 대륙별 집계 큐브를 반환합니다."""
+    store = get_store(file_path)
+    return store.derived('continent_cube', lambda: build_continent_cube(store.frame, store.countries))
+
 def world_population_page():
     """연도별 세계 인구 분석 페이지 UI를 렌더링합니다."""
     st.header("🌍 연도별 세계 인구 분석 (world_population.csv 사용)")
     st.markdown("---")
 
     # CSV 데이터 로드
-    df_raw = load_data(CSV_FILE_PATH)
+    with stage("load_data"):
+        df_raw = load_data(CSV_FILE_PATH)
 
     if df_raw.empty:
         # 데이터 로드에 실패하면 메시지를 표시하고 종료
@@ -42,8 +130,9 @@ def world_population_page():
     
     # CSV 파일이 다음 컬럼들을 포함한다고 가정합니다: 'year', 'iso_a3', 'population'
     try:
-        # 연도 목록 추출
-        POPULATION_YEARS = sorted(df_raw['year'].unique())
+        # 연도 목록 추출 (연도별 행 slice 인덱스의 키)
+        year_index = load_year_index(CSV_FILE_PATH)
+        POPULATION_YEARS = sorted(year_index)
         if 'population' not in df_raw.columns:
              st.error("CSV 파일에 'population' 컬럼이 없습니다. 파일의 컬럼 이름을 확인해 주세요.")
              return
@@ -59,43 +148,88 @@ def world_population_page():
         key="pop_year_select"
     )
 
-    # 2. 선택된 연도 데이터 필터링
-    df = df_raw[df_raw['year'] == selected_year].copy()
-    
-    # 3. 인구 구간별 색상 설정 및 시각화 (Choropleth 맵 생성)
+    # 2. 선택된 연도 데이터 필터링 (복사 없는 슬라이스 뷰)
+    store = get_store(CSV_FILE_PATH)
+    df = store.year_view(selected_year)
     
-    color_scale = "Viridis" 
-
-    fig = px.choropleth(
-        df,
-        locations='iso_a3',           # CSV 파일의 국가 코드 컬럼 (ISO-3)
-        color='population',           # 색상 구분에 사용할 값 (인구)
-        hover_name='iso_a3',          
-        color_continuous_scale=color_scale, 
-        title=f"{selected_year}년 국가별 인구 분포",
-        projection="natural earth"
-    )
-
-    # 색상 바의 범례 설정
-    pop_min = df['population'].min()
-    pop_median = df['population'].median()
-    pop_max = df['population'].max()
-    
-    fig.update_layout(
-        coloraxis_colorbar=dict(
-            title="인구 수",
-            tickvals=[pop_min, pop_median, pop_max],
-            ticktext=[
-                f"{pop_min:,.0f} (최소)", 
-                f"{pop_median:,.0f} (중간값)", 
-                f"{pop_max:,.0f} (최대)"
-            ]
-        )
-    )
+    # 3. 인구 구간별 색상 설정 및 시각화 (연도별 프레임을 가진 애니메이션 Choropleth 맵)
+    # 지도는 데이터셋 버전당 한 번만 만들어지며, 선택한 연도의 프레임에서 시작합니다.
+    # 이후 슬라이더로 연도를 바꾸는 것은 브라우저에서 처리됩니다.
+    with stage("choropleth"):
+        fig = load_choropleth(CSV_FILE_PATH, selected_year)
 
     # Streamlit에 Plotly 지도 표시
-    st.plotly_chart(fig, use_container_width=True)
+    with stage("render_choropleth"):
+        st.plotly_chart(fig, use_container_width=True, key="pop_choropleth")
     
     st.markdown("---")
     st.subheader("선택된 데이터 미리보기")
-    st.dataframe(df)
+    # 세션마다 전체 프레임을 보내지 않고 현재 페이지의 행만 전송합니다.
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("페이지당 행 수", options=PREVIEW_PAGE_SIZES, key="pop_page_size")
+    num_pages = max(1, -(-len(df) // page_size))
+    with col2:
+        page_number = st.number_input(
+            f"페이지 (총 {num_pages}쪽)",
+            min_value=1,
+            max_value=num_pages,
+            value=1,
+            step=1,
+            key="pop_preview_page"
+        )
+    preview, _ = store.year_page(selected_year, int(page_number) - 1, page_size)
+    st.dataframe(preview)
+
+    # 4. 대륙별 집계 (미리 계산된 큐브에서 잘라 표시)
+    if 'continent' in df_raw.columns:
+        st.markdown("---")
+        st.subheader(f"{selected_year}년 대륙별 집계")
+        with stage("continent_cube"):
+            cube = load_continent_cube(CSV_FILE_PATH)
+            by_continent = continent_view(cube, selected_year)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            with stage("continent_figure"):
+                fig_continent = load_continent_figure(CSV_FILE_PATH, selected_year, by_continent)
+            st.plotly_chart(fig_continent, use_container_width=True)
+        with col2:
+            selected_continent = st.selectbox(
+                "대륙을 선택하세요:",
+                options=list(by_continent.index),
+                key="pop_continent_select"
+            )
+            with stage("continent_history_figure"):
+                fig_history = load_continent_history_figure(
+                    CSV_FILE_PATH, selected_continent, continent_history(cube, selected_continent))
+            st.plotly_chart(fig_history, use_container_width=True)
+        
+        st.dataframe(
+            by_continent.rename(columns={
+                'population': '인구', 'countries': '국가 수', 'area': '면적 (km²)',
+                'density': '밀도 (명/km²)', 'weighted_density': '인구 가중 밀도',
+                'annual_growth': '연평균 성장률 (%)', 'world_share': '세계 비중 (%)'
+            }).round(2)
+        )
+
+    # 5. 임의 연도 인구 추정 (스냅샷 사이는 보간, 마지막 스냅샷 이후는 성장률로 외삽)
+    st.markdown("---")
+    st.subheader("임의 연도 인구 추정")
+    with stage("population_model"):
+        model = load_population_model(CSV_FILE_PATH)
+    query_year = st.number_input(
+        "추정할 연도를 입력하세요:",
+        min_value=int(POPULATION_YEARS[0]),
+        max_value=MAX_QUERY_YEAR,
+        value=2030,
+        step=1,
+        key="pop_query_year"
+    )
+    with stage("population_query"):
+        estimates = model.query(query_year).sort_values(ascending=False)
+    st.metric(f"{query_year}년 세계 추정 인구", f"{model.world_total(query_year):,.0f}")
+    st.dataframe(
+        estimates.head(10).rename_axis('iso_a3').reset_index(name='추정 인구').round(0),
+        hide_index=True
+    )